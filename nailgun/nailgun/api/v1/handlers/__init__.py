@@ -14,3 +14,4 @@
 
 from nailgun.api.v1.handlers.base import forbid_client_caching
 from nailgun.api.v1.handlers.base import load_db_driver
+from nailgun.api.v1.handlers.base import report_json_decoding
@@ -14,8 +14,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import collections
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
 from datetime import datetime
+import itertools
 import six
+import threading
 import traceback
 
 from decorator import decorator
@@ -28,6 +35,7 @@ from nailgun.api.v1.validators.base import BasicValidator
 from nailgun.api.v1.validators.graph import GraphTasksValidator
 from nailgun import consts
 from nailgun.db import db
+from nailgun.db.sqlalchemy.models.fields import json_decoding_stats
 from nailgun.errors import errors
 from nailgun.logger import logger
 from nailgun import objects
@@ -50,16 +58,54 @@ def forbid_client_caching(handler):
     return handler()
 
 
+class ResponseCache(object):
+    """LRU cache of encoded response bodies keyed by resource and
+    revision of data the resource is rendered from.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.bodies = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            body = self.bodies.pop(key, None)
+            if body is not None:
+                self.bodies[key] = body
+            return body
+
+    def set(self, key, body):
+        with self.lock:
+            self.bodies.pop(key, None)
+            self.bodies[key] = body
+            while len(self.bodies) > self.size:
+                self.bodies.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.bodies.clear()
+
+
+response_cache = ResponseCache(settings.RESPONSE_CACHE['size'])
+
+
 def load_db_driver(handler):
     """Wrap all handlers calls in a special construction, that's call
     rollback if something wrong or commit changes otherwise. Please note,
     only HTTPError should be rised up from this function. All another
     possible errors should be handle.
     """
+    streamed = False
     try:
         # execute handler and commit changes if all is ok
         response = handler()
         db.commit()
+        if isinstance(response, collections.Iterator):
+            # response body is generated while it's being sent and
+            # database is queried meanwhile, so session is removed later
+            streamed = True
+            return _remove_db_session_after(response)
         return response
 
     except web.HTTPError:
@@ -80,10 +126,54 @@ def load_db_driver(handler):
         db.rollback()
         raise
 
+    finally:
+        if not streamed:
+            db.remove()
+
+
+def _remove_db_session_after(response):
+    try:
+        for chunk in response:
+            yield chunk
     finally:
         db.remove()
 
 
+def report_json_decoding(handler):
+    """Log amount of JSON columns data decoded while serving a request
+    """
+    json_decoding_stats.reset()
+    streamed = False
+    try:
+        response = handler()
+        if isinstance(response, collections.Iterator):
+            streamed = True
+            return _log_json_decoding_after(response)
+        return response
+    finally:
+        if not streamed:
+            _log_json_decoding()
+
+
+def _log_json_decoding_after(response):
+    try:
+        for chunk in response:
+            yield chunk
+    finally:
+        _log_json_decoding()
+
+
+def _log_json_decoding():
+    stats = json_decoding_stats
+    if stats.decoded or stats.cached:
+        logger.debug(
+            "%s %s: decoded %d JSON documents (%d bytes), "
+            "%d documents (%d bytes) were taken from cache",
+            web.ctx.method, web.ctx.path,
+            stats.decoded, stats.decoded_bytes,
+            stats.cached, stats.cached_bytes)
+
+
 class BaseHandler(object):
     validator = BasicValidator
     serializer = BasicSerializer
@@ -197,6 +287,34 @@ class BaseHandler(object):
             raise cls.http(500, traceback.format_exc())
         return valid_data
 
+    def render_revision(self, key, revision, render):
+        """Render resource once per revision of its data.
+
+        ETag of the response is built from the resource key and the
+        revision, so the resource isn't rendered at all if client
+        already has it, and the body rendered for the revision before
+        is reused otherwise.
+
+        :param key: tuple which identifies resource
+        :param revision: revision of data the resource is rendered from
+        :param render: function which returns resource data
+        :returns: JSON string
+        :http: * 304 (client has the same revision of resource)
+        """
+        key = tuple(key) + (revision,)
+        etag = 'W/"{0}"'.format('-'.join(six.text_type(k) for k in key))
+        web.header('ETag', etag)
+
+        if_none_match = web.ctx.env.get('HTTP_IF_NONE_MATCH', '')
+        if etag in (t.strip() for t in if_none_match.split(',')):
+            raise web.notmodified()
+
+        body = response_cache.get(key)
+        if body is None:
+            body = jsonutils.dumps(render())
+            response_cache.set(key, body)
+        return body
+
     def get_object_or_404(self, obj, *args, **kwargs):
         """Get object instance by ID
 
@@ -277,6 +395,10 @@ def content_json(func, cls, *args, **kwargs):
             )
 
         resp = func(cls, *args, **kwargs)
+        if isinstance(resp, collections.Iterator):
+            # get the first chunk of a streamed response here, so that
+            # errors are reported the same way as for other responses
+            resp = itertools.chain([six.next(resp)], resp)
     except web.notmodified:
         raise
     except web.HTTPError as http_error:
@@ -373,6 +495,10 @@ class SingleHandler(BaseHandler):
                * 404 (object not found in db)
         """
         obj = self.get_object_or_404(self.single, obj_id)
+        if hasattr(obj, 'revision'):
+            return self.render_revision(
+                (self.__class__.__name__, obj.id), obj.revision,
+                lambda: self.single.to_dict(obj))
         return self.single.to_json(obj)
 
     @content
@@ -420,9 +546,63 @@ class CollectionHandler(BaseHandler):
     def GET(self):
         """:returns: Collection of JSONized REST objects.
         :http: * 200 (OK)
+               * 400 (invalid fields or pagination parameters)
         """
         q = self.collection.eager(None, self.eager)
-        return self.collection.to_json(q)
+        return self.render_collection(q)
+
+    def render_collection(self, iterable):
+        """Render collection according to request parameters:
+
+        * fields - comma separated names of fields to render;
+        * limit - max number of objects to render;
+        * marker - id of the last object of the previous page.
+
+        Objects are ordered by id when limit or marker is given, and
+        the X-Next-Marker header is set if there may be more objects.
+        Otherwise the whole collection is rendered by chunks as the
+        response is being sent.
+
+        :param iterable: iterable (SQLAlchemy query)
+        :returns: list of dicts or generator of JSON chunks
+        :http: * 400 (invalid fields or pagination parameters)
+        """
+        params = web.input(fields=None, limit=None, marker=None)
+
+        fields = None
+        if params.fields:
+            fields = params.fields.split(',')
+            allowed = self.collection.single.serializer.fields
+            unknown = [f for f in fields if f not in allowed]
+            if unknown:
+                raise self.http(400, u'Unknown fields: {0}'.format(
+                    u', '.join(unknown)))
+
+        limit = self._get_int_param('limit', params.limit, 1)
+        marker = self._get_int_param('marker', params.marker, 0)
+
+        iterable = self.collection.load_only(iterable, fields)
+        if limit is None and marker is None:
+            return self.collection.to_json_chunks(iterable, fields=fields)
+
+        objs = list(self.collection.get_page(iterable, limit, marker))
+        if not objs:
+            return []
+        if limit is not None and len(objs) == limit:
+            web.header('X-Next-Marker', str(objs[-1].id))
+        return self.collection.to_list(objs, fields=fields)
+
+    def _get_int_param(self, name, value, min_value):
+        if value is None:
+            return None
+        try:
+            value = int(value)
+            if value < min_value:
+                raise ValueError()
+        except ValueError:
+            raise self.http(400, u'Parameter {0} should be an integer '
+                                 u'not less than {1}'.format(name, min_value))
+        return value
 
     @content
     def POST(self):
@@ -579,11 +759,19 @@ class DeploymentTasksHandler(SingleHandler):
         obj = self.get_object_or_404(self.single, obj_id)
         end = web.input(end=None).end
         start = web.input(start=None).start
-        tasks = self.single.get_deployment_tasks(obj)
-        if end or start:
-            graph = deployment_graph.DeploymentGraph(tasks)
-            return graph.find_subgraph(end=end, start=start).node.values()
-        return tasks
+
+        def render():
+            tasks = self.single.get_deployment_tasks(obj)
+            if end or start:
+                graph = deployment_graph.DeploymentGraph(tasks)
+                return graph.find_subgraph(end=end, start=start).node.values()
+            return tasks
+
+        if hasattr(obj, 'revision'):
+            return self.render_revision(
+                (self.__class__.__name__, obj.id, start, end), obj.revision,
+                render)
+        return render()
 
     @content
     def PUT(self, obj_id):
@@ -134,7 +134,9 @@ class ClusterAttributesHandler(BaseHandler):
         if not cluster.attributes:
             raise self.http(500, "No attributes found!")
 
-        return objects.Cluster.get_editable_attributes(cluster)
+        return self.render_revision(
+            ('cluster_attributes', cluster.id), cluster.attributes.revision,
+            lambda: objects.Cluster.get_editable_attributes(cluster))
 
     def PUT(self, cluster_id):
         """:returns: JSONized Cluster attributes.
@@ -36,6 +36,7 @@ from nailgun.api.v1.handlers.base import content
 from nailgun.settings import settings
 from nailgun.task.manager import DumpTaskManager
 from nailgun.task.task import DumpTask
+from nailgun.utils.log_index import LogIndex
 
 
 logger = logging.getLogger(__name__)
@@ -101,7 +102,16 @@ def read_log(
         from_byte=-1,
         fetch_older=False,
         to_byte=0,
+        date_before=None,
+        date_after=None,
         **kwargs):
+    """Reads log entries from the end of log file.
+
+    :param date_before: time.struct_time, only entries older than it
+                        are returned
+    :param date_after: time.struct_time, only entries newer than it
+                       are returned
+    """
     has_more = False
     entries = []
     log_date_format = log_config['date_format']
@@ -125,6 +135,11 @@ def read_log(
             time.strptime(date, log_date_format)
         )
 
+    if date_before:
+        date_before = tuple(date_before[:6])
+    if date_after:
+        date_after = tuple(date_after[:6])
+
     with open(log_file, 'r') as f:
         # we need to calculate current position manually instead of using
         # tell() because read_backwards uses buffering
@@ -132,6 +147,13 @@ def read_log(
         pos = f.tell()
         if from_byte != -1 and fetch_older:
             pos = from_byte
+        if date_before:
+            # entries after the found offset are not older than
+            # date_before, so there is no need to parse them
+            log_index = LogIndex(log_file, regexp, log_date_format).update()
+            offset = log_index.find_offset(date_before)
+            if offset is not None:
+                pos = min(pos, offset)
         multilinebuf = []
         for line in read_backwards(f, from_byte=pos):
             pos -= len(line)
@@ -162,6 +184,9 @@ def read_log(
                 continue
             try:
                 entry_date = strptime_function(m.group('date'))
+                if date_before or date_after:
+                    entry_time = time.strptime(
+                        m.group('date'), log_date_format)[:6]
             except ValueError:
                 logger.debug("Unable to parse date from log entry."
                              " Date format: %r, date part of entry: %r",
@@ -169,6 +194,14 @@ def read_log(
                              m.group('date'))
                 continue
 
+            if date_before and entry_time >= date_before:
+                continue
+            if date_after and entry_time <= date_after:
+                # entries are read from newer to older ones,
+                # so the rest of them are older too
+                has_more = False
+                break
+
             entries.append([
                 entry_date,
                 entry_level,
@@ -32,6 +32,7 @@ from nailgun.api.v1.validators.node import NodeValidator
 from nailgun import consts
 from nailgun import objects
 
+from nailgun.objects.node import heartbeats
 from nailgun.objects.serializers.node import NodeInterfacesSerializer
 
 from nailgun.db import db
@@ -87,6 +88,7 @@ class NodeCollectionHandler(CollectionHandler):
 
         :returns: Collection of JSONized Node objects.
         :http: * 200 (OK)
+               * 400 (invalid fields or pagination parameters)
         """
         cluster_id = web.input(cluster_id=None).cluster_id
         nodes = self.collection.eager_nodes_handlers(None)
@@ -96,7 +98,7 @@ class NodeCollectionHandler(CollectionHandler):
         elif cluster_id:
             nodes = nodes.filter_by(cluster_id=cluster_id)
 
-        return self.collection.to_json(nodes)
+        return self.render_collection(nodes)
 
     @content
     def PUT(self):
@@ -165,6 +167,12 @@ class NodeAgentHandler(BaseHandler):
                * 400 (data validation failed)
                * 404 (node not found)
         """
+        heartbeat = self.validator.validate_heartbeat(web.data())
+        if heartbeat:
+            node_id = self.collection.single.touch_by_agent(heartbeat)
+            if node_id is not None:
+                return {'id': node_id, 'cached': True}
+
         nd = self.checked_data(
             self.validator.validate_update,
             data=web.data())
@@ -175,6 +183,7 @@ class NodeAgentHandler(BaseHandler):
             raise self.http(404, "Can't find node: {0}".format(nd))
 
         node.timestamp = datetime.now()
+        heartbeats.discard(node.id)
 
         if not node.online:
             node.online = True
@@ -19,6 +19,7 @@ Handlers dealing with notifications
 """
 import web
 
+from nailgun.api.v1.handlers.base import BaseHandler
 from nailgun.api.v1.handlers.base import CollectionHandler
 from nailgun.api.v1.handlers.base import SingleHandler
 
@@ -55,3 +56,17 @@ class NotificationCollectionHandler(CollectionHandler):
             self.collection.single.update(notif, nd)
             notifications_updated.append(notif)
         return self.collection.to_json(notifications_updated)
+
+
+class NotificationsSummaryHandler(BaseHandler):
+    """Unread notifications summary handler
+    """
+
+    @content
+    def GET(self):
+        """:returns: Total and per topic numbers of unread notifications.
+        :http: * 200 (OK)
+        """
+        unread = objects.NotificationCollection.get_unread_by_topic()
+        return {'unread': sum(unread.values()),
+                'unread_by_topic': unread}
@@ -48,7 +48,8 @@ class ReleaseCollectionHandler(CollectionHandler):
         """:returns: Sorted releases' collection in JSON format
         :http: * 200 (OK)
         """
-        q = sorted(self.collection.all(), reverse=True)
+        q = sorted(self.collection.eager_releases_handlers(None),
+                   reverse=True)
         return self.collection.to_json(q)
 
 
@@ -69,7 +70,9 @@ class ReleaseNetworksHandler(SingleHandler):
                * 404 (release object not found)
         """
         obj = self.get_object_or_404(self.single, obj_id)
-        return obj['networks_metadata']
+        return self.render_revision(
+            ('release_networks', obj.id), obj.revision,
+            lambda: obj['networks_metadata'])
 
     @content
     def PUT(self, obj_id):
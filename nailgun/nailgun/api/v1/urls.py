@@ -71,6 +71,8 @@ from nailgun.api.v1.handlers.node import NodeNICsHandler
 
 from nailgun.api.v1.handlers.notifications import NotificationCollectionHandler
 from nailgun.api.v1.handlers.notifications import NotificationHandler
+from nailgun.api.v1.handlers.notifications import \
+    NotificationsSummaryHandler
 
 from nailgun.api.v1.handlers.orchestrator import DefaultDeploymentInfo
 from nailgun.api.v1.handlers.orchestrator import DefaultPostPluginsHooksInfo
@@ -228,6 +230,8 @@ urls = (
     NotificationCollectionHandler,
     r'/notifications/(?P<obj_id>\d+)/?$',
     NotificationHandler,
+    r'/notifications/summary/?$',
+    NotificationsSummaryHandler,
 
     r'/logs/?$',
     LogEntryCollectionHandler,
@@ -15,6 +15,8 @@
 
 import jsonschema
 from jsonschema.exceptions import ValidationError
+from jsonschema.validators import validator_for
+import web
 
 from oslo.serialization import jsonutils
 
@@ -22,6 +24,34 @@ from nailgun.errors import errors
 from nailgun import objects
 
 
+#: validators compiled for schemas, keyed by id of schema
+#: and whether formats are checked
+_schema_validators = {}
+
+
+def get_schema_validator(schema, check_formats=True):
+    """Get validator compiled for a given schema. Schema is checked and
+    validator is built only once, so schemas are expected to be module
+    or class level constants rather than built for every call.
+
+    :param schema: a schema represented as a dict
+    :param check_formats: whether values of "format" keyword are checked
+    :returns: jsonschema validator instance
+    """
+    key = (id(schema), check_formats)
+    validator = _schema_validators.get(key)
+    # validator refers to its schema, so id of the schema can't be
+    # reused while validator is cached, checking it to be sure
+    if validator is None or validator.schema is not schema:
+        validator_cls = validator_for(schema)
+        validator_cls.check_schema(schema)
+        format_checker = jsonschema.FormatChecker() if check_formats \
+            else None
+        validator = validator_cls(schema, format_checker=format_checker)
+        _schema_validators[key] = validator
+    return validator
+
+
 class BasicValidator(object):
 
     single_schema = None
@@ -30,6 +60,11 @@ class BasicValidator(object):
     @classmethod
     def validate_json(cls, data):
         if data:
+            # request body parsed by validate_request is handed over
+            # to the first consumer of the same body
+            parsed = web.ctx.pop('parsed_request', None)
+            if parsed is not None and parsed[0] is data:
+                return parsed[1]
             try:
                 res = jsonutils.loads(data)
             except Exception:
@@ -56,7 +91,8 @@ class BasicValidator(object):
         }.get(resource_type)
 
         try:
-            jsonschema.validate(json_req, use_schema)
+            get_schema_validator(
+                use_schema, check_formats=False).validate(json_req)
         except ValidationError as exc:
             if len(exc.path) > 0:
                 raise errors.InvalidData(
@@ -64,6 +100,8 @@ class BasicValidator(object):
                 )
             raise errors.InvalidData(exc.message)
 
+        web.ctx.parsed_request = (req, json_req)
+
     @classmethod
     def validate_response(cls, resp, resource_type,
                           single_schema=None,
@@ -83,8 +121,7 @@ class BasicValidator(object):
                        must be in JSON Schema Draft 4 format.
         """
         try:
-            checker = jsonschema.FormatChecker()
-            jsonschema.validate(data, schema, format_checker=checker)
+            get_schema_validator(schema).validate(data)
         except Exception as exc:
             # We need to cast a given exception to the string since it's the
             # only way to print readable validation error. Unfortunately,
@@ -139,8 +139,21 @@ class ClusterValidator(BasicValidator):
             )
 
 
+def _build_typed_attribute_schemas():
+    schemas = {}
+    for type_, value_schema in cluster_schema.attribute_type_schemas.items():
+        schema = copy.deepcopy(cluster_schema.attribute_schema)
+        schema['properties'].update(value_schema)
+        schemas[type_] = schema
+    return schemas
+
+
 class AttributesValidator(BasicValidator):
 
+    #: schemas of attributes by their types, they are built once
+    #: because every attribute of cluster is validated against them
+    typed_attribute_schemas = _build_typed_attribute_schemas()
+
     @classmethod
     def validate(cls, data, cluster=None):
         d = cls.validate_json(data)
@@ -209,12 +222,8 @@ class AttributesValidator(BasicValidator):
         if 'type' not in attr and 'value' not in attr:
             return attr
 
-        schema = copy.deepcopy(cluster_schema.attribute_schema)
-        type_ = attr.get('type')
-        if type_:
-            value_schema = cluster_schema.attribute_type_schemas.get(type_)
-            if value_schema:
-                schema['properties'].update(value_schema)
+        schema = cls.typed_attribute_schemas.get(
+            attr.get('type'), cluster_schema.attribute_schema)
 
         try:
             cls.validate_schema(attr, schema)
@@ -13,6 +13,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo.serialization import jsonutils
+
 from nailgun.api.v1.validators.base import BasicValidator
 from nailgun.api.v1.validators.graph import TaskDeploymentValidator
 from nailgun.api.v1.validators.json_schema import base_types
@@ -186,6 +188,31 @@ class NodeValidator(BasicValidator):
                     log_message=True
                 )
 
+    @classmethod
+    def validate_heartbeat(cls, data):
+        """Check whether agent data could be handled as a heartbeat.
+
+        Heartbeat carries agent_checksum and either MAC or ID of node,
+        so node can be looked up without validating the whole payload.
+
+        :param data: raw request body
+        :returns: parsed data or None if full validation is required
+        """
+        try:
+            d = jsonutils.loads(data)
+        except Exception:
+            return None
+
+        if not isinstance(d, dict) or \
+                not isinstance(d.get('agent_checksum'), basestring):
+            return None
+
+        if isinstance(d.get('mac'), basestring) and d['mac']:
+            return d
+        if isinstance(d.get('id'), (int, long)) and d['id']:
+            return d
+        return None
+
     @classmethod
     def validate_update(cls, data, instance=None):
         if isinstance(data, (str, unicode)):
@@ -23,6 +23,7 @@ sys.path.insert(0, os.path.dirname(__file__))
 
 from nailgun.api.v1.handlers import forbid_client_caching
 from nailgun.api.v1.handlers import load_db_driver
+from nailgun.api.v1.handlers import report_json_decoding
 from nailgun.db import engine
 from nailgun.logger import HTTPLoggerMiddleware
 from nailgun.logger import logger
@@ -44,6 +45,7 @@ def build_app(db_driver=None):
                           autoreload=bool(int(settings.AUTO_RELOAD)))
     app.add_processor(db_driver or load_db_driver)
     app.add_processor(forbid_client_caching)
+    app.add_processor(report_json_decoding)
     return app
 
 
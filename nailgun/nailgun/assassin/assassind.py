@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import logging
 import os
 import sys
 
@@ -23,41 +24,90 @@ import time
 
 from datetime import datetime
 from datetime import timedelta
-from sqlalchemy.sql import not_
-
-from nailgun import notifier
+from sqlalchemy.sql.expression import true
 
+from nailgun import consts
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models import Node
 from nailgun.logger import logger
+from nailgun import objects
 from nailgun.settings import settings
 
 
 def update_nodes_status(timeout):
-    to_update = db().query(Node).filter(
-        not_(Node.status == 'provisioning')
-    ).filter(
-        datetime.now() > (Node.timestamp + timedelta(seconds=timeout))
-    ).filter_by(online=True)
-    for node_db in to_update:
-        away_message = u"Node '{0}' has gone away".format(
-            node_db.human_readable_name)
-
-        notifier.notify(
-            "error",
-            away_message,
-            node_id=node_db.id
+    """Switch offline nodes which haven't reported for timeout seconds
+    and notify about them. Nodes are switched with one UPDATE served by
+    index on online and timestamp columns.
+
+    :param timeout: timeout in seconds
+    :returns: number of nodes switched offline
+    """
+    cutoff = datetime.now() - timedelta(seconds=timeout)
+    nodes = Node.__table__
+    gone_away = db().execute(
+        nodes.update().where(
+            nodes.c.online == true()
+        ).where(
+            nodes.c.timestamp < cutoff
+        ).where(
+            nodes.c.status != consts.NODE_STATUSES.provisioning
+        ).values(
+            online=False
+        ).returning(
+            nodes.c.id, nodes.c.name, nodes.c.mac
         )
+    ).fetchall()
+
+    notifications = []
+    for node_id, name, mac in gone_away:
+        away_message = u"Node '{0}' has gone away".format(name or mac)
+        notifications.append({
+            "topic": consts.NOTIFICATION_TOPICS.error,
+            "message": away_message,
+            "node_id": node_id
+        })
         logger.warning(away_message)
-    to_update.update({"online": False})
+    objects.NotificationCollection.create_many(notifications)
+    db().commit()
+
+    return len(gone_away)
+
+
+def compact_notifications(retention_days):
+    """Collapse repeated notifications and delete expired ones
+
+    :param retention_days: read notifications older than this
+        number of days are deleted
+    :returns: tuple (number of collapsed, number of expired)
+    """
+    collapsed = objects.NotificationCollection.compact()
+    expired = objects.NotificationCollection.delete_expired(retention_days)
     db().commit()
 
+    return collapsed, expired
+
 
 def run():
     logger.info('Running Assassind...')
+    compacted_at = 0
     try:
         while True:
-            update_nodes_status(settings.KEEPALIVE['timeout'])
+            started = time.time()
+            gone_away = update_nodes_status(settings.KEEPALIVE['timeout'])
+            logger.log(
+                logging.INFO if gone_away else logging.DEBUG,
+                "Nodes liveness sweep took %.3fs, %d nodes went offline",
+                time.time() - started, gone_away)
+
+            if time.time() - compacted_at >= \
+                    settings.NOTIFICATIONS['compaction_interval']:
+                compacted_at = time.time()
+                collapsed, expired = compact_notifications(
+                    settings.NOTIFICATIONS['retention_days'])
+                logger.info(
+                    "Notifications compaction took %.3fs, %d repeated "
+                    "and %d expired notifications deleted",
+                    time.time() - compacted_at, collapsed, expired)
             time.sleep(settings.KEEPALIVE['interval'])
     except (KeyboardInterrupt, SystemExit):
         logger.info('Stopping Assassind...')
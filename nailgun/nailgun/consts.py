@@ -320,6 +320,11 @@ FUEL_REMOTE_REPOS = '6.1'
 # version of fuel when external mongo was added
 FUEL_EXTERNAL_MONGO = '6.1'
 
+DEPLOYMENT_INFO_FORMATS = Enum(
+    'legacy',
+    'compact',
+)
+
 OSWL_RESOURCE_TYPES = Enum(
     'vm',
     'tenant',
@@ -330,3 +335,9 @@ OSWL_RESOURCE_TYPES = Enum(
     'cluster_stats',
     'image',
 )
+
+OSWL_EVENT_TYPES = Enum(
+    'added',
+    'removed',
+    'modified',
+)
@@ -25,10 +25,12 @@ revision = '37608259013'
 down_revision = '1b1d4016375d'
 
 from alembic import op
+import hashlib
 from oslo.serialization import jsonutils
 import six
 import sqlalchemy as sa
 from sqlalchemy.sql import text
+import zlib
 
 from nailgun.db.sqlalchemy.models import fields
 from nailgun.utils.migration import downgrade_vip_types_6_1_to_6_0
@@ -251,6 +253,11 @@ def upgrade_schema():
                         fields.JSON(),
                         nullable=True
                     ),
+                    sa.Column(
+                        'resource_fingerprints',
+                        fields.JSON(),
+                        nullable=True
+                    ),
                     sa.Column(
                         'resource_checksum',
                         sa.Text,
@@ -264,6 +271,36 @@ def upgrade_schema():
                         index=True
                     ),
                     sa.PrimaryKeyConstraint('id'))
+    op.create_table('oswl_stats_events',
+                    sa.Column('id', sa.Integer, nullable=False),
+                    sa.Column(
+                        'oswl_stats_id',
+                        sa.Integer,
+                        nullable=False,
+                        index=True
+                    ),
+                    sa.Column(
+                        'event_type',
+                        sa.Enum('added',
+                                'removed',
+                                'modified',
+                                name='oswl_event_type'),
+                        nullable=False
+                    ),
+                    sa.Column(
+                        'time',
+                        sa.Time,
+                        nullable=False
+                    ),
+                    sa.Column(
+                        'resource_data',
+                        fields.JSON(),
+                        nullable=False
+                    ),
+                    sa.ForeignKeyConstraint(
+                        ['oswl_stats_id'], ['oswl_stats.id'],
+                        ondelete='CASCADE'),
+                    sa.PrimaryKeyConstraint('id'))
 
     op.drop_constraint('node_roles_node_fkey', 'node_roles')
     op.create_foreign_key(
@@ -329,6 +366,47 @@ def upgrade_schema():
         'plugins',
         sa.Column('homepage', sa.Text(), nullable=True))
 
+    # Revisions of rows which rendered data is cached by
+    for table in ('releases', 'attributes'):
+        op.add_column(
+            table,
+            sa.Column('revision', sa.Integer(), nullable=False,
+                      server_default='1'))
+
+    op.create_index(
+        'nodes_online_timestamp_idx', 'nodes', ['online', 'timestamp'])
+
+    # Messages sent to orchestrator are moved out of tasks rows
+    op.create_table('blobs',
+                    sa.Column('id', sa.Integer, nullable=False),
+                    sa.Column('digest', sa.String(40), nullable=False),
+                    sa.Column('size', sa.Integer, nullable=False),
+                    sa.Column('data', sa.LargeBinary, nullable=False),
+                    sa.PrimaryKeyConstraint('id'))
+    op.add_column(
+        'tasks',
+        sa.Column('cache_blob_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'tasks_cache_blob_id_fkey', 'tasks', 'blobs',
+        ['cache_blob_id'], ['id'])
+    upgrade_tasks_cache_to_blobs(connection)
+    op.drop_column('tasks', 'cache')
+
+    # Compaction of repeated notifications
+    op.add_column(
+        'notifications',
+        sa.Column('repeat_count', sa.Integer(), nullable=False,
+                  server_default='1'))
+    op.add_column(
+        'notifications',
+        sa.Column('first_datetime', sa.DateTime(), nullable=True))
+    op.create_index(
+        'notifications_task_id_node_id_idx', 'notifications',
+        ['task_id', 'node_id'])
+    op.create_index(
+        'notifications_unread_topic_idx', 'notifications', ['topic'],
+        postgresql_where=sa.text("status = 'unread'"))
+
     upgrade_enum(
         "tasks",                    # table
         "name",                     # column
@@ -363,6 +441,8 @@ def downgrade_schema():
         bond_modes_old,             # old options
     )
     # OpenStack workload statistics
+    op.drop_table('oswl_stats_events')
+    drop_enum('oswl_event_type')
     op.drop_table('oswl_stats')
     drop_enum('oswl_resource_type')
 
@@ -431,6 +511,24 @@ def downgrade_schema():
     op.drop_column('plugins', 'licenses')
     op.drop_column('plugins', 'homepage')
 
+    op.drop_column('releases', 'revision')
+    op.drop_column('attributes', 'revision')
+
+    op.drop_index('nodes_online_timestamp_idx', 'nodes')
+
+    op.add_column(
+        'tasks',
+        sa.Column('cache', fields.JSON(), nullable=True))
+    downgrade_tasks_cache_from_blobs(op.get_bind())
+    op.drop_constraint('tasks_cache_blob_id_fkey', 'tasks')
+    op.drop_column('tasks', 'cache_blob_id')
+    op.drop_table('blobs')
+
+    op.drop_index('notifications_unread_topic_idx', 'notifications')
+    op.drop_index('notifications_task_id_node_id_idx', 'notifications')
+    op.drop_column('notifications', 'first_datetime')
+    op.drop_column('notifications', 'repeat_count')
+
 
 def upgrade_data():
     connection = op.get_bind()
@@ -516,6 +614,43 @@ def upgrade_master_node_settings(connection):
             settings=jsonutils.dumps(settings))
 
 
+def upgrade_tasks_cache_to_blobs(connection):
+    blobs = sa.sql.table(
+        'blobs',
+        sa.sql.column('id', sa.Integer),
+        sa.sql.column('digest', sa.String),
+        sa.sql.column('size', sa.Integer),
+        sa.sql.column('data', sa.LargeBinary))
+    select = text(
+        "SELECT id, cache FROM tasks WHERE cache IS NOT NULL")
+    update = text(
+        "UPDATE tasks SET cache_blob_id = :blob_id WHERE id = :id")
+
+    for task_id, cache in connection.execute(select):
+        if not jsonutils.loads(cache):
+            continue
+        if isinstance(cache, six.text_type):
+            cache = cache.encode('utf-8')
+        blob_id = connection.execute(
+            blobs.insert().returning(blobs.c.id),
+            digest=hashlib.sha1(cache).hexdigest(),
+            size=len(cache),
+            data=zlib.compress(cache)).scalar()
+        connection.execute(update, blob_id=blob_id, id=task_id)
+
+
+def downgrade_tasks_cache_from_blobs(connection):
+    select = text(
+        """SELECT tasks.id, blobs.data FROM tasks
+        JOIN blobs ON blobs.id = tasks.cache_blob_id""")
+    update = text(
+        "UPDATE tasks SET cache = :cache WHERE id = :id")
+
+    for task_id, data in connection.execute(select):
+        connection.execute(
+            update, cache=zlib.decompress(data), id=task_id)
+
+
 _limits_to_update = {
     'controller': {
         'min': 1,
@@ -16,9 +16,12 @@
 from nailgun.db.sqlalchemy.models.action_logs import ActionLog
 
 from nailgun.db.sqlalchemy.models.oswl import OpenStackWorkloadStats
+from nailgun.db.sqlalchemy.models.oswl import OpenStackWorkloadStatsEvent
 
 from nailgun.db.sqlalchemy.models.base import CapacityLog
 
+from nailgun.db.sqlalchemy.models.blob import Blob
+
 from nailgun.db.sqlalchemy.models.cluster import Attributes
 from nailgun.db.sqlalchemy.models.cluster import Cluster
 from nailgun.db.sqlalchemy.models.cluster import ClusterChanges
@@ -18,9 +18,11 @@ from datetime import datetime
 
 from sqlalchemy import Column
 from sqlalchemy import DateTime
+from sqlalchemy import event
 from sqlalchemy import Integer
 
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import object_session
 
 from nailgun.db.sqlalchemy.models.fields import JSON
 
@@ -30,6 +32,23 @@ from nailgun.openstack.common.db.sqlalchemy import models
 Base = declarative_base(cls=models.ModelBase)
 
 
+class RevisionMixin(object):
+    """Model with revision which is incremented on every update of row,
+    so that data rendered from the row may be cached by its revision.
+    """
+
+    revision = Column(Integer, nullable=False, default=1,
+                      server_default='1')
+
+
+@event.listens_for(RevisionMixin, 'before_update', propagate=True)
+def _increment_revision(mapper, connection, target):
+    session = object_session(target)
+    if session.is_modified(target, include_collections=False):
+        # incremented by database to not lose concurrent updates
+        target.revision = mapper.class_.revision + 1
+
+
 class CapacityLog(Base):
     __tablename__ = 'capacity_log'
 
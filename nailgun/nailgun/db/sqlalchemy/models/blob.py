@@ -0,0 +1,102 @@
+#    Copyright 2015 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import hashlib
+import six
+import zlib
+
+from oslo.serialization import jsonutils
+from sqlalchemy import Column
+from sqlalchemy import Integer
+from sqlalchemy import LargeBinary
+from sqlalchemy import String
+from sqlalchemy.orm import deferred
+
+from nailgun.db.sqlalchemy.models.base import Base
+from nailgun.db.sqlalchemy.models.fields import decode_json
+
+
+class Blob(Base):
+    """Large JSON document kept out of the row of its owner.
+
+    Documents are stored compressed and are fetched from database only
+    when they are accessed. Every blob belongs to a single owner which
+    refers to it by id, see BlobValue.
+    """
+    __tablename__ = 'blobs'
+
+    id = Column(Integer, primary_key=True)
+    # SHA1 of JSON document, owners compare it to skip rewriting
+    # of unchanged documents
+    digest = Column(String(40), nullable=False)
+    # Length of uncompressed JSON document
+    size = Column(Integer, nullable=False)
+    data = deferred(Column(LargeBinary, nullable=False))
+
+    @classmethod
+    def encode(cls, value):
+        """Returns JSON text and its digest
+
+        :param value: JSON serializable document
+        :returns: tuple (text, digest)
+        """
+        text = jsonutils.dumps(value)
+        if isinstance(text, six.text_type):
+            text = text.encode('utf-8')
+        return text, hashlib.sha1(text).hexdigest()
+
+    @property
+    def value(self):
+        """Decoded document, it's decoded once per loaded instance"""
+        value = getattr(self, '_value', None)
+        if value is None:
+            value = self._value = decode_json(zlib.decompress(self.data))
+        return value
+
+
+class BlobValue(object):
+    """Attribute of model which keeps JSON document in a Blob
+
+    Owner model defines many-to-one relationship to Blob with
+    delete-orphan cascade, so blobs are deleted with their owners
+    and replaced documents are deleted on flush.
+
+    :param relation: name of relationship to Blob
+    :param default: callable returning value of an empty document
+    """
+
+    def __init__(self, relation, default=dict):
+        self.relation = relation
+        self.default = default
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        blob = getattr(instance, self.relation)
+        if blob is None:
+            return self.default()
+        return blob.value
+
+    def __set__(self, instance, value):
+        if not value:
+            setattr(instance, self.relation, None)
+            return
+
+        text, digest = Blob.encode(value)
+        blob = getattr(instance, self.relation)
+        if blob is None or blob.digest != digest:
+            blob = Blob(digest=digest, size=len(text),
+                        data=zlib.compress(text))
+            setattr(instance, self.relation, blob)
+        blob._value = value
@@ -23,12 +23,14 @@ from sqlalchemy import Text
 from sqlalchemy import Unicode
 
 from sqlalchemy.orm import backref
+from sqlalchemy.orm import deferred
 from sqlalchemy.orm import relationship
 
 from nailgun import consts
 
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models.base import Base
+from nailgun.db.sqlalchemy.models.base import RevisionMixin
 from nailgun.db.sqlalchemy.models.fields import JSON
 from nailgun.db.sqlalchemy.models.node import Node
 
@@ -95,11 +97,11 @@ class Cluster(Base):
         backref="cluster",
         cascade="delete"
     )
-    replaced_deployment_info = Column(JSON, default={})
-    replaced_provisioning_info = Column(JSON, default={})
+    replaced_deployment_info = deferred(Column(JSON, default={}))
+    replaced_provisioning_info = deferred(Column(JSON, default={}))
     is_customized = Column(Boolean, default=False)
     fuel_version = Column(Text, nullable=False)
-    deployment_tasks = Column(JSON, default=[])
+    deployment_tasks = deferred(Column(JSON, default=[]))
 
     @property
     def changes(self):
@@ -138,7 +140,7 @@ class Cluster(Base):
         return net_list
 
 
-class Attributes(Base):
+class Attributes(RevisionMixin, Base):
     __tablename__ = 'attributes'
     id = Column(Integer, primary_key=True)
     cluster_id = Column(Integer, ForeignKey('clusters.id'))
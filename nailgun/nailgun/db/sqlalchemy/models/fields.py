@@ -14,9 +14,110 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+import hashlib
+import marshal
+import six
+import threading
+
 from oslo.serialization import jsonutils
 import sqlalchemy.types as types
 
+from nailgun.settings import settings
+
+
+class JSONDecodingCache(object):
+    """LRU cache of decoded JSON documents keyed by digest of their text.
+
+    Documents are kept as marshalled snapshots and every lookup returns
+    a fresh copy, so callers are free to change what they get without
+    corrupting the cache. Size is a number of bytes of snapshots.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.used = 0
+        self.lock = threading.Lock()
+        self.snapshots = OrderedDict()
+
+    def get(self, key):
+        with self.lock:
+            snapshot = self.snapshots.pop(key, None)
+            if snapshot is None:
+                return None
+            self.snapshots[key] = snapshot
+        return marshal.loads(snapshot)
+
+    def set(self, key, value):
+        snapshot = marshal.dumps(value)
+        if len(snapshot) > self.size:
+            return
+        with self.lock:
+            old = self.snapshots.pop(key, None)
+            if old is not None:
+                self.used -= len(old)
+            self.snapshots[key] = snapshot
+            self.used += len(snapshot)
+            while self.used > self.size:
+                _, evicted = self.snapshots.popitem(last=False)
+                self.used -= len(evicted)
+
+    def clear(self):
+        with self.lock:
+            self.snapshots.clear()
+            self.used = 0
+
+
+class JSONDecodingStats(threading.local):
+    """Amount of JSON decoded by current thread, it's reset by
+    API on every request.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.decoded = 0
+        self.decoded_bytes = 0
+        self.cached = 0
+        self.cached_bytes = 0
+
+
+json_decoding_cache = JSONDecodingCache(
+    settings.JSON_DECODING['cache_size'])
+json_decoding_stats = JSONDecodingStats()
+
+
+def decode_json(text):
+    """Decode JSON text, large documents are decoded once per process
+
+    :param text: JSON document
+    :returns: decoded document which is owned by caller
+    """
+    if isinstance(text, six.text_type):
+        text = text.encode('utf-8')
+
+    if len(text) < settings.JSON_DECODING['min_length']:
+        json_decoding_stats.decoded += 1
+        json_decoding_stats.decoded_bytes += len(text)
+        return jsonutils.loads(text)
+
+    key = hashlib.sha1(text).digest()
+    value = json_decoding_cache.get(key)
+    if value is not None:
+        json_decoding_stats.cached += 1
+        json_decoding_stats.cached_bytes += len(text)
+        return value
+
+    json_decoding_stats.decoded += 1
+    json_decoding_stats.decoded_bytes += len(text)
+    value = jsonutils.loads(text)
+    json_decoding_cache.set(key, value)
+    return value
+
 
 class JSON(types.TypeDecorator):
 
@@ -29,7 +130,7 @@ class JSON(types.TypeDecorator):
 
     def process_result_value(self, value, dialect):
         if value is not None:
-            value = jsonutils.loads(value)
+            value = decode_json(value)
         return value
 
 
@@ -21,6 +21,7 @@ from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy import Enum
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
@@ -88,6 +89,10 @@ class NodeGroup(Base):
 
 class Node(Base):
     __tablename__ = 'nodes'
+    __table_args__ = (
+        # online nodes which went away are looked up by assassind
+        Index('nodes_online_timestamp_idx', 'online', 'timestamp'),
+    )
     id = Column(Integer, primary_key=True)
     uuid = Column(String(36), nullable=False,
                   default=lambda: str(uuid.uuid4()), unique=True)
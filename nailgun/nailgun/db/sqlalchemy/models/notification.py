@@ -18,6 +18,7 @@ from sqlalchemy import Column
 from sqlalchemy import DateTime
 from sqlalchemy import Enum
 from sqlalchemy import ForeignKey
+from sqlalchemy import Index
 from sqlalchemy import Integer
 from sqlalchemy import Text
 
@@ -46,4 +47,20 @@ class Notification(Base):
         nullable=False,
         default=consts.NOTIFICATION_STATUSES.unread
     )
+    # Time of the last occurrence of notification
     datetime = Column(DateTime, nullable=False)
+    # Repeated notifications are collapsed into one by compaction,
+    # it keeps their number and time of the first of them
+    repeat_count = Column(Integer, nullable=False, default=1,
+                          server_default='1')
+    first_datetime = Column(DateTime)
+
+    __table_args__ = (
+        # serves lookup of duplicates of task notifications
+        Index('notifications_task_id_node_id_idx', 'task_id', 'node_id'),
+        # serves counting of unread notifications by topic
+        Index(
+            'notifications_unread_topic_idx', 'topic',
+            postgresql_where=(
+                status == consts.NOTIFICATION_STATUSES.unread)),
+    )
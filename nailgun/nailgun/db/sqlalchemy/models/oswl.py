@@ -17,11 +17,14 @@ from sqlalchemy import Boolean
 from sqlalchemy import Column
 from sqlalchemy import Date
 from sqlalchemy import Enum
+from sqlalchemy import ForeignKey
 from sqlalchemy import Integer
 from sqlalchemy import Text
 from sqlalchemy import Time
 from sqlalchemy import UniqueConstraint
 
+from sqlalchemy.orm import relationship
+
 from nailgun.db.sqlalchemy.models.base import Base
 from nailgun.db.sqlalchemy.models.fields import JSON
 
@@ -46,7 +49,58 @@ class OpenStackWorkloadStats(Base):
         index=True
     )
 
-    resource_data = Column(JSON, nullable=True)
+    # current resources, lists of changes were also stored
+    # here before they were moved to events
+    current_data = Column('resource_data', JSON, nullable=True)
+    # fingerprints of current resources by their ids
+    resource_fingerprints = Column(JSON, nullable=True)
 
     resource_checksum = Column(Text, nullable=False)
     is_sent = Column(Boolean, nullable=False, default=False, index=True)
+
+    events = relationship(
+        "OpenStackWorkloadStatsEvent",
+        backref="oswl_stats",
+        order_by="OpenStackWorkloadStatsEvent.id",
+        lazy="dynamic",
+        cascade="all,delete",
+        passive_deletes=True
+    )
+
+    @property
+    def resource_data(self):
+        """Current resources and lists of their changes
+        in the format they are sent to collector
+        """
+        events = self.events.all()
+        if self.current_data is None and not events:
+            return None
+
+        stored = self.current_data or {}
+        resource_data = dict(
+            (key, list(stored.get(key, [])))
+            for key in ('current',) + tuple(consts.OSWL_EVENT_TYPES)
+        )
+        for event in events:
+            resource_data[event.event_type].append(
+                dict(event.resource_data, time=event.time.isoformat()))
+        return resource_data
+
+
+class OpenStackWorkloadStatsEvent(Base):
+    __tablename__ = 'oswl_stats_events'
+
+    id = Column(Integer, primary_key=True)
+    oswl_stats_id = Column(
+        Integer,
+        ForeignKey('oswl_stats.id', ondelete='CASCADE'),
+        nullable=False,
+        index=True
+    )
+    event_type = Column(
+        Enum(*consts.OSWL_EVENT_TYPES, name='oswl_event_type'),
+        nullable=False
+    )
+    time = Column(Time, nullable=False)
+    # id of resource and its attributes related to the event
+    resource_data = Column(JSON, nullable=False)
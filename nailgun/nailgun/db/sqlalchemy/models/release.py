@@ -22,17 +22,19 @@ from sqlalchemy import String
 from sqlalchemy import Unicode
 from sqlalchemy import UniqueConstraint
 
+from sqlalchemy.orm import deferred
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql.expression import not_
 
 from nailgun import consts
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models.base import Base
+from nailgun.db.sqlalchemy.models.base import RevisionMixin
 from nailgun.db.sqlalchemy.models.fields import JSON
 from nailgun.db.sqlalchemy.models.node import Role
 
 
-class Release(Base):
+class Release(RevisionMixin, Base):
     __tablename__ = 'releases'
     __table_args__ = (
         UniqueConstraint('name', 'version'),
@@ -52,15 +54,16 @@ class Release(Base):
         nullable=False,
         default=consts.RELEASE_STATES.unavailable
     )
-    networks_metadata = Column(JSON, default=[])
-    attributes_metadata = Column(JSON, default={})
-    volumes_metadata = Column(JSON, default={})
-    modes_metadata = Column(JSON, default={})
-    roles_metadata = Column(JSON, default={})
-    wizard_metadata = Column(JSON, default={})
+    # metadata is large, so it's loaded only when it's used
+    networks_metadata = deferred(Column(JSON, default=[]))
+    attributes_metadata = deferred(Column(JSON, default={}))
+    volumes_metadata = deferred(Column(JSON, default={}))
+    modes_metadata = deferred(Column(JSON, default={}))
+    roles_metadata = deferred(Column(JSON, default={}))
+    wizard_metadata = deferred(Column(JSON, default={}))
     is_deployable = Column(Boolean, default=True, nullable=False)
-    deployment_tasks = Column(JSON, default=[])
-    vmware_attributes_metadata = Column(JSON, default=[])
+    deployment_tasks = deferred(Column(JSON, default=[]))
+    vmware_attributes_metadata = deferred(Column(JSON, default=[]))
     modes = Column(JSON, default=[])
 
     role_list = relationship(
@@ -23,11 +23,13 @@ from sqlalchemy import ForeignKey
 from sqlalchemy import Integer
 from sqlalchemy import String
 from sqlalchemy import Text
-from sqlalchemy.orm import relationship, backref, deferred
+from sqlalchemy.orm import relationship, backref
 
 from nailgun import consts
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models.base import Base
+from nailgun.db.sqlalchemy.models.blob import Blob
+from nailgun.db.sqlalchemy.models.blob import BlobValue
 from nailgun.db.sqlalchemy.models.fields import JSON
 
 
@@ -49,7 +51,12 @@ class Task(Base):
         default='running'
     )
     progress = Column(Integer, default=0)
-    cache = deferred(Column(JSON, default={}))
+    # Message sent to orchestrator, it's large and needed only by
+    # handlers of orchestrator responses, so it's kept in a blob
+    cache_blob_id = Column(Integer, ForeignKey('blobs.id'))
+    cache_blob = relationship(
+        Blob, cascade='all, delete-orphan', single_parent=True)
+    cache = BlobValue('cache_blob')
     result = Column(JSON, default={})
     parent_id = Column(Integer, ForeignKey('tasks.id'))
     subtasks = relationship(
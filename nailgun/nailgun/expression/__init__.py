@@ -13,15 +13,70 @@
 #    under the License.
 
 
+from collections import namedtuple
+try:
+    from collections import OrderedDict
+except ImportError:
+    from ordereddict import OrderedDict
+import threading
+
 from nailgun.expression.expression_parser import parse
 
 
+EvaluationContext = namedtuple('EvaluationContext', ['models', 'strict'])
+
+
+class CompiledExpressionCache(object):
+    """LRU cache of compiled expressions keyed by expression text.
+
+    Compiled expressions do not depend on models, so the same few
+    expressions from restrictions and task conditions are parsed
+    only once per process.
+    """
+
+    def __init__(self, size):
+        self.size = size
+        self.lock = threading.Lock()
+        self.compiled = OrderedDict()
+
+    def get(self, expression_text):
+        with self.lock:
+            compiled = self.compiled.pop(expression_text, None)
+            if compiled is not None:
+                self.compiled[expression_text] = compiled
+                return compiled
+
+        # parse errors are raised here, so they are never cached
+        compiled = parse(expression_text)
+
+        with self.lock:
+            self.compiled[expression_text] = compiled
+            while len(self.compiled) > self.size:
+                self.compiled.popitem(last=False)
+        return compiled
+
+    def clear(self):
+        with self.lock:
+            self.compiled.clear()
+
+
+compiled_expressions = CompiledExpressionCache(1024)
+
+
 class Expression(object):
     def __init__(self, expression_text, models=None, strict=True):
         self.expression_text = expression_text
         self.models = models if models is not None else {}
         self.strict = strict
-        self.compiled_expression = parse(self)
+        self.compiled_expression = compiled_expressions.get(expression_text)
+
+    def evaluate(self, models=None):
+        """Evaluates expression.
 
-    def evaluate(self):
-        return self.compiled_expression()
+        :param models: dict of models, models passed to the constructor
+                       are used by default
+        """
+        if models is None:
+            models = self.models
+        return self.compiled_expression(
+            EvaluationContext(models, self.strict))
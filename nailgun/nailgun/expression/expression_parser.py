@@ -12,6 +12,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import threading
+
 import ply.lex
 import ply.yacc
 
@@ -75,9 +77,7 @@ def t_error(t):
     t.lexer.skip(1)
 
 
-ply.lex.lex()
-
-expression = None
+lexer = ply.lex.lex()
 
 precedence = (
     ('left', 'OR'),
@@ -96,15 +96,15 @@ def p_expression_binop(p):
     """
     result, arg1, op, arg2 = p
     if op == '==':
-        result = lambda: arg1() == arg2()
+        result = lambda c: arg1(c) == arg2(c)
     elif op == '!=':
-        result = lambda: arg1() != arg2()
+        result = lambda c: arg1(c) != arg2(c)
     elif op == 'or':
-        result = lambda: arg1() or arg2()
+        result = lambda c: arg1(c) or arg2(c)
     elif op == 'and':
-        result = lambda: arg1() and arg2()
+        result = lambda c: arg1(c) and arg2(c)
     elif op == 'in':
-        result = lambda: arg1() in arg2()
+        result = lambda c: arg1(c) in arg2(c)
     p[0] = SubexpressionWrapper(result)
 
 
@@ -112,7 +112,7 @@ def p_not_expression(p):
     """expression : NOT expression
     """
     subexpression = p[2]
-    p[0] = SubexpressionWrapper(lambda: not subexpression())
+    p[0] = SubexpressionWrapper(lambda c: not subexpression(c))
 
 
 def p_expression_group(p):
@@ -134,7 +134,7 @@ def p_expression_scalar(p):
 def p_expression_modelpath(p):
     """expression : MODELPATH
     """
-    p[0] = ModelPathWrapper(p[1], expression)
+    p[0] = ModelPathWrapper(p[1])
 
 
 def p_error(p):
@@ -142,9 +142,16 @@ def p_error(p):
 
 
 parser = ply.yacc.yacc(debug=False, write_tables=False)
+# PLY parser and lexer keep the state of current parsing in themselves
+parser_lock = threading.Lock()
 
 
-def parse(expr):
-    global expression
-    expression = expr
-    return parser.parse(expression.expression_text)
+def parse(expression_text):
+    """Compiles expression text.
+
+    :param expression_text: text of expression
+    :returns: callable which takes evaluation context (an object with
+              'models' and 'strict' attributes) and returns the result
+    """
+    with parser_lock:
+        return parser.parse(expression_text, lexer=lexer)
@@ -17,10 +17,10 @@ class ScalarWrapper(object):
     def __init__(self, value):
         self.value = value
 
-    def evaluate(self):
+    def evaluate(self, context):
         return self.value
 
-    def __call__(self):
+    def __call__(self, context):
         return self.value
 
 
@@ -28,13 +28,11 @@ class SubexpressionWrapper(object):
     def __init__(self, subexpression):
         self.subexpression = subexpression
 
-    def evaluate(self):
-        self.value = self.subexpression()
-        return self.value
+    def evaluate(self, context):
+        return self.subexpression(context)
 
-    def __call__(self):
-        self.evaluate()
-        return self.value
+    def __call__(self, context):
+        return self.evaluate(context)
 
 
 class ModelPath(object):
@@ -46,39 +44,43 @@ class ModelPath(object):
         else:
             self.model_name = path_parts[0]
             self.attribute = path_parts[1]
+        self.attribute_path = self.attribute.split('.')
 
-    def set_model(self, models):
+    def get_model(self, models):
         if self.model_name not in models:
             raise KeyError('No model with name "{0}" defined'.format(
                 self.model_name))
-        self.model = models[self.model_name]
+        return models[self.model_name]
 
-    def get_value(self):
-        def get_attribute_value(model, path):
-            value = model[path.pop(0)]
-            return get_attribute_value(value, path) if len(path) else value
-        return get_attribute_value(self.model, self.attribute.split('.'))
+    def get_value(self, model):
+        value = model
+        for attribute in self.attribute_path:
+            value = value[attribute]
+        return value
 
 
 class ModelPathWrapper(object):
-    def __init__(self, path, expression):
+    """Model path node of compiled expression.
+
+    Compiled expressions are shared between threads, so models are
+    taken from evaluation context and nothing is stored in the node.
+    """
+
+    def __init__(self, path):
         self.path = path
         self.model_path = ModelPath(path)
-        self.expression = expression
 
-    def evaluate(self):
-        self.model_path.set_model(self.expression.models)
+    def evaluate(self, context):
+        model = self.model_path.get_model(context.models)
         result = None
         try:
-            result = self.model_path.get_value()
+            result = self.model_path.get_value(model)
         except (KeyError, AttributeError):
-            if self.expression.strict:
+            if context.strict:
                 raise TypeError(
                     'Value of {0} is undefined. Set options.strict'
                     ' to false to allow undefined values.'.format(self.path))
-        self.value = result
-        return self.model_path
+        return result
 
-    def __call__(self):
-        self.evaluate()
-        return self.value
+    def __call__(self, context):
+        return self.evaluate(context)
@@ -12,15 +12,23 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import atexit
 import datetime
 import hashlib
 import itertools
+import os
+import threading
+import time
+
 import six
+from six.moves import queue
 
 from nailgun.middleware import utils
 
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models import ActionLog
+from nailgun.logger import logger
+from nailgun.settings import settings
 
 from nailgun import consts
 
@@ -118,25 +126,150 @@ compiled_urls_actions_mapping = utils.compile_mapping_keys(
 )
 
 
+combined_urls_matcher, urls_matchers_by_group = utils.combine_patterns(
+    list(compiled_urls_actions_mapping))
+
+
+class ActionLogWriter(object):
+    """Writes action logs out of the request processing path
+
+    Records are put into a bounded in-process queue and a background
+    thread inserts them in bulk when ACTION_LOG_WRITER['batch_size']
+    records are collected or ACTION_LOG_WRITER['flush_interval']
+    milliseconds have passed. Records which are still queued are written
+    on process exit. If the queue is full, a record is written in the
+    calling thread.
+    """
+
+    # is put into the queue to stop the background thread
+    _stop = object()
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = None
+        self._thread = None
+        self._pid = None
+
+    def push(self, record):
+        """Schedules writing of action log.
+
+        :param record: dict with ActionLog columns values
+        """
+        if not settings.ACTION_LOG_WRITER['background']:
+            self.write([record])
+            return
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            logger.warning("Action logs queue is full, writing action log "
+                           "of %s in request thread", record['action_name'])
+            self.write([record])
+
+    def write(self, records):
+        """Inserts records into db with one statement."""
+        try:
+            db().execute(ActionLog.__table__.insert(), records)
+            db().commit()
+        except Exception:
+            logger.exception("Failed to write %s action logs", len(records))
+            db().rollback()
+
+    def stop(self, timeout=None):
+        """Writes queued records and stops the background thread."""
+        with self._lock:
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                return
+            self._queue.put(self._stop)
+            self._thread = None
+        thread.join(timeout)
+
+    def _ensure_started(self):
+        # uWSGI workers are forked after the application is loaded,
+        # so threads are started by every process for itself
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._queue = queue.Queue(
+                    settings.ACTION_LOG_WRITER['queue_size'])
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._queue,),
+                    name='action-log-writer')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self, records_queue):
+        batch_size = settings.ACTION_LOG_WRITER['batch_size']
+        flush_interval = \
+            settings.ACTION_LOG_WRITER['flush_interval'] / 1000.0
+
+        batch = []
+        flush_at = None
+        try:
+            while True:
+                timeout = None
+                if batch:
+                    timeout = max(0, flush_at - time.time())
+                try:
+                    record = records_queue.get(timeout=timeout)
+                except queue.Empty:
+                    record = None
+
+                if record is self._stop:
+                    break
+                if record is not None:
+                    if not batch:
+                        flush_at = time.time() + flush_interval
+                    batch.append(record)
+
+                if batch and (len(batch) >= batch_size or
+                              time.time() >= flush_at):
+                    self.write(batch)
+                    batch = []
+
+            while True:
+                try:
+                    record = records_queue.get_nowait()
+                except queue.Empty:
+                    break
+                if record is not self._stop:
+                    batch.append(record)
+            if batch:
+                self.write(batch)
+        finally:
+            db.remove()
+
+
+action_log_writer = ActionLogWriter()
+atexit.register(action_log_writer.stop)
+
+
 class ConnectionMonitorMiddleware(object):
 
     methods_to_analyze = ('POST', 'PUT', 'DELETE', 'PATCH')
 
     def __init__(self, app):
         self.app = app
-        self.status = None
 
     def __call__(self, env, start_response):
         if env['REQUEST_METHOD'] in self.methods_to_analyze:
             url_matcher = self._get_url_matcher(url=env['PATH_INFO'])
             if url_matcher:
                 request_body = utils.get_body_from_env(env)
+                # middleware instance is shared by all requests,
+                # so response status is kept per request
+                response_status = {}
 
                 def save_headers_start_response(status, headers, *args):
                     """Hook for saving response headers for further
                     processing
                     """
-                    self.status = status
+                    response_status['status'] = status
                     return start_response(status, headers, *args)
 
                 # Prepare arguments for ActionLog instance creation
@@ -170,7 +303,8 @@ class ConnectionMonitorMiddleware(object):
                 create_kwargs['additional_info'] = \
                     self._get_additional_info(env,
                                               request_body,
-                                              response_to_analyse)
+                                              response_to_analyse,
+                                              response_status.get('status'))
 
                 # get cluster_id from url
                 cluster_id = utils.get_group_from_matcher(url_matcher,
@@ -181,17 +315,16 @@ class ConnectionMonitorMiddleware(object):
 
                 create_kwargs['cluster_id'] = cluster_id
 
-                db.add(ActionLog(**create_kwargs))
-                db.commit()
+                action_log_writer.push(create_kwargs)
 
                 return response_to_propagate
 
         return self.app(env, start_response)
 
     def _get_url_matcher(self, url):
-        for url_matcher in six.iterkeys(compiled_urls_actions_mapping):
-            if url_matcher.match(url):
-                return url_matcher
+        matched = combined_urls_matcher.match(url)
+        if matched:
+            return urls_matchers_by_group[matched.lastgroup]
 
         return None
 
@@ -203,10 +336,12 @@ class ConnectionMonitorMiddleware(object):
 
         return hashlib.sha256(token_id).hexdigest()
 
-    def _get_additional_info(self, env, request_body, response_to_analyse):
+    def _get_additional_info(self, env, request_body, response_to_analyse,
+                             status):
         additional_info = {
             'request_data': self._get_request_data(env, request_body),
-            'response_data': self._get_response_data(response_to_analyse)
+            'response_data': self._get_response_data(response_to_analyse,
+                                                     status)
         }
         return additional_info
 
@@ -219,20 +354,21 @@ class ConnectionMonitorMiddleware(object):
 
         return request_data
 
-    def _get_response_data(self, response_iterator):
+    def _get_response_data(self, response_iterator, status):
         """Retrieves data from response iterator
 
         :param response_iterator: iterator over response data
+        :param status: response status
         :returns: python dict with response data, status and
         http message if any
         """
         response_data = {
-            'status': self.status,
+            'status': status,
             'data': {}
         }
 
         # check whether request was failed
-        if not self.status.startswith('20'):
+        if not status.startswith('20'):
             # useful data always will be stored in first element of
             # response
             response_data['data'] = {'message': six.next(response_iterator)}
@@ -38,6 +38,27 @@ def compile_mapping_keys(mapping):
     )
 
 
+def combine_patterns(patterns):
+    """Compiles regexps into one regexp matching any of them
+
+    Named groups of the patterns are made non-capturing, since the same
+    group name can't be used in several alternatives. Every pattern is
+    wrapped into its own group instead, and the name of the matched
+    group identifies the matched pattern.
+
+    :param patterns: list of compiled regexps
+    :returns: tuple (combined regexp, {group name: pattern})
+    """
+    alternatives = []
+    groups = {}
+    for i, pattern in enumerate(patterns):
+        name = 'pattern{0}'.format(i)
+        groups[name] = pattern
+        alternatives.append('(?P<{0}>{1})'.format(
+            name, re.sub(r'\(\?P<\w+>', '(?:', pattern.pattern)))
+    return re.compile('|'.join(alternatives)), groups
+
+
 def get_group_from_matcher(matcher_obj, string_to_match, group_name):
     """Returns value corresponding to given group_name if it is present in
     matcher_obj
@@ -16,9 +16,9 @@
 
 from collections import defaultdict
 
-from itertools import imap
 from itertools import islice
 
+from netaddr import AddrFormatError
 from netaddr import IPAddress
 from netaddr import IPNetwork
 from netaddr import IPRange
@@ -35,6 +35,7 @@ from nailgun import consts
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models import IPAddr
 from nailgun.db.sqlalchemy.models import IPAddrRange
+from nailgun.db.sqlalchemy.models import NetworkBondAssignment
 from nailgun.db.sqlalchemy.models import NetworkGroup
 from nailgun.db.sqlalchemy.models import NetworkNICAssignment
 from nailgun.db.sqlalchemy.models import Node
@@ -134,39 +135,47 @@ class NetworkManager(object):
     def assign_admin_ips(cls, nodes):
         """Method for assigning admin IP addresses to nodes.
 
-        :param node_id: Node database ID.
-        :type  node_id: int
-        :param num: Number of IP addresses for node.
-        :type  num: int
+        :param nodes: list of Node database objects.
+        :type  nodes: list
         :returns: None
+        :raises: errors.AdminNetworkNotFound
         """
+        if not nodes:
+            return
+
+        admin_nets = dict(
+            (ng.group_id, ng) for ng in
+            db().query(NetworkGroup).filter_by(name="fuelweb_admin")
+        )
+        assigned = cls._get_assigned_ips(
+            nodes, [ng.id for ng in admin_nets.values()])
+
         # Check which nodes need ips
         # verification that node.ip (which is reported by agent) belongs
         # to one of the ranges of required to be able to reuse admin ip address
         # also such approach is backward compatible
+        new_ips = []
         nodes_need_ips = defaultdict(list)
         for node in nodes:
-            node_id = node.id
-            admin_net = cls.get_admin_network_group(node_id)
-            node_admin_ips = db().query(IPAddr).filter_by(
-                node=node_id, network=admin_net.id)
-            logger.debug(u"Trying to assign admin ip: node=%s", node_id)
-            if not db().query(node_admin_ips.exists()).scalar():
-                reusable_ip = cls.reusable_ip_address(node, admin_net)
-                if reusable_ip:
-                    db().add(reusable_ip)
-                else:
-                    nodes_need_ips[admin_net].append(node_id)
-        db().flush()
+            admin_net = admin_nets.get(node.group_id) or admin_nets.get(None)
+            if not admin_net:
+                raise errors.AdminNetworkNotFound()
 
-        for admin_net, nodes in six.iteritems(nodes_need_ips):
-            free_ips = cls.get_free_ips(admin_net, len(nodes))
-            for ip, n in zip(free_ips, nodes):
-                ip_db = IPAddr(node=n,
-                               ip_addr=ip,
-                               network=admin_net.id)
-                db().add(ip_db)
-            db().flush()
+            logger.debug(u"Trying to assign admin ip: node=%s", node.id)
+            if (node.id, admin_net.id) in assigned:
+                continue
+
+            reusable_ip = cls.reusable_ip_address(node, admin_net)
+            if reusable_ip:
+                new_ips.append({'node': reusable_ip.node,
+                                'ip_addr': reusable_ip.ip_addr,
+                                'network': reusable_ip.network})
+            else:
+                nodes_need_ips[admin_net].append(node.id)
+
+        # reused addresses have to be inserted before free ones are picked
+        cls._insert_ips(nodes, new_ips)
+        cls._insert_ips(nodes, cls._allocate_ips(nodes_need_ips))
 
     @classmethod
     def assign_ips(cls, nodes, network_name):
@@ -185,6 +194,27 @@ class NetworkManager(object):
         :returns: None
         :raises: Exception, errors.AssignIPError
         """
+        cls.assign_ips_for_networks(nodes, [network_name])
+
+    @classmethod
+    def assign_ips_for_networks(cls, nodes, network_names):
+        """Idempotent assignment IP addresses from several networks.
+
+        The same as assign_ips, but all required (node, network) pairs
+        are computed at once, so network groups and already assigned
+        addresses are fetched with a few queries regardless of number
+        of nodes, and all new addresses are inserted in one batch.
+
+        :param nodes: List of Node database objects.
+        :type  nodes: list
+        :param network_names: Networks names
+        :type  network_names: list
+        :returns: None
+        :raises: Exception, errors.AssignIPError
+        """
+        if not nodes:
+            return
+
         cluster_id = nodes[0].cluster_id
         for node in nodes:
             if node.cluster_id != cluster_id:
@@ -195,76 +225,132 @@ class NetworkManager(object):
                     )
                 )
 
-        network_groups = db().query(NetworkGroup).\
-            filter_by(name=network_name)
+        default_group_id = None
+        if any(node.group_id is None for node in nodes):
+            default_group_id = objects.Cluster.get_default_group(
+                nodes[0].cluster).id
+        nodes_groups = dict(
+            (node.id, node.group_id or default_group_id) for node in nodes)
 
-        if not network_groups:
-            raise errors.AssignIPError(
-                u"Network '%s' for cluster_id=%s not found." %
-                (network_name, cluster_id)
+        network_groups = {}
+        for ng in db().query(NetworkGroup).filter(
+            NetworkGroup.name.in_(network_names)
+        ).filter(
+            or_(
+                NetworkGroup.group_id.in_(set(nodes_groups.values())),
+                NetworkGroup.group_id == None  # flake8: noqa
             )
+        ):
+            network_groups.setdefault((ng.name, ng.group_id), ng)
+
+        assigned = cls._get_assigned_ips(
+            nodes, [ng.id for ng in network_groups.values()])
 
         # Check which nodes need ips
         nodes_need_ips = defaultdict(list)
-        for node in nodes:
-            node_id = node.id
-
-            if network_name == 'public' and \
-                    not objects.Node.should_have_public(node):
-                continue
-            group_id = (node.group_id or
-                objects.Cluster.get_default_group(node.cluster).id)
+        for network_name in network_names:
+            for node in nodes:
+                node_id = node.id
 
-            network = network_groups.filter(
-                or_(
-                    NetworkGroup.group_id == group_id,
-                    NetworkGroup.group_id == None  # flake8: noqa
-                )
-            ).first()
-
-            node_ips = imap(
-                lambda i: i.ip_addr,
-                cls._get_ips_except_admin(
-                    node_id=node_id,
-                    network_id=network.id
-                )
-            )
+                if network_name == 'public' and \
+                        not objects.Node.should_have_public(node):
+                    continue
 
-            # check if any of node_ips in required ranges
-            ip_already_assigned = False
+                group_id = nodes_groups[node_id]
+                network = network_groups.get((network_name, group_id)) or \
+                    network_groups.get((network_name, None))
+                if not network:
+                    raise errors.AssignIPError(
+                        u"Network '%s' for cluster_id=%s not found." %
+                        (network_name, cluster_id)
+                    )
 
-            for ip in node_ips:
-                if cls.check_ip_belongs_to_net(ip, network):
-                    logger.info(
-                        u"Node id='{0}' already has an IP address "
-                        "inside '{1}' network.".format(
-                            node_id,
-                            network.name
+                # check if any of node_ips in required ranges
+                ip_already_assigned = False
+
+                for ip in assigned.get((node_id, network.id), []):
+                    if cls.check_ip_belongs_to_net(ip, network):
+                        logger.info(
+                            u"Node id='{0}' already has an IP address "
+                            "inside '{1}' network.".format(
+                                node_id,
+                                network.name
+                            )
                         )
-                    )
-                    ip_already_assigned = True
-                    break
+                        ip_already_assigned = True
+                        break
 
-            if ip_already_assigned:
-                continue
+                if ip_already_assigned:
+                    continue
 
-            nodes_need_ips[network].append(node_id)
+                nodes_need_ips[network].append(node_id)
 
         # Get and assign ips for nodes
-        for network, nodes in six.iteritems(nodes_need_ips):
-            free_ips = cls.get_free_ips(network, len(nodes))
-            for ip, n in zip(free_ips, nodes):
+        cls._insert_ips(nodes, cls._allocate_ips(nodes_need_ips))
+
+    @classmethod
+    def _get_assigned_ips(cls, nodes, network_ids):
+        """Fetches addresses of nodes in given networks with one query.
+
+        :param nodes: list of Node database objects
+        :param network_ids: list of NetworkGroup IDs
+        :returns: dict of IP addresses lists by (node id, network id)
+        """
+        assigned = defaultdict(list)
+        if not network_ids:
+            return assigned
+
+        ips = db().query(
+            IPAddr.node, IPAddr.network, IPAddr.ip_addr
+        ).filter(
+            IPAddr.node.in_([node.id for node in nodes])
+        ).filter(
+            IPAddr.network.in_(network_ids)
+        ).order_by(IPAddr.id)
+
+        for node_id, network_id, ip_addr in ips:
+            assigned[(node_id, network_id)].append(ip_addr)
+        return assigned
+
+    @classmethod
+    def _allocate_ips(cls, nodes_need_ips):
+        """Picks free addresses for nodes.
+
+        :param nodes_need_ips: dict of nodes IDs lists by NetworkGroup
+        :returns: list of IPAddr rows to insert
+        """
+        new_ips = []
+        # networks are locked by get_free_ips, so keep the order stable
+        for network, node_ids in sorted(six.iteritems(nodes_need_ips),
+                                        key=lambda item: item[0].id):
+            free_ips = cls.get_free_ips(network, len(node_ids))
+            for ip, node_id in zip(free_ips, node_ids):
                 logger.info(
                     "Assigning IP for node '{0}' in network '{1}'".format(
-                        n,
-                        network_name
+                        node_id,
+                        network.name
                     )
                 )
-                ip_db = IPAddr(node=n,
-                               ip_addr=ip,
-                               network=network.id)
-                db().add(ip_db)
-            db().flush()
+                new_ips.append({'node': node_id,
+                                'ip_addr': ip,
+                                'network': network.id})
+        return new_ips
+
+    @classmethod
+    def _insert_ips(cls, nodes, new_ips):
+        """Inserts IPAddr rows with a single statement.
+
+        :param nodes: list of Node database objects which got addresses
+        :param new_ips: list of IPAddr rows
+        :returns: None
+        """
+        if not new_ips:
+            return
+
+        db().flush()
+        db().execute(IPAddr.__table__.insert().values(new_ips))
+        for node in nodes:
+            db().expire(node, ['ip_addrs'])
 
     @classmethod
     def assign_vip(cls, cluster, network_name,
@@ -351,20 +437,59 @@ class NetworkManager(object):
         return (ip != network_group.gateway
             and db().query(IPAddr).filter_by(ip_addr=ip).first() is None)
 
+    @classmethod
+    def _get_occupied_ips(cls, ip_ranges):
+        """Returns IP addresses which are already assigned within
+        given ranges. All of them are fetched with a single query.
+
+        :param ip_ranges: list of netaddr.IPRange
+        :returns: set of netaddr.IPAddress
+        """
+        query = db().query(IPAddr.ip_addr)
+        prefixes = set(utils.get_ip_range_prefix(r) for r in ip_ranges)
+        if '' not in prefixes:
+            # prefix without trailing dot is a whole address
+            query = query.filter(or_(
+                *[IPAddr.ip_addr.like(p + '%') if p.endswith('.')
+                  else IPAddr.ip_addr == p for p in prefixes]
+            ))
+
+        bounds = [(r.first, r.last) for r in ip_ranges]
+        occupied = set()
+        for ip_addr, in query:
+            try:
+                ip = IPAddress(ip_addr)
+            except AddrFormatError:
+                continue
+            if any(first <= ip.value <= last for first, last in bounds):
+                occupied.add(ip)
+        return occupied
+
     @classmethod
     def _iter_free_ips(cls, network_group):
         """Represents iterator over free IP addresses
         in all ranges for given Network Group
         """
-        for ip_range in network_group.ip_ranges:
-            for ip in IPRange(ip_range.first, ip_range.last):
-                if cls.is_ip_usable(network_group, str(ip)):
-                    yield str(ip)
+        ip_ranges = [IPRange(r.first, r.last) for r in network_group.ip_ranges]
+        occupied = cls._get_occupied_ips(ip_ranges)
+        if network_group.gateway:
+            occupied.add(IPAddress(network_group.gateway))
+
+        for free_range in utils.get_free_ip_ranges(ip_ranges, occupied):
+            for ip in free_range:
+                yield str(ip)
 
     @classmethod
     def get_free_ips(cls, network_group, num=1):
         """Returns list of free IP addresses for given Network Group
+
+        Network Group is locked until the end of transaction, so
+        concurrent allocations from it don't get the same addresses.
         """
+        db().query(NetworkGroup).filter_by(
+            id=network_group.id
+        ).with_lockmode('update').first()
+
         free_ips = list(islice(cls._iter_free_ips(network_group), 0, num))
         if len(free_ips) < num:
             raise errors.OutOfIPs()
@@ -543,10 +668,15 @@ class NetworkManager(object):
     def _get_admin_node_network(cls, node):
         node_db = db().query(Node).get(node)
         net = cls.get_admin_network_group(node)
-        net_cidr = IPNetwork(net.cidr)
         ip_addr = cls.get_admin_ip_for_node(node)
+        return cls._get_admin_network_data(
+            net, ip_addr, node_db.admin_interface)
+
+    @classmethod
+    def _get_admin_network_data(cls, net, ip_addr, interface):
+        net_cidr = IPNetwork(net.cidr)
         if ip_addr:
-            ip_addr =  "{0}/{1}".format(ip_addr, net_cidr.prefixlen)
+            ip_addr = "{0}/{1}".format(ip_addr, net_cidr.prefixlen)
 
         return {
             'name': net.name,
@@ -556,7 +686,7 @@ class NetworkManager(object):
             'netmask': str(net_cidr.netmask),
             'brd': str(net_cidr.broadcast),
             'gateway': net.gateway,
-            'dev': node_db.admin_interface.name
+            'dev': interface.name
         }
 
     @classmethod
@@ -619,6 +749,132 @@ class NetworkManager(object):
 
         return network_data
 
+    @classmethod
+    def get_nodes_networks(cls, nodes):
+        """Returns networks data of several nodes at once.
+
+        The result is the same get_node_networks returns for every node,
+        but interfaces, networks assignments, IPs and network groups of
+        all nodes are fetched with a few queries instead of querying them
+        for every node and every network separately.
+
+        :param nodes: list of Node db objects
+        :returns: dict {node id: list of networks data}
+        """
+        nodes_networks = dict((node.id, []) for node in nodes)
+        # nodes which don't belong to any cluster should not have nets
+        nodes = [node for node in nodes if node.cluster_id is not None]
+        if not nodes:
+            return nodes_networks
+        node_ids = [node.id for node in nodes]
+
+        interfaces_by_node = defaultdict(list)
+        for model in (NodeNICInterface, NodeBondInterface):
+            for interface in db().query(model).filter(
+                    model.node_id.in_(node_ids)).order_by(model.name):
+                interfaces_by_node[interface.node_id].append(interface)
+
+        networks_ids = set()
+        assignments = defaultdict(list)
+        for model, assignment, interface_id in (
+                (NodeNICInterface, NetworkNICAssignment,
+                 NetworkNICAssignment.interface_id),
+                (NodeBondInterface, NetworkBondAssignment,
+                 NetworkBondAssignment.bond_id)):
+            query = db().query(
+                interface_id, assignment.network_id
+            ).join(
+                model, model.id == interface_id
+            ).filter(
+                model.node_id.in_(node_ids)
+            )
+            for iface_id, network_id in query:
+                assignments[model, iface_id].append(network_id)
+                networks_ids.add(network_id)
+
+        ips_by_node = defaultdict(list)
+        for ip in db().query(IPAddr).filter(
+                IPAddr.node.in_(node_ids)).order_by(IPAddr.id):
+            ips_by_node[ip.node].append(ip)
+            if ip.network is not None:
+                networks_ids.add(ip.network)
+
+        networks_filter = NetworkGroup.name == 'fuelweb_admin'
+        if networks_ids:
+            networks_filter = or_(
+                networks_filter, NetworkGroup.id.in_(networks_ids))
+        networks = {}
+        admin_networks = {}
+        for net in db().query(NetworkGroup).filter(
+                networks_filter).order_by(NetworkGroup.id):
+            networks[net.id] = net
+            if net.name == 'fuelweb_admin':
+                admin_networks.setdefault(net.group_id, net)
+
+        for node in nodes:
+            interfaces = interfaces_by_node[node.id]
+            assigned_networks = dict(
+                (interface, [networks[net_id] for net_id in sorted(
+                    assignments[type(interface), interface.id])])
+                for interface in interfaces)
+
+            # the same IPs get_ip_by_network_name returns
+            ips_by_network_name = {}
+            for ip in ips_by_node[node.id]:
+                net = networks.get(ip.network)
+                if net is not None and net.group_id == node.group_id:
+                    ips_by_network_name.setdefault(net.name, ip)
+
+            network_data = nodes_networks[node.id]
+            for interface in interfaces:
+                networks_wo_admin = cls._get_networks_except_admin(
+                    assigned_networks[interface])
+                for net in networks_wo_admin:
+                    ip = ips_by_network_name.get(net.name)
+                    if ip is not None:
+                        network_data.append(cls._get_network_data_with_ip(
+                            node, interface, net, ip))
+                    else:
+                        network_data.append(cls._get_network_data_wo_ip(
+                            node, interface, net))
+
+            admin_net = admin_networks.get(node.group_id) or \
+                admin_networks.get(None)
+            if admin_net is None:
+                raise errors.AdminNetworkNotFound()
+            admin_ip = next((ip.ip_addr for ip in ips_by_node[node.id]
+                             if ip.network == admin_net.id), None)
+            admin_interface = cls._get_admin_interface_from_list(
+                node, interfaces, assigned_networks, admin_networks.get(None))
+            network_data.append(cls._get_admin_network_data(
+                admin_net, admin_ip, admin_interface))
+
+        return nodes_networks
+
+    @classmethod
+    def _get_admin_interface_from_list(cls, node, interfaces,
+                                       assigned_networks, admin_net):
+        """The same as get_admin_interface, but looks for the interface
+        in already fetched interfaces and networks assignments.
+        """
+        for interface in interfaces:
+            for net in assigned_networks[interface]:
+                if net.name == 'fuelweb_admin':
+                    return interface
+
+        if admin_net is None:
+            raise errors.AdminNetworkNotFound()
+        admin_cidr = IPNetwork(admin_net.cidr)
+        for interface in interfaces:
+            if interface.type == consts.NETWORK_INTERFACE_TYPES.ether and \
+                    interface.ip_addr and \
+                    IPAddress(interface.ip_addr) in admin_cidr:
+                return interface
+
+        logger.warning(u'Cannot find admin interface for node '
+                       'return first interface: "%s"', node.full_name)
+        return interfaces[0]
+
     @classmethod
     def _update_attrs(cls, node_data):
         node_db = db().query(Node).get(node_data['id'])
@@ -14,6 +14,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import bisect
+
 import netaddr
 
 
@@ -27,3 +29,47 @@ def is_same_mac(mac1, mac2):
         return netaddr.EUI(mac1) == netaddr.EUI(mac2)
     except netaddr.AddrFormatError as e:
         raise ValueError(e)
+
+
+def get_ip_range_prefix(ip_range):
+    """Returns common leading octets of IPv4 range as string
+
+    E.g. '10.20.' for range 10.20.0.2-10.20.3.254. It is used to narrow
+    down queries to IP addresses stored as strings. Range of a single
+    address has all octets in common, so the address itself without
+    trailing dot is returned for it and has to be matched exactly.
+    """
+    first = str(netaddr.IPAddress(ip_range.first)).split('.')
+    last = str(netaddr.IPAddress(ip_range.last)).split('.')
+    prefix = []
+    for first_octet, last_octet in zip(first, last):
+        if first_octet != last_octet:
+            break
+        prefix.append(first_octet)
+    if len(prefix) == len(first):
+        return '.'.join(prefix)
+    return ''.join(octet + '.' for octet in prefix)
+
+
+def get_free_ip_ranges(ip_ranges, occupied):
+    """Subtracts occupied IP addresses from IP ranges.
+
+    :param ip_ranges: iterable of netaddr.IPRange
+    :param occupied: iterable of netaddr.IPAddress
+    :returns: list of netaddr.IPRange not containing occupied addresses
+    """
+    taken = sorted(set(int(ip) for ip in occupied))
+    free = []
+    for ip_range in ip_ranges:
+        start, end = ip_range.first, ip_range.last
+        idx = bisect.bisect_left(taken, start)
+        while start <= end:
+            if idx < len(taken) and taken[idx] <= end:
+                if taken[idx] > start:
+                    free.append(netaddr.IPRange(start, taken[idx] - 1))
+                start = taken[idx] + 1
+                idx += 1
+            else:
+                free.append(netaddr.IPRange(start, end))
+                break
+    return free
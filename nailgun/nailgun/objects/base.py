@@ -27,12 +27,14 @@ from oslo.serialization import jsonutils
 
 from sqlalchemy import and_, not_
 from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import load_only
 
 from nailgun.objects.serializers.base import BasicSerializer
 
 from nailgun.db import db
 from nailgun.db import NoCacheQuery
 from nailgun.errors import errors
+from nailgun.settings import settings
 
 from nailgun.openstack.common.db import api as db_api
 
@@ -175,6 +177,10 @@ class NailgunCollection(object):
     #: Single object class
     single = NailgunObject
 
+    #: Model columns which are loaded even if they are not among
+    #: serialized fields, e.g. because serializer relies on them
+    always_loaded = ('id',)
+
     @classmethod
     def _is_iterable(cls, obj):
         return isinstance(
@@ -426,6 +432,74 @@ class NailgunCollection(object):
             use_iterable
         )
 
+    @classmethod
+    def load_only(cls, iterable, fields):
+        """Load only model columns which are required to serialize
+        given fields instead of whole objects
+        In case if iterable=None applies to all object instances
+
+        :param iterable: iterable (SQLAlchemy query)
+        :param fields: exact fields to serialize
+        :returns: iterable (SQLAlchemy query)
+        """
+        use_iterable = iterable or cls.all()
+        if not fields or not cls._is_query(use_iterable):
+            return use_iterable
+        columns = cls.single.model.__mapper__.column_attrs.keys()
+        load_fields = set(cls.always_loaded)
+        load_fields.update(f for f in fields if f in columns)
+        return use_iterable.options(load_only(*load_fields))
+
+    @classmethod
+    def get_page(cls, iterable, limit=None, marker=None):
+        """Get page of objects ordered by id
+        In case if iterable=None pages all object instances
+
+        :param iterable: iterable (SQLAlchemy query)
+        :param limit: max number of objects in page
+        :param marker: id of the last object of previous page
+        :returns: iterable (SQLAlchemy query)
+        """
+        model = cls.single.model
+        use_iterable = (iterable or cls.all()).order_by(None)
+        if marker is not None:
+            use_iterable = use_iterable.filter(model.id > marker)
+        use_iterable = use_iterable.order_by(model.id)
+        if limit is not None:
+            use_iterable = use_iterable.limit(limit)
+        return use_iterable
+
+    @classmethod
+    def to_json_chunks(cls, iterable=None, fields=None, page_size=None):
+        """Serialize iterable to JSON by chunks
+        In case if iterable=None serializes all object instances
+
+        Objects are fetched and serialized page by page while the chunks
+        are consumed, so the whole collection is never kept in memory.
+
+        :param iterable: iterable (SQLAlchemy query)
+        :param fields: exact fields to serialize
+        :param page_size: number of objects serialized in one chunk
+        :returns: generator of JSON strings which form JSON list
+        """
+        page_size = page_size or settings.API_COLLECTIONS['page_size']
+        prefix = '['
+        marker = None
+        while True:
+            page = list(cls.get_page(iterable, page_size, marker))
+            if page:
+                yield prefix + ', '.join(
+                    jsonutils.dumps(obj)
+                    for obj in cls.to_list(page, fields=fields))
+                prefix = ', '
+            if len(page) < page_size:
+                break
+            marker = page[-1].id
+        if prefix == '[':
+            yield '[]'
+        else:
+            yield ']'
+
     @classmethod
     def to_json(cls, iterable=None, fields=None):
         """Serialize iterable to JSON
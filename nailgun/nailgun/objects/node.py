@@ -17,13 +17,18 @@
 """
 Node-related objects and collections
 """
+import atexit
 import operator
+import os
+import threading
+import time
 import traceback
 
 from datetime import datetime
 
 from netaddr import IPAddress
 from netaddr import IPNetwork
+from sqlalchemy import case
 from sqlalchemy.orm import joinedload
 from sqlalchemy.orm import subqueryload_all
 
@@ -44,6 +49,128 @@ from nailgun.objects import Notification
 from nailgun.settings import settings
 
 
+class NodeHeartbeats(object):
+    """In-memory buffer of agent heartbeats
+
+    Agents report every minute, and most of the reports carry nothing
+    but the fact that node is still alive. Instead of writing every
+    report to database, timestamps are collected here and written
+    with a single UPDATE once per KEEPALIVE['flush_interval'], either
+    by a later heartbeat or by a background thread if no heartbeats
+    come, and on exit of the process.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending = {}
+        self._flushed_at = time.time()
+        self._thread = None
+        self._stopped = None
+        self._pid = None
+
+    def touch(self, node_id):
+        """Remember that node has reported, flush buffer if it's time.
+
+        :param node_id: Node ID
+        :returns: None
+        """
+        self._ensure_started()
+        with self._lock:
+            self._pending[node_id] = datetime.now()
+            expired = time.time() - self._flushed_at >= \
+                settings.KEEPALIVE.get('flush_interval', 0)
+
+        if expired:
+            self.flush()
+
+    def discard(self, node_id):
+        """Forget buffered heartbeat of node which was updated directly.
+
+        :param node_id: Node ID
+        :returns: None
+        """
+        with self._lock:
+            self._pending.pop(node_id, None)
+
+    def flush(self):
+        """Write all buffered timestamps with one UPDATE statement.
+
+        :returns: None
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._flushed_at = time.time()
+
+        if not pending:
+            return
+
+        db().execute(
+            models.Node.__table__.update().where(
+                models.Node.id.in_(pending.keys())
+            ).values(
+                timestamp=case(pending, value=models.Node.id)
+            )
+        )
+
+    def write(self):
+        """Flushes buffer in its own transaction."""
+        try:
+            self.flush()
+            db().commit()
+        except Exception:
+            logger.exception("Failed to write buffered agent heartbeats")
+            db().rollback()
+
+    def stop(self, timeout=None):
+        """Stops the background thread, it writes the buffer on exit."""
+        with self._lock:
+            thread = self._thread
+            if thread is None or self._pid != os.getpid():
+                return
+            self._stopped.set()
+            self._thread = None
+        thread.join(timeout)
+
+    def reset(self):
+        """Drops buffered heartbeats and stops the background thread."""
+        with self._lock:
+            self._pending = {}
+            self._flushed_at = time.time()
+        self.stop()
+
+    def _ensure_started(self):
+        # uWSGI workers are forked after the application is loaded,
+        # so threads are started by every process for itself
+        if self._thread is not None and self._pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid():
+                self._pid = os.getpid()
+                self._stopped = threading.Event()
+                self._thread = threading.Thread(
+                    target=self._run, args=(self._stopped,),
+                    name='node-heartbeats-writer')
+                self._thread.daemon = True
+                self._thread.start()
+
+    def _run(self, stopped):
+        interval = max(settings.KEEPALIVE.get('flush_interval', 0), 1)
+        try:
+            # Event.wait returns None on python 2.6, so flag is checked
+            while not stopped.is_set():
+                stopped.wait(interval)
+                if time.time() - self._flushed_at >= interval:
+                    self.write()
+            self.write()
+        finally:
+            db.remove()
+
+
+heartbeats = NodeHeartbeats()
+atexit.register(heartbeats.stop)
+
+
 class Node(NailgunObject):
     """Node object
     """
@@ -129,6 +256,36 @@ class Node(NailgunObject):
 
         return node
 
+    @classmethod
+    def touch_by_agent(cls, data):
+        """Register agent heartbeat if node data hasn't changed.
+
+        Only columns needed for the decision are fetched, and timestamp
+        is buffered instead of being written immediately. Offline nodes
+        aren't handled here, so "back online" notification is sent by
+        the regular update path.
+
+        :param data: dict with agent_checksum and node MAC or ID
+        :returns: Node ID or None if regular update is required
+        """
+        q = db().query(
+            cls.model.id,
+            cls.model.online,
+            cls.model.agent_checksum
+        )
+        if data.get('mac'):
+            q = q.filter_by(mac=data['mac'].lower())
+        else:
+            q = q.filter_by(id=data['id'])
+
+        node = q.first()
+        if not node or not node.online or \
+                node.agent_checksum != data['agent_checksum']:
+            return None
+
+        heartbeats.touch(node.id)
+        return node.id
+
     @classmethod
     def search_by_interfaces(cls, interfaces):
         """Search for instance using MACs on interfaces
@@ -767,6 +924,9 @@ class NodeCollection(NailgunCollection):
     #: Single Node object class
     single = Node
 
+    #: network data is computed by cluster and group of nodes
+    always_loaded = ('id', 'cluster_id', 'group_id')
+
     @classmethod
     def eager_nodes_handlers(cls, iterable):
         """Eager load objects instances that is used in nodes handler.
@@ -784,6 +944,34 @@ class NodeCollection(NailgunCollection):
         )
         return cls.eager_base(iterable, options)
 
+    @classmethod
+    def to_list(cls, iterable=None, fields=None):
+        """Serialize iterable to list of dicts
+
+        Networks data of all nodes is computed at once instead of
+        querying networks and IPs for every node separately.
+
+        :param iterable: iterable (SQLAlchemy query)
+        :param fields: exact fields to serialize
+        :returns: collection of nodes as a list of dicts
+        """
+        use_fields = fields or cls.single.serializer.fields
+        if 'network_data' not in use_fields:
+            return super(NodeCollection, cls).to_list(
+                iterable=iterable, fields=fields)
+
+        nodes = list(iterable or cls.all())
+        netmanager = Cluster.get_network_manager()
+        networks = netmanager.get_nodes_networks(nodes)
+
+        use_fields = [f for f in use_fields if f != 'network_data']
+        result = []
+        for node in nodes:
+            data = cls.single.to_dict(node, fields=use_fields)
+            data['network_data'] = networks[node.id]
+            result.append(data)
+        return result
+
     @classmethod
     def update_slave_nodes_fqdn(cls, instances):
         for n in instances:
@@ -801,9 +989,8 @@ class NodeCollection(NailgunCollection):
         # TODO(enchantner): check network manager instance for each node
         netmanager = Cluster.get_network_manager()
         if instances:
-            netmanager.assign_ips(instances, 'management')
-            netmanager.assign_ips(instances, 'public')
-            netmanager.assign_ips(instances, 'storage')
+            netmanager.assign_ips_for_networks(
+                instances, ['management', 'public', 'storage'])
             netmanager.assign_admin_ips(instances)
 
     @classmethod
@@ -816,11 +1003,10 @@ class NodeCollection(NailgunCollection):
         # TODO(enchantner): check network manager instance for each node
         netmanager = Cluster.get_network_manager()
         if instances:
-            netmanager.assign_ips(instances, 'management')
-            netmanager.assign_ips(instances, 'public')
-            netmanager.assign_ips(instances, 'storage')
+            networks = ['management', 'public', 'storage']
             if nst == consts.NEUTRON_SEGMENT_TYPES.gre:
-                netmanager.assign_ips(instances, 'private')
+                networks.append('private')
+            netmanager.assign_ips_for_networks(instances, networks)
             netmanager.assign_admin_ips(instances)
 
     @classmethod
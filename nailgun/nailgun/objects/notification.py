@@ -15,8 +15,12 @@
 #    under the License.
 
 from datetime import datetime
+from datetime import timedelta
+
+from sqlalchemy import func
 
 from nailgun import consts
+from nailgun.db import db
 from nailgun.db.sqlalchemy import models
 
 from nailgun.errors import errors
@@ -55,7 +59,10 @@ class Notification(NailgunObject):
             "status": {
                 "type": "string",
                 "enum": list(consts.NOTIFICATION_STATUSES)
-            }
+            },
+            "repeat_count": {"type": "number"},
+            "first_time": {"type": "string"},
+            "first_date": {"type": "string"}
         }
     }
 
@@ -84,14 +91,14 @@ class Notification(NailgunObject):
         if task_uuid:
             task = Task.get_by_uuid(task_uuid)
             if task and node_id:
-                exist = NotificationCollection.count(
+                exist = db().query(
                     NotificationCollection.filter_by(
                         None,
                         node_id=node_id,
                         message=message,
                         task_id=task.id
-                    )
-                )
+                    ).exists()
+                ).scalar()
 
         if not exist:
             notification = super(Notification, cls).create(data)
@@ -109,9 +116,108 @@ class Notification(NailgunObject):
         notif_dict = cls.serializer.serialize(instance, fields=fields)
         notif_dict['time'] = instance.datetime.strftime('%H:%M:%S')
         notif_dict['date'] = instance.datetime.strftime('%d-%m-%Y')
+        first_datetime = instance.first_datetime or instance.datetime
+        notif_dict['first_time'] = first_datetime.strftime('%H:%M:%S')
+        notif_dict['first_date'] = first_datetime.strftime('%d-%m-%Y')
         return notif_dict
 
 
 class NotificationCollection(NailgunCollection):
 
     single = Notification
+
+    #: datetimes are always serialized by Notification.to_dict
+    always_loaded = ('id', 'datetime', 'first_datetime')
+
+    @classmethod
+    def create_many(cls, data):
+        """Create notifications with one multi-row insert. Unlike
+        Notification.create it doesn't check for duplicates.
+
+        :param data: list of dicts with notification data
+        :returns: None
+        """
+        if not data:
+            return
+        now = datetime.now()
+        rows = [dict({"datetime": now,
+                      "status": consts.NOTIFICATION_STATUSES.unread},
+                     **notification)
+                for notification in data]
+        db().execute(models.Notification.__table__.insert().values(rows))
+
+    @classmethod
+    def compact(cls):
+        """Collapses repeated notifications into the latest of them.
+
+        Notifications are repeated if they have the same topic, message,
+        status, cluster, node and task. The kept notification counts all
+        of them and keeps time of the first one.
+
+        :returns: number of deleted notifications
+        """
+        model = cls.single.model
+        groups = db().query(
+            func.max(model.id),
+            func.array_agg(model.id),
+            func.sum(model.repeat_count),
+            func.min(func.coalesce(model.first_datetime, model.datetime)),
+            func.max(model.datetime)
+        ).group_by(
+            model.topic, model.message, model.status,
+            model.cluster_id, model.node_id, model.task_id
+        ).having(
+            func.count(model.id) > 1
+        ).all()
+
+        deleted_ids = []
+        for kept_id, ids, repeat_count, first, last in groups:
+            db().query(model).filter_by(id=kept_id).update({
+                'repeat_count': repeat_count,
+                'first_datetime': first,
+                'datetime': last
+            }, synchronize_session=False)
+            deleted_ids.extend(id_ for id_ in ids if id_ != kept_id)
+
+        if deleted_ids:
+            db().query(model).filter(
+                model.id.in_(deleted_ids)
+            ).delete(
+                synchronize_session=False
+            )
+        return len(deleted_ids)
+
+    @classmethod
+    def delete_expired(cls, days):
+        """Deletes read notifications older than given number of days
+
+        :param days: retention period in days, 0 keeps notifications
+        :returns: number of deleted notifications
+        """
+        if not days:
+            return 0
+        model = cls.single.model
+        return db().query(model).filter(
+            model.status == consts.NOTIFICATION_STATUSES.read,
+            model.datetime < datetime.now() - timedelta(days=days)
+        ).delete(
+            synchronize_session=False
+        )
+
+    @classmethod
+    def get_unread_by_topic(cls):
+        """Counts unread notifications with help of partial index
+
+        :returns: dict of numbers of unread notifications by topic
+        """
+        model = cls.single.model
+        rows = db().query(
+            model.topic, func.count(model.id)
+        ).filter(
+            model.status == consts.NOTIFICATION_STATUSES.unread
+        ).group_by(
+            model.topic
+        )
+        unread = dict((topic, 0) for topic in consts.NOTIFICATION_TOPICS)
+        unread.update(rows)
+        return unread
@@ -14,6 +14,7 @@
 
 import datetime
 
+from nailgun import consts
 from nailgun.db import db
 from nailgun.db.sqlalchemy import models
 from nailgun.objects import NailgunCollection
@@ -42,6 +43,37 @@ class OpenStackWorkloadStats(NailgunObject):
 
         return instance
 
+    @classmethod
+    def add_events(cls, instance, events):
+        """Store changes of resources as events of the entry.
+
+        :param instance: OpenStackWorkloadStats instance
+        :param events: iterable of event type, time and resource data
+        """
+        db().add_all(
+            models.OpenStackWorkloadStatsEvent(
+                oswl_stats_id=instance.id,
+                event_type=event_type,
+                time=time,
+                resource_data=resource_data
+            )
+            for event_type, time, resource_data in events
+        )
+        db().flush()
+
+    @classmethod
+    def get_removed_ids(cls, instance):
+        """Get ids of resources which removal is stored in the entry.
+        """
+        events = instance.events.filter_by(
+            event_type=consts.OSWL_EVENT_TYPES.removed)
+        removed_ids = set(e.resource_data['id'] for e in events)
+        # removals stored in resource data by previous versions
+        removed_ids.update(
+            res['id'] for res in
+            (instance.current_data or {}).get('removed', []))
+        return removed_ids
+
 
 class OpenStackWorkloadStatsCollection(NailgunCollection):
     single = OpenStackWorkloadStats
@@ -19,6 +19,7 @@ Release object and collection
 """
 from distutils.version import StrictVersion
 from sqlalchemy import not_
+from sqlalchemy.orm import undefer
 import yaml
 
 from nailgun import consts
@@ -136,6 +137,9 @@ class Release(NailgunObject):
                 )
                 db().add(new_role)
                 added_roles.append(role)
+        # roles are kept in their own table, so release row isn't
+        # updated by them and its revision has to be incremented here
+        instance.revision = models.Release.revision + 1
         db().flush()
 
     @classmethod
@@ -188,3 +192,19 @@ class ReleaseCollection(NailgunCollection):
 
     #: Single Release object class
     single = Release
+
+    @classmethod
+    def eager_releases_handlers(cls, iterable):
+        """Eager load metadata that is rendered by releases handler.
+
+        :param iterable: iterable (SQLAlchemy query)
+        :returns: iterable (SQLAlchemy query)
+        """
+        options = (
+            undefer('attributes_metadata'),
+            undefer('modes_metadata'),
+            undefer('roles_metadata'),
+            undefer('vmware_attributes_metadata'),
+            undefer('wizard_metadata'),
+        )
+        return cls.eager_base(iterable, options)
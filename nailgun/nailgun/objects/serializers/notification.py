@@ -26,5 +26,6 @@ class NotificationSerializer(BasicSerializer):
         "message",
         "status",
         "node_id",
-        "task_id"
+        "task_id",
+        "repeat_count"
     )
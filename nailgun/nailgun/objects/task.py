@@ -15,6 +15,10 @@
 #    under the License.
 
 import copy
+import six
+
+from sqlalchemy import case
+from sqlalchemy import func
 
 from nailgun.objects.serializers.task import TaskSerializer
 
@@ -116,13 +120,49 @@ class Task(NailgunObject):
                          instance.cluster_id, status)
             cls._update_cluster_data(instance)
 
+    @classmethod
+    def _get_subtasks_summary(cls, instance):
+        """Aggregates subtasks of task in database
+
+        :param instance: Task instance
+        :returns: tuple (statuses, progress) where statuses is a dict
+                  of numbers of subtasks by status and progress is
+                  weighted progress of subtasks with progress or None
+        """
+        model = cls.model
+        with_progress = model.progress.isnot(None)
+        rows = db().query(
+            model.status,
+            func.count(model.id),
+            func.sum(model.weight * model.progress),
+            func.sum(case([(with_progress, model.weight)]))
+        ).filter_by(
+            parent_id=instance.id
+        ).group_by(
+            model.status
+        )
+
+        statuses = {}
+        progress_sum, weight_sum = 0, 0
+        for status, count, status_progress, status_weight in rows:
+            statuses[status] = count
+            progress_sum += status_progress or 0
+            weight_sum += status_weight or 0
+
+        progress = None
+        if weight_sum:
+            progress = int(round(float(progress_sum) / weight_sum, 0))
+        return statuses, progress
+
     @classmethod
     def _update_parent_instance(cls, instance):
-        subtasks = instance.subtasks
-        if len(subtasks):
+        statuses, progress = cls._get_subtasks_summary(instance)
+        subtasks_count = sum(six.itervalues(statuses))
+        if subtasks_count:
             data = dict()
 
-            if all(map(lambda s: s.status == 'ready', subtasks)):
+            if statuses.get('ready') == subtasks_count:
+                subtasks = instance.subtasks
 
                 data['status'] = 'ready'
                 data['progress'] = 100
@@ -133,7 +173,8 @@ class Task(NailgunObject):
                 cls.update(instance, data)
                 TaskHelper.update_action_log(instance)
 
-            elif any(map(lambda s: s.status in ('error',), subtasks)):
+            elif statuses.get('error'):
+                subtasks = instance.subtasks
                 for subtask in subtasks:
                     if not subtask.status in ('error', 'ready'):
                         subtask.status = 'error'
@@ -154,17 +195,7 @@ class Task(NailgunObject):
                 TaskHelper.update_action_log(instance)
 
             else:
-                subtasks_with_progress = filter(
-                    lambda s: s.progress is not None,
-                    subtasks
-                )
-                if subtasks_with_progress:
-                    instance.progress = \
-                        TaskHelper.calculate_parent_task_progress(
-                            subtasks_with_progress
-                        )
-                else:
-                    instance.progress = 0
+                instance.progress = progress or 0
 
     @classmethod
     def __update_nodes_to_error(cls, q_nodes_to_error, error_type):
@@ -302,10 +333,20 @@ class TaskCollection(NailgunCollection):
 
     @classmethod
     def delete_by_names(cls, cluster_id, names):
-        db().query(cls.single.model).filter_by(
+        query = db().query(cls.single.model).filter_by(
             cluster_id=cluster_id,
         ).filter(
             cls.single.model.name.in_(names)
-        ).delete(
+        )
+        # bulk delete bypasses cascades, so blobs are deleted explicitly
+        blob_ids = [blob_id for blob_id, in
+                    query.values(cls.single.model.cache_blob_id) if blob_id]
+        query.delete(
             synchronize_session='fetch'
         )
+        if blob_ids:
+            db().query(models.Blob).filter(
+                models.Blob.id.in_(blob_ids)
+            ).delete(
+                synchronize_session='fetch'
+            )
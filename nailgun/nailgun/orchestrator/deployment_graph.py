@@ -21,12 +21,14 @@ except ImportError:
     from ordereddict import OrderedDict
 
 import networkx as nx
+import six
 
 from nailgun import consts
 from nailgun.errors import errors
 from nailgun.logger import logger
 from nailgun import objects
 from nailgun.orchestrator import priority_serializers as ps
+from nailgun.orchestrator.tasks_serializer import ExpressionBasedTask
 from nailgun.orchestrator.tasks_serializer import TaskSerializers
 
 
@@ -126,12 +128,50 @@ class DeploymentGraph(nx.DiGraph):
             if node in processed_nodes:
                 continue
 
-            predecessors = nx.dfs_predecessors(self.reverse(), node)
-            if (set(predecessors.keys()) <= processed_nodes):
+            if nx.ancestors(self, node) <= processed_nodes:
                 result.append(node)
 
         return result
 
+    def get_levels(self, processed_nodes):
+        """Splits not processed nodes into levels: nodes of a level
+        have all their predecessors (not only direct parents) either
+        processed or on previous levels.
+
+        It is the same as calling get_next_groups and marking returned
+        nodes as processed until nothing is returned, but transitive
+        predecessors of every node are calculated only once.
+
+        :param processed_nodes: set of nodes names
+        :returns: generator of lists of nodes names
+        """
+        order = dict((node, i) for i, node in enumerate(self.nodes()))
+        # {node: number of not processed predecessors}
+        waiting = {}
+        successors = defaultdict(list)
+        for node in self.nodes():
+            if node in processed_nodes:
+                continue
+            ancestors = nx.ancestors(self, node) - processed_nodes
+            waiting[node] = len(ancestors)
+            for ancestor in ancestors:
+                successors[ancestor].append(node)
+
+        level = [node for node in self.nodes()
+                 if node in waiting and not waiting[node]]
+        while level:
+            yield level
+
+            next_level = []
+            for node in level:
+                del waiting[node]
+            for node in level:
+                for successor in successors[node]:
+                    waiting[successor] -= 1
+                    if not waiting[successor]:
+                        next_level.append(successor)
+            level = sorted(next_level, key=order.get)
+
     def get_groups_subgraph(self):
         roles = [t['id'] for t in self.node.values()
                  if t['type'] == consts.ORCHESTRATOR_TASK_TYPES.group]
@@ -214,9 +254,12 @@ class AstuteGraph(object):
         self.graph = DeploymentGraph()
         self.graph.add_tasks(self.tasks)
         self.serializers = TaskSerializers()
+        # {role: deployment plan}, see get_role_plan
+        self._role_plans = {}
 
     def only_tasks(self, task_ids):
         self.graph.only_tasks(task_ids)
+        self._role_plans = {}
 
     def group_nodes_by_roles(self, nodes):
         """Group nodes by roles
@@ -255,7 +298,7 @@ class AstuteGraph(object):
         while current_nodes:
             next_nodes = []
             group = []
-            added_uids = []
+            added_uids = set()
             for node in current_nodes:
                 if 'uid' not in node or 'role' not in node:
                     raise errors.InvalidSerializedNode(
@@ -263,7 +306,7 @@ class AstuteGraph(object):
                             node))
                 if node['uid'] not in added_uids:
                     group.append(node)
-                    added_uids.append(node['uid'])
+                    added_uids.add(node['uid'])
                 else:
                     next_nodes.append(node)
             priority.in_parallel(group)
@@ -303,9 +346,8 @@ class AstuteGraph(object):
 
         # if there is no nodes with some roles - mark them as success roles
         processed_groups = set(all_groups) - set(grouped_nodes.keys())
-        current_groups = groups_subgraph.get_next_groups(processed_groups)
 
-        while current_groups:
+        for current_groups in groups_subgraph.get_levels(processed_groups):
             one_by_one = []
             parallel = []
 
@@ -324,10 +366,6 @@ class AstuteGraph(object):
 
             self.process_parallel_nodes(priority, parallel, grouped_nodes)
 
-            # fetch next part of groups
-            processed_groups.update(current_groups)
-            current_groups = groups_subgraph.get_next_groups(processed_groups)
-
     def stage_tasks_serialize(self, tasks, nodes):
         """Serialize tasks for certain stage
 
@@ -377,20 +415,53 @@ class AstuteGraph(object):
             subgraph = self.graph.get_tasks(consts.STAGES.pre_deployment)
         return self.stage_tasks_serialize(subgraph.topology, nodes)
 
+    @staticmethod
+    def has_cluster_level_condition(serializer):
+        """Checks that task condition depends on cluster only.
+
+        Conditions of expression based tasks are evaluated against
+        the cluster and its settings, unless should_execute is overridden.
+        """
+        return (
+            six.get_unbound_function(serializer.should_execute) is
+            six.get_unbound_function(ExpressionBasedTask.should_execute))
+
+    def get_role_plan(self, role):
+        """Returns tasks which should be executed on nodes with the role
+
+        The plan is the same for all nodes with the role, so it is
+        calculated once: tasks are sorted topologically and conditions
+        which depend on cluster only are checked.
+
+        :param role: role name
+        :returns: list of tuples (task, serializer class, condition_checked)
+        """
+        if role not in self._role_plans:
+            plan = []
+            for task in self.graph.get_tasks(role).topology:
+                serializer = self.serializers.get_deploy_serializer(task)
+                condition_checked = self.has_cluster_level_condition(
+                    serializer)
+                if condition_checked and not serializer(
+                        task, self.cluster, None).should_execute():
+                    continue
+                plan.append((task, serializer, condition_checked))
+            self._role_plans[role] = plan
+        return self._role_plans[role]
+
     def deploy_task_serialize(self, node):
         """Serialize tasks with necessary for orchestrator attributes
 
         :param node: dict with serialized node
         """
-        tasks = self.graph.get_tasks(node['role']).topology
         serialized = []
         priority = ps.PriorityStrategy()
 
-        for task in tasks:
-            serializer = self.serializers.get_deploy_serializer(task)(
-                task, self.cluster, node)
+        for task, serializer, condition_checked in self.get_role_plan(
+                node['role']):
+            serializer = serializer(task, self.cluster, node)
 
-            if not serializer.should_execute():
+            if not condition_checked and not serializer.should_execute():
                 continue
             serialized.extend(serializer.serialize())
 
@@ -19,6 +19,7 @@
 from collections import defaultdict
 from copy import deepcopy
 from itertools import groupby
+import threading
 
 from netaddr import IPNetwork
 from sqlalchemy import or_
@@ -41,6 +42,55 @@ from nailgun import utils
 from nailgun.volumes import manager as volume_manager
 
 
+class SerializationContext(object):
+    """Data shared by all nodes during a single serialization.
+
+    Network groups and node groups of a cluster are not changed while
+    its deployment info is generated, so they are fetched from db only
+    once per serialization instead of once per node. The context is
+    thread local and is activated with the `with` statement.
+    """
+
+    _local = threading.local()
+
+    def __init__(self):
+        self.network_ranges = {}
+        self.node_groups_count = {}
+        self._previous = None
+
+    def __enter__(self):
+        self._previous = self.current()
+        self._local.context = self
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self._local.context = self._previous
+        self._previous = None
+
+    @classmethod
+    def current(cls):
+        """Returns active context or None."""
+        return getattr(cls._local, 'context', None)
+
+    @classmethod
+    def cached(cls, cache_name, key, func, *args):
+        """Returns func(*args) memoised in the active context.
+
+        :param cache_name: name of the context attribute used as cache
+        :param key: key of the cached value
+        :param func: function which calculates the value
+        :returns: the value; func is always called if no context is active
+        """
+        context = cls.current()
+        if context is None:
+            return func(*args)
+
+        cache = getattr(context, cache_name)
+        if key not in cache:
+            cache[key] = func(*args)
+        return cache[key]
+
+
 class VmwareDeploymentSerializerMixin(object):
 
     def generate_vmware_data(self, node):
@@ -139,7 +189,14 @@ class NetworkDeploymentSerializer(object):
     @classmethod
     def update_nodes_net_info(cls, cluster, nodes):
         """Adds information about networks to each node."""
+        nodes_by_uid = defaultdict(list)
+        for n in nodes:
+            nodes_by_uid[n['uid']].append(n)
+
         for node in objects.Cluster.get_nodes_not_for_deletion(cluster):
+            node_entries = nodes_by_uid.get(str(node.uid))
+            if not node_entries:
+                continue
             netw_data = node.network_data
             addresses = {}
             for net in node.cluster.network_groups:
@@ -151,8 +208,8 @@ class NetworkDeploymentSerializer(object):
                         netw_data,
                         net.name,
                         net.meta.get('render_addr_mask')))
-            [n.update(addresses) for n in nodes
-                if n['uid'] == str(node.uid)]
+            for n in node_entries:
+                n.update(addresses)
         return nodes
 
     @classmethod
@@ -186,6 +243,11 @@ class NetworkDeploymentSerializer(object):
         """Returns ranges for network groups
         except range for public network for each node
         """
+        return deepcopy(SerializationContext.cached(
+            'network_ranges', group_id, cls._network_ranges, group_id))
+
+    @classmethod
+    def _network_ranges(cls, group_id):
         ng_db = db().query(NetworkGroup).filter_by(group_id=group_id).all()
         attrs = {}
         for net in ng_db:
@@ -196,6 +258,14 @@ class NetworkDeploymentSerializer(object):
                 attrs[net_name] = net.cidr
         return attrs
 
+    @classmethod
+    def node_groups_count(cls, cluster):
+        """Returns number of node groups in the cluster."""
+        return SerializationContext.cached(
+            'node_groups_count', cluster.id,
+            lambda: objects.NodeGroupCollection.get_by_cluster_id(
+                cluster.id).count())
+
     @classmethod
     def get_ip_ranges_first_last(cls, network_group):
         """Get all ip ranges in "10.0.0.0-10.0.0.255" format
@@ -1302,8 +1372,7 @@ class NeutronNetworkDeploymentSerializer61(
         attrs['transformations'] = cls.generate_transformations(
             node, nm, nets_by_ifaces, is_public, prv_base_ep)
 
-        if objects.NodeGroupCollection.get_by_cluster_id(
-                node.cluster.id).count() > 1:
+        if cls.node_groups_count(node.cluster) > 1:
             cls.generate_routes(node, attrs, nm, netgroup_mapping, netgroups)
 
         attrs = cls.generate_driver_information(node, attrs, nm)
@@ -1394,23 +1463,59 @@ class DeploymentMultinodeSerializer(GraphBasedSerializer):
             return bool(node.replaced_deployment_info)
 
         serialized_nodes = []
-        for customized, node_group in groupby(nodes, keyfunc):
-            if customized and not ignore_customized:
-                serialized_nodes.extend(
-                    self.serialize_customized(cluster, node_group))
-            else:
-                serialized_nodes.extend(self.serialize_generated(
-                    cluster, node_group))
+        with SerializationContext():
+            for customized, node_group in groupby(nodes, keyfunc):
+                if customized and not ignore_customized:
+                    serialized_nodes.extend(
+                        self.serialize_customized(cluster, node_group))
+                else:
+                    serialized_nodes.extend(self.serialize_generated(
+                        cluster, node_group))
         return serialized_nodes
 
+    def serialize_compact(self, cluster, nodes, ignore_customized=False):
+        """Generates facts in the compact format: cluster attributes are
+        serialized once and every node gets only its own overlay.
+
+        :param cluster: Cluster db object
+        :param nodes: list of Node db objects
+        :param ignore_customized: ignore replaced deployment info
+        :returns: dict, see expand_deployment_info()
+        """
+        generated_nodes = []
+        customized_nodes = []
+        for node in nodes:
+            if node.replaced_deployment_info and not ignore_customized:
+                customized_nodes.append(node)
+            else:
+                generated_nodes.append(node)
+
+        serialized = {
+            'format': consts.DEPLOYMENT_INFO_FORMATS.compact,
+            'common': {},
+            'nodes': [],
+            'customized': self.serialize_customized(cluster, customized_nodes)
+        }
+        if generated_nodes:
+            with SerializationContext():
+                serialized['common'] = self.get_common_attrs(cluster)
+                serialized['nodes'] = self.serialize_overlays(
+                    cluster, generated_nodes)
+        return serialized
+
     def serialize_generated(self, cluster, nodes):
-        nodes = self.serialize_nodes(nodes)
+        nodes = self.serialize_overlays(cluster, nodes)
         common_attrs = self.get_common_attrs(cluster)
+        return [utils.dict_merge(node, common_attrs) for node in nodes]
+
+    def serialize_overlays(self, cluster, nodes):
+        """Node specific facts without cluster attributes."""
+        nodes = self.serialize_nodes(nodes)
 
         self.set_deployment_priorities(nodes)
         self.set_critical_nodes(nodes)
         self.set_tasks(nodes)
-        return [utils.dict_merge(node, common_attrs) for node in nodes]
+        return nodes
 
     def serialize_customized(self, cluster, nodes):
         serialized = []
@@ -1849,8 +1954,12 @@ def get_serializer_for_cluster(cluster):
     return serializers_map[latest_version][env_mode]
 
 
-def serialize(orchestrator_graph, cluster, nodes, ignore_customized=False):
+def serialize(orchestrator_graph, cluster, nodes, ignore_customized=False,
+              compact=False):
     """Serialization depends on deployment mode
+
+    :param compact: return deployment info in the compact format,
+                    see expand_deployment_info()
     """
     objects.Cluster.set_primary_roles(cluster, nodes)
     env_version = utils.extract_env_version(cluster.release.version)
@@ -1864,5 +1973,30 @@ def serialize(orchestrator_graph, cluster, nodes, ignore_customized=False):
 
     serializer = get_serializer_for_cluster(cluster)(orchestrator_graph)
 
+    if compact:
+        return serializer.serialize_compact(
+            cluster, nodes, ignore_customized=ignore_customized)
     return serializer.serialize(
         cluster, nodes, ignore_customized=ignore_customized)
+
+
+def expand_deployment_info(deployment_info):
+    """Converts compact deployment info to the legacy format.
+
+    Compact deployment info is a dict with the following keys:
+      * common - attributes which are the same for all nodes;
+      * nodes - per-node attributes, the common ones are merged
+        on top of them;
+      * customized - replaced deployment info, which is sent as is.
+
+    :param deployment_info: deployment info in any format
+    :returns: list of serialized nodes
+    """
+    if not isinstance(deployment_info, dict):
+        return deployment_info
+
+    common_attrs = deployment_info['common']
+    expanded = [utils.dict_merge(node, common_attrs)
+                for node in deployment_info['nodes']]
+    expanded.extend(deployment_info['customized'])
+    return expanded
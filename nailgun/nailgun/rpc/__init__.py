@@ -14,12 +14,14 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import logging
+import os
 import six
-import functools
 
 import amqp.exceptions as amqp_exceptions
 from kombu import Connection
 from kombu import Exchange
+from kombu import pools
 from oslo.serialization import jsonutils
 from kombu import Queue
 
@@ -75,25 +77,74 @@ nailgun_queue = Queue(
 )
 
 
+# Messages with these methods carry deployment info and are compressed
+# on the wire when compression is enabled in settings
+compressed_methods = ('deploy', 'granular_deploy')
+
+_producers = None
+_producers_pid = None
+
+
+def get_producers():
+    """Returns pool of producers of the current process
+
+    Connections to RabbitMQ are established on demand and kept open
+    for subsequent casts. The pool is recreated in forked processes,
+    so they never share connections of their parent.
+    """
+    global _producers, _producers_pid
+
+    if _producers is None or _producers_pid != os.getpid():
+        limit = settings.RPC['pool_size']
+        _producers = pools.ProducerPool(
+            Connection(conn_str).Pool(limit=limit), limit=limit)
+        _producers_pid = os.getpid()
+    return _producers
+
+
+def get_compression(message):
+    """Returns compression method for message or None
+
+    :param message: message or list of messages to orchestrator
+    """
+    compression = settings.RPC.get('compression')
+    if not compression:
+        return None
+
+    messages = message if isinstance(message, list) else [message]
+    if any(m.get('method') in compressed_methods for m in messages):
+        return compression
+    return None
+
+
 def cast(name, message, service=False):
-    logger.debug(
-        "RPC cast to orchestrator:\n{0}".format(
-            jsonutils.dumps(message, indent=4)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug(
+            "RPC cast to orchestrator:\n{0}".format(
+                jsonutils.dumps(message, indent=4)
+            )
         )
-    )
     use_queue = naily_queue if not service else naily_service_queue
     use_exchange = naily_exchange if not service else naily_service_exchange
-    with Connection(conn_str) as conn:
-        with conn.Producer(serializer='json') as producer:
-            publish = functools.partial(producer.publish, message,
-                exchange=use_exchange, routing_key=name, declare=[use_queue])
-            try:
-                publish()
-            except amqp_exceptions.PreconditionFailed as e:
-                logger.warning(six.text_type(e))
-                # (dshulyak) we should drop both exchanges/queues in order
-                # for astute to be able to recover temporary queues
-                utils.delete_entities(
-                    conn, naily_service_exchange, naily_service_queue,
-                    naily_exchange, naily_queue)
-                publish()
+    with get_producers().acquire(block=True) as producer:
+        conn = producer.connection
+        # queue is declared only once per connection, kombu remembers
+        # declared entities until the connection is re-established
+        publish_kwargs = dict(
+            exchange=use_exchange, routing_key=name, declare=[use_queue],
+            serializer='json', compression=get_compression(message))
+        publish = conn.ensure(producer, producer.publish,
+                              max_retries=settings.RPC['max_retries'])
+        try:
+            publish(message, **publish_kwargs)
+        except amqp_exceptions.PreconditionFailed as e:
+            logger.warning(six.text_type(e))
+            # (dshulyak) we should drop both exchanges/queues in order
+            # for astute to be able to recover temporary queues
+            utils.delete_entities(
+                conn, naily_service_exchange, naily_service_queue,
+                naily_exchange, naily_queue)
+            conn.declared_entities.clear()
+            # channel is closed by broker after failed declaration
+            producer.revive(conn.channel())
+            publish(message, **publish_kwargs)
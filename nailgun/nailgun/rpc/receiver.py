@@ -244,19 +244,11 @@ class NailgunReceiver(object):
         # if there no node except master - then just skip updating
         # nodes status, for the task itself astute will send
         # message with descriptive error
-        if nodes:
-
-            # lock nodes for updating so they can't be deleted
-            q_nodes = objects.NodeCollection.filter_by_id_list(
-                None,
-                [n['uid'] for n in nodes],
-            )
-            q_nodes = objects.NodeCollection.order_by(q_nodes, 'id')
-            objects.NodeCollection.lock_for_update(q_nodes).all()
+        nodes_by_uid = cls._lock_nodes(nodes)
 
         # First of all, let's update nodes in database
         for node in nodes:
-            node_db = objects.Node.get_by_uid(node['uid'])
+            node_db = nodes_by_uid.get(str(node['uid']))
             if not node_db:
                 logger.warning(
                     u"No node found with uid '{0}' - nothing changed".format(
@@ -304,6 +296,9 @@ class NailgunReceiver(object):
                             task_uuid=task_uuid
                         )
         db().flush()
+        # nodes are also changed outside of receiver (e.g. switched
+        # offline by assassind), so progress isn't adjusted by deltas
+        # of reported nodes but aggregated over the cluster by one query
         if nodes and not progress:
             progress = TaskHelper.recalculate_deployment_task_progress(task)
 
@@ -354,16 +349,11 @@ class NailgunReceiver(object):
             status = consts.TASK_STATUSES.error
             progress = 100
 
-        # lock nodes for updating
-        q_nodes = objects.NodeCollection.filter_by_id_list(
-            None,
-            [n['uid'] for n in nodes])
-        q_nodes = objects.NodeCollection.order_by(q_nodes, 'id')
-        objects.NodeCollection.lock_for_update(q_nodes).all()
+        nodes_by_uid = cls._lock_nodes(nodes)
 
         for node in nodes:
             uid = node.get('uid')
-            node_db = objects.Node.get_by_uid(node['uid'])
+            node_db = nodes_by_uid.get(str(uid))
 
             if not node_db:
                 logger.warn('Node with uid "{0}" not found'.format(uid))
@@ -387,6 +377,27 @@ class NailgunReceiver(object):
 
         cls._update_action_log_entry(status, task.name, task_uuid, nodes)
 
+    @classmethod
+    def _lock_nodes(cls, nodes):
+        """Locks nodes from Astute message and loads them in one query
+
+        :param nodes: list of nodes dicts from Astute message
+        :returns: dict of locked Node instances by string uid
+        """
+        if not nodes:
+            return {}
+
+        # lock nodes for updating so they can't be deleted
+        q_nodes = objects.NodeCollection.filter_by_id_list(
+            None,
+            [n['uid'] for n in nodes],
+        )
+        q_nodes = objects.NodeCollection.order_by(q_nodes, 'id')
+        return dict(
+            (str(node_db.id), node_db) for node_db in
+            objects.NodeCollection.lock_for_update(q_nodes).all()
+        )
+
     @classmethod
     def _update_action_log_entry(cls, task_status, task_name, task_uuid,
                                  nodes_from_resp):
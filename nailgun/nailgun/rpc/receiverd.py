@@ -19,6 +19,10 @@ import sys
 
 sys.path.insert(0, os.path.dirname(__file__))
 
+import collections
+import Queue
+import threading
+import time
 import traceback
 
 import six
@@ -29,60 +33,261 @@ from kombu.mixins import ConsumerMixin
 import amqp.exceptions as amqp_exceptions
 
 from nailgun.db import db
+from nailgun.db.sqlalchemy.models import Task
 from nailgun.errors import errors
 from nailgun.logger import logger
 import nailgun.rpc as rpc
 from nailgun.rpc.receiver import NailgunReceiver
 from nailgun.rpc import utils
+from nailgun.settings import settings
+
+
+class MethodStats(object):
+    """Throughput and latency counters of receiver methods
+    """
+
+    def __init__(self, report_interval=None):
+        self.report_interval = report_interval
+        self._lock = threading.Lock()
+        self._reported_at = time.time()
+        self.reset()
+
+    def reset(self):
+        self.calls = collections.defaultdict(int)
+        self.errors = collections.defaultdict(int)
+        self.total_time = collections.defaultdict(float)
+        self.max_time = collections.defaultdict(float)
+
+    def add(self, method, elapsed, failed=False):
+        with self._lock:
+            self.calls[method] += 1
+            self.total_time[method] += elapsed
+            self.max_time[method] = max(self.max_time[method], elapsed)
+            if failed:
+                self.errors[method] += 1
+
+    def report(self):
+        """Logs counters collected since the last report and resets them
+        """
+        with self._lock:
+            period = time.time() - self._reported_at
+            for method in sorted(self.calls):
+                calls = self.calls[method]
+                logger.info(
+                    u"RPC method %s: %d calls (%d failed), %.2f calls/s, "
+                    u"latency avg %.3fs max %.3fs",
+                    method, calls, self.errors[method],
+                    calls / period if period else 0,
+                    self.total_time[method] / calls,
+                    self.max_time[method])
+            self.reset()
+            self._reported_at = time.time()
+
+    def maybe_report(self):
+        if self.report_interval and \
+                time.time() - self._reported_at >= self.report_interval:
+            self.report()
+
+
+class RPCWorker(threading.Thread):
+    """Thread processing messages routed to it one by one
+    """
+
+    def __init__(self, consumer, name, queue_size=0):
+        super(RPCWorker, self).__init__(name=name)
+        self.daemon = True
+        self.consumer = consumer
+        # consuming loop blocks when worker falls behind
+        self.messages = Queue.Queue(queue_size)
+
+    def put(self, body, msg):
+        self.messages.put((body, msg))
+
+    def stop(self):
+        self.messages.put(None)
+
+    def run(self):
+        while True:
+            item = self.messages.get()
+            if item is None:
+                break
+            try:
+                self.consumer.process_msg(*item)
+            except Exception:
+                # messages of other clusters routed to this worker
+                # must not get stuck, so worker keeps running
+                logger.error(traceback.format_exc())
 
 
 class RPCConsumer(ConsumerMixin):
+    """Consumer of orchestrator responses
+
+    By default messages are processed one at a time in the consuming
+    loop. When several workers are configured, messages are processed
+    by worker threads: responses related to the same cluster always go
+    to the same worker and stay ordered, while different clusters are
+    handled in parallel. Messages are acknowledged from the consuming
+    loop since AMQP channel can't be shared between threads.
+    """
+
+    #: max number of task uuid -> cluster id mappings kept for routing
+    ROUTES_CACHE_SIZE = 1000
 
-    def __init__(self, connection, receiver):
+    def __init__(self, connection, receiver, workers=1, prefetch_count=0,
+                 ack_interval=1, stats_interval=None, queue_size=100):
         self.connection = connection
         self.receiver = receiver
+        self.prefetch_count = prefetch_count
+        self.ack_interval = ack_interval
+        self.stats = MethodStats(stats_interval)
+        self.acks = Queue.Queue()
+        self.routes = {}
+        self.workers = []
+        if workers > 1:
+            self.workers = [
+                RPCWorker(self, 'rpc-worker-{0}'.format(i), queue_size)
+                for i in six.moves.range(workers)
+            ]
 
     def get_consumers(self, Consumer, channel):
         return [Consumer(queues=[rpc.nailgun_queue],
                          callbacks=[self.consume_msg])]
 
+    def on_consume_ready(self, connection, channel, consumers, **kwargs):
+        if self.prefetch_count:
+            for consumer in consumers:
+                consumer.qos(prefetch_count=self.prefetch_count)
+
+    def consume(self, *args, **kwargs):
+        kwargs.setdefault('safety_interval', self.ack_interval)
+        return super(RPCConsumer, self).consume(*args, **kwargs)
+
+    def on_iteration(self):
+        self.ack_processed()
+        self.stats.maybe_report()
+
+    def ack_processed(self):
+        while True:
+            try:
+                msg = self.acks.get_nowait()
+            except Queue.Empty:
+                break
+            try:
+                msg.ack()
+            except Exception:
+                # message is redelivered if channel was lost
+                logger.warning(u"Failed to ack message: %s",
+                               traceback.format_exc())
+
+    def get_route(self, body):
+        """Returns key of the message by which it is assigned to worker
+
+        Key is the cluster id of the task message is related to, so
+        messages for the same cluster are processed in order.
+        """
+        task_uuid = body.get('args', {}).get('task_uuid')
+        if not task_uuid:
+            return None
+
+        if task_uuid not in self.routes:
+            if len(self.routes) >= self.ROUTES_CACHE_SIZE:
+                self.routes.clear()
+            try:
+                task = db().query(Task.cluster_id).filter_by(
+                    uuid=task_uuid).first()
+            finally:
+                db.remove()
+            self.routes[task_uuid] = \
+                task.cluster_id if task and task.cluster_id else task_uuid
+
+        return self.routes[task_uuid]
+
     def consume_msg(self, body, msg):
-        callback = getattr(self.receiver, body["method"])
+        if not self.workers:
+            self.process_msg(body, msg)
+            return
+
+        route = self.get_route(body)
+        worker = self.workers[hash(route) % len(self.workers)]
+        worker.put(body, msg)
+
+    def process_msg(self, body, msg):
+        method = body["method"]
+        callback = getattr(self.receiver, method)
+        started_at = time.time()
+        failed = False
         try:
             callback(**body["args"])
+            db.commit()
         except errors.CannotFindTask as e:
             logger.warn(str(e))
-            msg.ack()
+            db.rollback()
+            self.ack(msg)
         except Exception:
+            failed = True
             logger.error(traceback.format_exc())
-            msg.ack()
+            db.rollback()
+            self.ack(msg)
         except KeyboardInterrupt:
             logger.error("Receiverd interrupted.")
-            msg.requeue()
+            # channel can't be used from worker threads, messages
+            # left unacknowledged there are redelivered by broker
+            if not self.workers:
+                msg.requeue()
             raise
         else:
-            db.commit()
-            msg.ack()
+            self.ack(msg)
         finally:
             db.remove()
+            self.stats.add(method, time.time() - started_at, failed)
+
+    def ack(self, msg):
+        if self.workers:
+            self.acks.put(msg)
+        else:
+            msg.ack()
 
     def on_precondition_failed(self, error_msg):
         logger.warning(error_msg)
         utils.delete_entities(
             self.connection, rpc.nailgun_exchange, rpc.nailgun_queue)
 
+    def start_workers(self):
+        for worker in self.workers:
+            if not worker.is_alive():
+                worker.start()
+
+    def stop_workers(self):
+        for worker in self.workers:
+            worker.stop()
+        for worker in self.workers:
+            if worker.is_alive():
+                worker.join()
+        self.ack_processed()
+
     def run(self, *args, **kwargs):
+        self.start_workers()
         try:
             super(RPCConsumer, self).run(*args, **kwargs)
         except amqp_exceptions.PreconditionFailed as e:
             self.on_precondition_failed(six.text_type(e))
             self.run(*args, **kwargs)
+        except (KeyboardInterrupt, SystemExit):
+            self.stop_workers()
+            raise
 
 
 def run():
     logger.info("Starting standalone RPC consumer...")
     with Connection(rpc.conn_str) as conn:
         try:
-            RPCConsumer(conn, NailgunReceiver).run()
+            RPCConsumer(
+                conn, NailgunReceiver,
+                workers=settings.RPC_CONSUMER['workers'],
+                prefetch_count=settings.RPC_CONSUMER['prefetch_count'],
+                ack_interval=settings.RPC_CONSUMER['ack_interval'],
+                stats_interval=settings.RPC_CONSUMER['stats_interval'],
+                queue_size=settings.RPC_CONSUMER['queue_size']
+            ).run()
         except (KeyboardInterrupt, SystemExit):
             logger.info("Stopping standalone RPC consumer...")
@@ -22,3 +22,7 @@ class StatsException(Exception):
 
 class NoOnlineControllers(StatsException):
     pass
+
+
+class ClusterPollTimeout(StatsException):
+    pass
@@ -14,6 +14,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+import multiprocessing
+import signal
 import six
 import sys
 import time
@@ -31,70 +34,178 @@ from nailgun.statistics.oswl.saver import oswl_statistics_save
 from nailgun.statistics import utils
 
 
-def collect(resource_type):
+class CollectorPool(object):
+    """Bounded pool of worker processes that poll clusters concurrently,
+    clusters are polled by the calling process if there are no workers.
+
+    Processes are used instead of threads because proxy of cluster is
+    passed to OpenStack clients through environment of the process.
+    """
+
+    def __init__(self, workers, cluster_timeout):
+        self.workers = workers
+        self.cluster_timeout = cluster_timeout
+        self._pool = None
+
+    def poll(self, jobs):
+        """Start polling of clusters
+
+        :param jobs: list of arguments for helpers.poll_cluster
+        :returns: list of pairs of cluster id and callable which
+        returns data collected for the cluster
+        """
+        if not self.workers:
+            return [(job[0], functools.partial(helpers.poll_cluster, *job))
+                    for job in jobs]
+
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(self.workers, _init_worker)
+
+        results = []
+        for job in jobs:
+            result = self._pool.apply_async(
+                _poll_cluster_with_timeout, job + (self.cluster_timeout,))
+            results.append((job[0], result.get))
+        return results
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.terminate()
+            self._pool.join()
+            self._pool = None
+
+
+def _init_worker():
+    # collector process handles interruption by terminating the pool
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _poll_cluster_with_timeout(cluster_id, credentials, proxy,
+                               resource_types, timeout):
+    def on_timeout(signum, frame):
+        raise errors.ClusterPollTimeout(
+            "Polling of cluster with id {0} took more than {1} sec."
+            .format(cluster_id, timeout))
+
+    signal.signal(signal.SIGALRM, on_timeout)
+    signal.alarm(timeout)
+    try:
+        return helpers.poll_cluster(
+            cluster_id, credentials, proxy, resource_types)
+    finally:
+        signal.alarm(0)
+
+
+def collect(resource_types, pool=None):
+    """Collect OSWL data of resource_types for all operational clusters
+    and update data in DB.
+
+    :param resource_types: name of resource or list of names
+    :param pool: CollectorPool, clusters are polled one by one
+    in current process if it's not passed
+    """
+    if isinstance(resource_types, six.string_types):
+        resource_types = [resource_types]
+    pool = pool or CollectorPool(0, None)
+
     try:
         operational_clusters = ClusterCollection.filter_by(
             iterable=None, status=consts.CLUSTER_STATUSES.operational).all()
         error_clusters = ClusterCollection.filter_by(
             iterable=None, status=consts.CLUSTER_STATUSES.error).all()
-
-        all_envs_last_recs = \
-            OpenStackWorkloadStatsCollection.get_last_by_resource_type(
-                resource_type)
         ready_or_error_ids = set([c.id for c in operational_clusters] +
                                  [c.id for c in error_clusters])
-        envs_ids_to_clear = set(r.cluster_id for r in all_envs_last_recs) - \
-            ready_or_error_ids
-        # Clear current resource data for unavailable clusters.
-        # Current OSWL data is cleared for those clusters which status is not
-        # 'operational' nor 'error' or when cluster was removed. Data is
-        # cleared for cluster only if it was updated recently (today or
-        # yesterday). While this collector is running with interval much
-        # smaller than one day it should not miss any unavailable cluster.
-        for id in envs_ids_to_clear:
-            oswl_statistics_save(id, resource_type, [])
 
-        # Collect current OSWL data and update data in DB
+        for resource_type in resource_types:
+            all_envs_last_recs = \
+                OpenStackWorkloadStatsCollection.get_last_by_resource_type(
+                    resource_type)
+            envs_ids_to_clear = \
+                set(r.cluster_id for r in all_envs_last_recs) - \
+                ready_or_error_ids
+            # Clear current resource data for unavailable clusters.
+            # Current OSWL data is cleared for those clusters which status
+            # is not 'operational' nor 'error' or when cluster was removed.
+            # Data is cleared for cluster only if it was updated recently
+            # (today or yesterday). While this collector is running with
+            # interval much smaller than one day it should not miss any
+            # unavailable cluster.
+            for id in envs_ids_to_clear:
+                oswl_statistics_save(id, resource_type, [])
+
+        jobs = []
         for cluster in operational_clusters:
             try:
-                client_provider = helpers.ClientProvider(cluster)
+                credentials = helpers.ClientProvider.get_credentials(cluster)
                 proxy_for_os_api = utils.get_proxy_for_cluster(cluster)
+                jobs.append(
+                    (cluster.id, credentials, proxy_for_os_api,
+                     resource_types))
+            except errors.StatsException as e:
+                _log_collection_error(resource_types, cluster.id, e)
 
-                with utils.set_proxy(proxy_for_os_api):
-                    data = helpers.get_info_from_os_resource_manager(
-                        client_provider, resource_type)
-                    oswl_statistics_save(cluster.id, resource_type, data)
+        # Collect current OSWL data and update data in DB
+        for cluster_id, get_data in pool.poll(jobs):
+            try:
+                data = get_data()
+            except Exception as e:
+                _log_collection_error(resource_types, cluster_id, e)
+                continue
 
-            except errors.StatsException as e:
-                logger.error("Cannot collect OSWL resource {0} for cluster "
-                             "with id {1}. Details: {2}."
-                             .format(resource_type,
-                                     cluster.id,
-                                     six.text_type(e))
-                             )
+            for resource_type in resource_types:
+                if resource_type in data:
+                    oswl_statistics_save(
+                        cluster_id, resource_type, data[resource_type])
 
         db.commit()
 
     except Exception as e:
         logger.exception("Exception while collecting OS workloads "
-                         "for resource name {0}. Details: {1}"
-                         .format(resource_type, six.text_type(e)))
+                         "for resource names {0}. Details: {1}"
+                         .format(", ".join(resource_types),
+                                 six.text_type(e)))
     finally:
         db.remove()
 
 
+def _log_collection_error(resource_types, cluster_id, e):
+    logger.error("Cannot collect OSWL resources {0} for cluster "
+                 "with id {1}. Details: {2}."
+                 .format(", ".join(resource_types),
+                         cluster_id,
+                         six.text_type(e))
+                 )
+
+
 def run():
-    resource_type = sys.argv[1]
-    poll_interval = settings.OSWL_COLLECTORS_POLLING_INTERVAL[resource_type]
-    logger.info("Starting OSWL collector for {0} resource"
-                .format(resource_type))
+    """Poll resources of all clusters, each resource with its own
+    interval. Names of resources to be polled can be passed as
+    arguments, all known resources are polled otherwise.
+    """
+    resource_types = sys.argv[1:] or \
+        sorted(settings.OSWL_COLLECTORS_POLLING_INTERVAL)
+    pool = CollectorPool(settings.OSWL_COLLECTOR["workers"],
+                         settings.OSWL_COLLECTOR["cluster_timeout"])
+    next_polls = dict.fromkeys(resource_types, 0)
+
+    logger.info("Starting OSWL collector for {0} resources"
+                .format(", ".join(resource_types)))
     try:
         while True:
-            if MasterNodeSettings.must_send_stats():
-                collect(resource_type)
+            now = time.time()
+            due = [r for r in resource_types if next_polls[r] <= now]
+            if due and MasterNodeSettings.must_send_stats():
+                collect(due, pool)
+
+            for resource_type in due:
+                next_polls[resource_type] = now + \
+                    settings.OSWL_COLLECTORS_POLLING_INTERVAL[resource_type]
 
-            time.sleep(poll_interval)
+            time.sleep(max(min(six.itervalues(next_polls)) - time.time(),
+                           1))
 
     except (KeyboardInterrupt, SystemExit):
-        logger.info("Stopping OSWL collector for {0} resource"
-                    .format(resource_type))
+        logger.info("Stopping OSWL collector for {0} resources"
+                    .format(", ".join(resource_types)))
+    finally:
+        pool.close()
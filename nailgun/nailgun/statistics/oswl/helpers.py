@@ -12,6 +12,7 @@
 #    under the License.
 
 import six
+import time
 
 from cinderclient import client as cinder_client
 from keystoneclient import discover as keystone_discover
@@ -24,6 +25,7 @@ from nailgun.db import db
 from nailgun.logger import logger
 from nailgun import objects
 from nailgun.settings import settings
+from nailgun.statistics import errors
 from nailgun.statistics.oswl.resources_description \
     import resources_description
 from nailgun.statistics import utils
@@ -40,12 +42,12 @@ class ClientProvider(object):
         "keystone": ["version"]
     }
 
-    def __init__(self, cluster):
+    def __init__(self, cluster, credentials=None):
         self.cluster = cluster
         self._nova = None
         self._cinder = None
         self._keystone = None
-        self._credentials = None
+        self._credentials = credentials
 
     @property
     def nova(self):
@@ -112,34 +114,115 @@ class ClientProvider(object):
     @property
     def credentials(self):
         if self._credentials is None:
-            cluster_attrs_editable = \
-                objects.Cluster.get_editable_attributes(
-                    self.cluster
-                )["editable"]
+            self._credentials = self.get_credentials(self.cluster)
 
-            access_data = cluster_attrs_editable.get(
-                "workloads_collector"
-            )
+        return self._credentials
+
+    @classmethod
+    def get_credentials(cls, cluster):
+        """Get credentials for authentication in OpenStack installation
+        of cluster.
 
-            if not access_data:
-                # in case there is no section for workloads_collector
-                # in cluster attributes we try to fallback here to
-                # default credential for the cluster. It is not 100%
-                # foolproof as user might have changed them at this time
-                access_data = cluster_attrs_editable["access"]
+        :param cluster: cluster instance
+        :returns: tuple of user, password, tenant and auth url
+        """
+        cluster_attrs_editable = \
+            objects.Cluster.get_editable_attributes(cluster)["editable"]
 
-            os_user = access_data["user"]["value"]
-            os_password = access_data["password"]["value"]
-            os_tenant = access_data["tenant"]["value"]
+        access_data = cluster_attrs_editable.get(
+            "workloads_collector"
+        )
 
-            auth_host = utils.get_mgmt_ip_of_cluster_controller(self.cluster)
-            auth_url = "http://{0}:{1}/{2}/".format(
-                auth_host, settings.AUTH_PORT,
-                settings.OPENSTACK_API_VERSION["keystone"])
+        if not access_data:
+            # in case there is no section for workloads_collector
+            # in cluster attributes we try to fallback here to
+            # default credential for the cluster. It is not 100%
+            # foolproof as user might have changed them at this time
+            access_data = cluster_attrs_editable["access"]
 
-            self._credentials = (os_user, os_password, os_tenant, auth_url)
+        os_user = access_data["user"]["value"]
+        os_password = access_data["password"]["value"]
+        os_tenant = access_data["tenant"]["value"]
 
-        return self._credentials
+        auth_host = utils.get_mgmt_ip_of_cluster_controller(cluster)
+        auth_url = "http://{0}:{1}/{2}/".format(
+            auth_host, settings.AUTH_PORT,
+            settings.OPENSTACK_API_VERSION["keystone"])
+
+        return (os_user, os_password, os_tenant, auth_url)
+
+
+class ClientProvidersCache(object):
+    """Client providers of clusters that are kept between collections,
+    so clients authenticated in keystone are reused until credentials
+    of cluster are changed, polling of cluster fails or providers
+    are expired.
+    """
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self.providers = {}
+
+    def get(self, cluster_id, credentials):
+        now = time.time()
+        for expired_id in [c_id for c_id, (_, expires_at)
+                           in six.iteritems(self.providers)
+                           if expires_at <= now]:
+            del self.providers[expired_id]
+
+        cached = self.providers.get(cluster_id)
+        if cached is not None and cached[0].credentials == credentials:
+            return cached[0]
+
+        client_provider = ClientProvider(None, credentials=credentials)
+        self.providers[cluster_id] = (client_provider, now + self.ttl)
+        return client_provider
+
+    def invalidate(self, cluster_id):
+        self.providers.pop(cluster_id, None)
+
+    def clear(self):
+        self.providers.clear()
+
+
+client_providers = ClientProvidersCache(
+    settings.OSWL_COLLECTOR["clients_ttl"])
+
+
+def poll_cluster(cluster_id, credentials, proxy, resource_types):
+    """Collect info of resources from OpenStack installation of cluster
+    reusing clients authenticated by previous polls of the cluster.
+    Database is not used here, so it can be called by worker processes.
+
+    :param cluster_id: id of cluster
+    :param credentials: credentials returned by
+    ClientProvider.get_credentials for the cluster
+    :param proxy: proxy url for access to the installation
+    :param resource_types: list of names of resources to be collected
+    :returns: dict of collected info by resource name, resources that
+    failed to be collected are absent in it
+    """
+    client_provider = client_providers.get(cluster_id, credentials)
+    data = {}
+
+    with utils.set_proxy(proxy):
+        for resource_type in resource_types:
+            try:
+                data[resource_type] = get_info_from_os_resource_manager(
+                    client_provider, resource_type)
+            except errors.ClusterPollTimeout:
+                client_providers.invalidate(cluster_id)
+                raise
+            except Exception as e:
+                logger.error("Cannot collect OSWL resource {0} for cluster "
+                             "with id {1}. Details: {2}."
+                             .format(resource_type, cluster_id,
+                                     six.text_type(e)))
+                # clients may hold expired token or be broken otherwise,
+                # so they are not reused by next collections
+                client_providers.invalidate(cluster_id)
+
+    return data
 
 
 def get_info_from_os_resource_manager(client_provider, resource_name):
@@ -16,114 +16,132 @@
 
 
 from datetime import datetime
+import functools
 import hashlib
 import json
 import six
 
+from nailgun import consts
 from nailgun import objects
 
 
-def _added(time, prev, curr, collected):
-    prev_ids = set(res['id'] for res in prev)
-    curr_ids = set(res['id'] for res in curr)
-    added_ids = curr_ids - prev_ids
-    for id_val in added_ids:
-        collected.append({'id': id_val, 'time': time.isoformat()})
-    return collected
+def _fingerprints(data):
+    """Get fingerprints of resources keyed by their ids.
 
+    :param data: list of resources
+    :returns: list of pairs of resource id as text and fingerprint
+    """
+    return [(six.text_type(res['id']),
+             hashlib.sha1(json.dumps(res, sort_keys=True)).hexdigest())
+            for res in data]
+
+
+def _checksum(fingerprints):
+    return hashlib.sha1(''.join(fingerprints)).hexdigest()
+
+
+def oswl_data_checksum(data):
+    return _checksum(fp for _, fp in _fingerprints(data))
 
-def _removed(time, prev, curr, collected):
-    prev_ids = set(res['id'] for res in prev)
-    curr_ids = set(res['id'] for res in curr)
-    collected_ids = set(res['id'] for res in collected)
-    removed_ids = prev_ids - curr_ids
+
+def _events(time, prev, prev_fps, curr, curr_fps, get_removed_ids):
+    """Get changes of resources as events. Only fingerprints are
+    compared, so resources are looked through only if they are changed.
+
+    :param get_removed_ids: callable returning ids of resources
+    which removal is already stored
+    :returns: list of event type, time and resource data
+    """
+    changed = set(key for key, fp in six.iteritems(curr_fps)
+                  if prev_fps.get(key) != fp)
+    removed = set(prev_fps) - set(curr_fps)
+    if not changed and not removed:
+        return []
+
+    prev_changed = {}
     for res in prev:
-        id_val = res['id']
-        if id_val in removed_ids:
+        key = six.text_type(res['id'])
+        if key in changed:
+            prev_changed[key] = res
+
+    events = []
+    for res in curr:
+        key = six.text_type(res['id'])
+        if key not in changed:
+            continue
+        if key not in prev_fps:
+            events.append((consts.OSWL_EVENT_TYPES.added, time,
+                           {'id': res['id']}))
+        elif key in prev_changed:
+            m = dict((k, v)
+                     for k, v in six.iteritems(prev_changed[key])
+                     if v != res.get(k))
+            m['id'] = res['id']
+            events.append((consts.OSWL_EVENT_TYPES.modified, time, m))
+
+    if removed:
+        removed_ids = get_removed_ids()
+        for res in prev:
+            if six.text_type(res['id']) not in removed:
+                continue
             # If we already have resource collected only id with removal
             # time will be saved. In case of set of removals current state
             # of removed resource can be restored by data in 'removed',
             # 'added', 'modified'
-            if id_val in collected_ids:
-                collected.append({'id': id_val, 'time': time.isoformat()})
-            else:
-                res_data = dict(res, **{'time': time.isoformat()})
-                collected.append(res_data)
-    return collected
-
-
-def _modified(time, prev, curr, collected):
-    prev_dict = dict((res['id'], res) for res in prev)
-    curr_dict = dict((res['id'], res) for res in curr)
-    same = set(prev_dict.keys()) & set(curr_dict.keys())
-    for id_val in same:
-        if curr_dict[id_val] != prev_dict[id_val]:
-            m = dict((k, v)
-                     for k, v in six.iteritems(prev_dict[id_val])
-                     if v != curr_dict[id_val].get(k))
-            m['time'] = time.isoformat()
-            m['id'] = id_val
-            collected.append(m)
-    return collected
-
+            if res['id'] in removed_ids:
+                res = {'id': res['id']}
+            events.append((consts.OSWL_EVENT_TYPES.removed, time, res))
 
-def oswl_data_checksum(data):
-    return hashlib.sha1(json.dumps(data)).hexdigest()
+    return events
 
 
 def oswl_statistics_save(cluster_id, resource_type, data):
     """Save OSWL statistics data for given cluster and resource_type to DB.
+    Changes of resources are stored as events of the record, current
+    resources and their fingerprints are stored in the record itself.
     DB changes are not committed here.
     """
     dt = datetime.utcnow()
     rec = objects.OpenStackWorkloadStats.get_last_by(
         cluster_id, resource_type)
-    cs = oswl_data_checksum(data)
+    fingerprints = _fingerprints(data)
+    cs = _checksum(fp for _, fp in fingerprints)
+    if rec and cs == rec.resource_checksum:
+        return
+
+    prev, prev_fps = [], {}
+    if rec:
+        prev = (rec.current_data or {}).get('current', [])
+        # records saved by previous versions have no fingerprints
+        prev_fps = rec.resource_fingerprints or dict(_fingerprints(prev))
+
+    curr_fps = dict(fingerprints)
     obj_data = {
         'updated_time': dt.time(),
-        'resource_data': {'current': data},
+        'current_data': {'current': data},
+        'resource_fingerprints': curr_fps,
         'resource_checksum': cs
     }
-    if rec:
-        if cs == rec.resource_checksum:
-            return
-        last_dict = rec.resource_data
-        cur_dict = last_dict['current']
-        if rec.created_date == dt.date():
-            # update record
-            obj_data['resource_data'].update({
-                'added': _added(
-                    dt.time(), cur_dict, data, last_dict['added']),
-                'removed': _removed(
-                    dt.time(), cur_dict, data, last_dict['removed']),
-                'modified': _modified(
-                    dt.time(), cur_dict, data, last_dict['modified'])
-            })
-            rec.is_sent = False
-            objects.OpenStackWorkloadStats.update(rec, obj_data)
-        else:
-            # create new record
-            obj_data.update({
-                'cluster_id': cluster_id,
-                'resource_type': resource_type,
-                'created_date': dt.date()
-            })
-            obj_data['resource_data'].update({
-                'added': _added(dt.time(), cur_dict, data, []),
-                'removed': _removed(dt.time(), cur_dict, data, []),
-                'modified': _modified(dt.time(), cur_dict, data, [])
-            })
-            objects.OpenStackWorkloadStats.create(obj_data)
+    if rec and rec.created_date == dt.date():
+        # update record, changes stored by previous versions are kept
+        obj_data.update({
+            'current_data': dict(rec.current_data or {}, current=data),
+            'is_sent': False
+        })
+        objects.OpenStackWorkloadStats.update(rec, obj_data)
+        get_removed_ids = functools.partial(
+            objects.OpenStackWorkloadStats.get_removed_ids, rec)
     else:
-        # it will be the first record
+        # create new record, it will be the first one if there is no rec
         obj_data.update({
             'cluster_id': cluster_id,
             'resource_type': resource_type,
             'created_date': dt.date()
         })
-        obj_data['resource_data'].update({
-            'added': _added(dt.time(), [], data, []),
-            'removed': [],
-            'modified': []
-        })
-        objects.OpenStackWorkloadStats.create(obj_data)
+        rec = objects.OpenStackWorkloadStats.create(obj_data)
+        get_removed_ids = set
+
+    objects.OpenStackWorkloadStats.add_events(
+        rec,
+        _events(dt.time(), prev, prev_fps, data, curr_fps, get_removed_ids)
+    )
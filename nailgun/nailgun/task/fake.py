@@ -30,6 +30,7 @@ from nailgun import objects
 
 from nailgun.db import db
 from nailgun.db.sqlalchemy.models import Node
+from nailgun.orchestrator import deployment_serializers
 from nailgun.rpc.receiver import NailgunReceiver
 from nailgun.settings import settings
 
@@ -276,7 +277,8 @@ class FakeDeploymentThread(FakeAmpqThread):
 
         kwargs = {
             'task_uuid': self.task_uuid,
-            'nodes': self.data['args']['deployment_info'],
+            'nodes': deployment_serializers.expand_deployment_info(
+                self.data['args']['deployment_info']),
             'status': 'running'
         }
 
@@ -18,8 +18,11 @@ import datetime
 import six
 import web
 
+from sqlalchemy import case
+from sqlalchemy import func
 from sqlalchemy import or_
 from sqlalchemy.orm import exc
+from sqlalchemy.sql.expression import false
 
 from nailgun import consts
 from nailgun.db import db
@@ -57,21 +60,6 @@ tasks_names_actions_groups_mapping = {
 
 class TaskHelper(object):
 
-    # TODO(aroma): move this function to utils module
-    @classmethod
-    def calculate_parent_task_progress(cls, subtasks_list):
-        return int(
-            round(
-                sum(
-                    [s.weight * s.progress for s
-                     in subtasks_list]
-                ) /
-                sum(
-                    [s.weight for s
-                     in subtasks_list]
-                ), 0)
-        )
-
     # TODO(aroma): move it to utils module
     @classmethod
     def before_deployment_error(cls, task):
@@ -107,36 +95,44 @@ class TaskHelper(object):
 
     @classmethod
     def recalculate_deployment_task_progress(cls, task):
-        cluster_nodes = db().query(Node).filter_by(cluster_id=task.cluster_id)
-        nodes_progress = []
-        nodes_progress.extend(
-            cluster_nodes.filter_by(status='discover').count() * [0])
-        nodes_progress.extend(
-            cluster_nodes.filter_by(online=False).count() * [100])
-
-        # Progress of provisioned node is 0
-        # because deployment not started yet
-        nodes_progress.extend(
-            cluster_nodes.filter_by(status='provisioned').count() * [0])
-
-        nodes_progress.extend([
-            n.progress for n in
-            cluster_nodes.filter(
-                Node.status.in_(['deploying', 'ready']))])
-
-        if nodes_progress:
-            return int(float(sum(nodes_progress)) / len(nodes_progress))
+        """Returns average progress of cluster nodes, all of them are
+        counted with one aggregate query
+
+        Nodes in discover and provisioned status have progress 0
+        because deployment isn't started yet, offline nodes have
+        progress 100. Offline node is also counted by its status,
+        so it contributes to the average twice.
+        """
+        offline = Node.online == false()
+        deploying = Node.status.in_(['deploying', 'ready'])
+        not_started = Node.status.in_(['discover', 'provisioned'])
+        progress_sum, nodes_count = db().query(
+            func.sum(
+                case([(offline, 100)], else_=0) +
+                case([(deploying, func.coalesce(Node.progress, 0))],
+                     else_=0)),
+            func.sum(
+                case([(offline, 1)], else_=0) +
+                case([(not_started, 1)], else_=0) +
+                case([(deploying, 1)], else_=0))
+        ).filter_by(cluster_id=task.cluster_id).one()
+
+        if nodes_count:
+            return int(float(progress_sum) / nodes_count)
 
     @classmethod
     def recalculate_provisioning_task_progress(cls, task):
-        cluster_nodes = db().query(Node).filter_by(cluster_id=task.cluster_id)
-        nodes_progress = [
-            n.progress for n in
-            cluster_nodes.filter(
-                Node.status.in_(['provisioning', 'provisioned']))]
-
-        if nodes_progress:
-            return int(float(sum(nodes_progress)) / len(nodes_progress))
+        progress_sum, nodes_count = db().query(
+            func.sum(func.coalesce(Node.progress, 0)),
+            func.count(Node.id)
+        ).filter_by(
+            cluster_id=task.cluster_id
+        ).filter(
+            Node.status.in_(['provisioning', 'provisioned'])
+        ).one()
+
+        if nodes_count:
+            return int(float(progress_sum) / nodes_count)
 
     @classmethod
     def nodes_to_delete(cls, cluster):
@@ -357,7 +353,26 @@ class TaskHelper(object):
         if al.action_name not in task_output_white_list:
             return None
         white_list = task_output_white_list[al.action_name]
-        return sanitize_sub_tree(task_output, white_list)
+        return sanitize_sub_tree(
+            cls._expand_deployment_info(task_output), white_list)
+
+    @classmethod
+    def _expand_deployment_info(cls, task_output):
+        """Converts compact deployment info of task message to the
+        legacy list of nodes which is described by white lists.
+        """
+        # preventing cycle import error
+        from nailgun.orchestrator.deployment_serializers import \
+            expand_deployment_info
+
+        args = isinstance(task_output, dict) and task_output.get('args')
+        if not isinstance(args, dict) or \
+                not isinstance(args.get('deployment_info'), dict):
+            return task_output
+
+        args = dict(args, deployment_info=expand_deployment_info(
+            args['deployment_info']))
+        return dict(task_output, args=args)
 
     @classmethod
     def create_action_log(cls, task):
@@ -378,8 +393,8 @@ class TaskHelper(object):
         """Retrieve "cache" attritbute from task instance.
 
         In some cases row that is related to task_instance is deleted
-        from db and, since "cache" attribute has marked as deffered,
-        SQLAlchemy error occurs.
+        from db and, since "cache" attribute is loaded lazily from
+        a blob, SQLAlchemy error occurs.
 
         :param task_instance: task object to inspect
         :returns: task_instance.cache attribute value or emty dict if
@@ -129,6 +129,15 @@ class DeploymentTask(object):
             return 'granular_deploy'
         return 'deploy'
 
+    @classmethod
+    def _use_compact_deployment_info(cls):
+        """Check whether orchestrator accepts compact deployment info
+
+        :returns: bool
+        """
+        return settings.DEPLOYMENT_INFO_FORMAT == \
+            consts.DEPLOYMENT_INFO_FORMATS.compact
+
     @classmethod
     def message(cls, task, nodes, deployment_tasks=None):
         logger.debug("DeploymentTask.message(task=%s)" % task.uuid)
@@ -159,7 +168,8 @@ class DeploymentTask(object):
         # it should not cause any issues with deployment/progress and was
         # done by design
         serialized_cluster = deployment_serializers.serialize(
-            orchestrator_graph, task.cluster, nodes)
+            orchestrator_graph, task.cluster, nodes,
+            compact=cls._use_compact_deployment_info())
         pre_deployment = stages.pre_deployment_serialize(
             orchestrator_graph, task.cluster, nodes)
         post_deployment = stages.post_deployment_serialize(
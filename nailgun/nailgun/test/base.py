@@ -39,6 +39,7 @@ import web
 from webtest import app
 
 import nailgun
+from nailgun.api.v1.handlers.base import response_cache
 from nailgun.api.v1.urls import urls
 
 from nailgun import consts
@@ -61,6 +62,7 @@ from nailgun.db.sqlalchemy.models import Task
 from nailgun.objects import Cluster
 from nailgun.objects import MasterNodeSettings
 from nailgun.objects import Node
+from nailgun.objects.node import heartbeats
 from nailgun.objects import NodeGroup
 from nailgun.objects import Release
 
@@ -69,6 +71,7 @@ from nailgun.consts import NETWORK_INTERFACE_TYPES
 from nailgun.middleware.connection_monitor import ConnectionMonitorMiddleware
 from nailgun.middleware.keystone import NailgunFakeKeystoneAuthMiddleware
 from nailgun.network.manager import NetworkManager
+from nailgun.settings import settings
 
 
 class TimeoutError(Exception):
@@ -923,6 +926,8 @@ class BaseTestCase(TestCase):
 
     @classmethod
     def setUpClass(cls):
+        # action logs of requests are checked right after the requests
+        settings.ACTION_LOG_WRITER['background'] = False
         cls.app = app.TestApp(
             build_app(db_driver=test_db_driver).wsgifunc(
                 ConnectionMonitorMiddleware)
@@ -944,7 +949,11 @@ class BaseTestCase(TestCase):
 
     def setUp(self):
         self.db = db
+        # buffer of agent heartbeats is global for the process
+        heartbeats.reset()
         flush()
+        # cached bodies must not outlive data they were rendered from
+        response_cache.clear()
         self.env = EnvironmentManager(app=self.app, session=self.db)
         self.env.upload_fixtures(self.fixtures)
 
@@ -16,6 +16,7 @@ import datetime
 import mock
 
 from nailgun import consts
+from nailgun.middleware.connection_monitor import ActionLogWriter
 from nailgun import objects
 from nailgun.test.base import BaseMasterNodeSettignsTest
 from nailgun.test.base import fake_tasks
@@ -158,3 +159,34 @@ class TestActionLogs(BaseMasterNodeSettignsTest):
         action_log = objects.ActionLogCollection.filter_by(
             None, task_uuid=task.uuid)
         self.assertIsNotNone(action_log)
+
+    def test_action_logs_written_in_background(self):
+        records = [{
+            'actor_id': None,
+            'action_group': 'cluster_changes',
+            'action_name': 'cluster_instance',
+            'action_type': consts.ACTION_TYPES.http_request,
+            'start_timestamp': datetime.datetime.utcnow(),
+            'end_timestamp': datetime.datetime.utcnow(),
+            'additional_info': {'request_data': {}, 'response_data': {}},
+            'cluster_id': i,
+        } for i in range(5)]
+
+        writer = ActionLogWriter()
+        with mock.patch.dict('nailgun.middleware.connection_monitor.'
+                             'settings.ACTION_LOG_WRITER',
+                             {'background': True, 'batch_size': 2,
+                              'flush_interval': 60000}):
+            with mock.patch.object(writer, 'write',
+                                   wraps=writer.write) as write_mock:
+                for record in records:
+                    writer.push(record)
+                writer.stop()
+
+        self.assertEqual(
+            [len(call[0][0]) for call in write_mock.call_args_list],
+            [2, 2, 1])
+        action_logs = objects.ActionLogCollection.filter_by(
+            None, action_name='cluster_instance')
+        self.assertItemsEqual(
+            [al.cluster_id for al in action_logs], range(5))
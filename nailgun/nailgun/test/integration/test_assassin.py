@@ -15,6 +15,8 @@
 #    under the License.
 
 from nailgun.assassin import assassind
+from nailgun import consts
+from nailgun.db.sqlalchemy.models import Notification
 from nailgun.test.base import BaseIntegrationTest
 
 
@@ -42,3 +44,20 @@ class TestKeepalive(BaseIntegrationTest):
         )
         assassind.update_nodes_status(self.ZERO_TIMEOUT)
         self.assertEqual(node.online, True)
+
+    def test_notifications_for_nodes_gone_away(self):
+        nodes = [self.env.create_node(name="Dead or alive {0}".format(i))
+                 for i in range(3)]
+
+        self.assertEqual(
+            assassind.update_nodes_status(self.ZERO_TIMEOUT), 3)
+        # nodes are already offline
+        self.assertEqual(
+            assassind.update_nodes_status(self.ZERO_TIMEOUT), 0)
+
+        notifications = self.db.query(Notification).filter_by(
+            topic=consts.NOTIFICATION_TOPICS.error).all()
+        self.assertItemsEqual(
+            [(n.node_id, n.message) for n in notifications],
+            [(node.id, u"Node '{0}' has gone away".format(node.name))
+             for node in nodes])
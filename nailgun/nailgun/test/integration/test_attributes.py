@@ -150,6 +150,36 @@ class TestAttributes(BaseIntegrationTest):
         attrs.editable.pop('foo')
         self.assertNotEqual(attrs.editable, {})
 
+    def test_attributes_conditional_get(self):
+        cluster_id = self.env.create_cluster(api=True)['id']
+        url = reverse(
+            'ClusterAttributesHandler',
+            kwargs={'cluster_id': cluster_id})
+        resp = self.app.get(url, headers=self.default_headers)
+        self.assertEqual(200, resp.status_code)
+        etag = resp.headers['ETag']
+
+        headers = dict(self.default_headers, **{'If-None-Match': etag})
+        resp = self.app.get(url, headers=headers)
+        self.assertEqual(304, resp.status_code)
+        self.assertEqual(etag, resp.headers['ETag'])
+
+        resp = self.app.patch(
+            url,
+            params=jsonutils.dumps({
+                'editable': {
+                    "foo": "bar"
+                },
+            }),
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+
+        resp = self.app.get(url, headers=headers)
+        self.assertEqual(200, resp.status_code)
+        self.assertNotEqual(etag, resp.headers['ETag'])
+        self.assertEqual("bar", resp.json_body['editable']['foo'])
+
     def test_failing_attributes_put(self):
         cluster_id = self.env.create_cluster(api=True)['id']
         resp = self.app.get(
@@ -31,6 +31,7 @@ from nailgun.db.sqlalchemy.models import IPAddrRange
 from nailgun.db.sqlalchemy.models import NetworkGroup
 from nailgun.db.sqlalchemy.models import Node
 from nailgun.db.sqlalchemy.models import NodeNICInterface
+from nailgun.errors import errors
 from nailgun.network.neutron import NeutronManager
 from nailgun.network.nova_network import NovaNetworkManager
 from nailgun.test.base import BaseIntegrationTest
@@ -92,6 +93,40 @@ class TestNetworkManager(BaseIntegrationTest):
         self.assertEqual(False, gateway in assigned_ips)
         self.assertEqual(False, broadcast in assigned_ips)
 
+    def test_assign_ips_for_networks(self):
+        self.env.create(
+            cluster_kwargs={},
+            nodes_kwargs=[
+                {"pending_addition": True, "roles": ["controller"]},
+                {"pending_addition": True, "roles": ["compute"]}
+            ]
+        )
+        networks = ['management', 'public', 'storage']
+        group_id = objects.Cluster.get_default_group(
+            self.env.clusters[0]).id
+        network_ids = [
+            ng.id for ng in self.db.query(NetworkGroup).filter(
+                NetworkGroup.name.in_(networks)
+            ).filter_by(group_id=group_id)
+        ]
+
+        self.env.network_manager.assign_ips_for_networks(
+            self.env.nodes, networks)
+        ips = self.db.query(IPAddr).filter(
+            IPAddr.network.in_(network_ids)).all()
+        self.assertEqual(len(ips), 6)
+        self.assertEqual(len(set(ip.ip_addr for ip in ips)), 6)
+        for node in self.env.nodes:
+            self.assertEqual(len(node.ip_addrs), 3)
+
+        # assignment is idempotent
+        self.env.network_manager.assign_ips_for_networks(
+            self.env.nodes, networks)
+        self.assertEqual(
+            self.db.query(IPAddr).filter(
+                IPAddr.network.in_(network_ids)).count(),
+            6)
+
     @fake_tasks(fake_rpc=False, mock_rpc=False)
     @patch('nailgun.rpc.cast')
     def test_assign_ips_idempotent(self, mocked_rpc):
@@ -245,6 +280,28 @@ class TestNetworkManager(BaseIntegrationTest):
                 IPNetwork(mgmt_net.cidr)
             )
 
+    def test_occupied_ip_of_single_ip_range_is_not_free(self):
+        self.env.create(cluster_kwargs={'api': False})
+        mgmt_net = self.db.query(NetworkGroup).filter_by(
+            group_id=objects.Cluster.get_default_group(
+                self.env.clusters[0]).id,
+            name='management'
+        ).first()
+        for ip_range in mgmt_net.ip_ranges:
+            self.db.delete(ip_range)
+        self.db.add(IPAddrRange(
+            first='10.20.0.2',
+            last='10.20.0.2',
+            network_group_id=mgmt_net.id
+        ))
+        self.db.add(IPAddr(ip_addr='10.20.0.2', network=mgmt_net.id))
+        self.db.commit()
+        self.db.refresh(mgmt_net)
+
+        self.assertRaises(
+            errors.OutOfIPs,
+            self.env.network_manager.get_free_ips, mgmt_net)
+
     def test_ipaddr_joinedload_relations(self):
         self.env.create(
             cluster_kwargs={},
@@ -269,6 +326,36 @@ class TestNetworkManager(BaseIntegrationTest):
         network_data = self.env.network_manager.get_node_networks(node)
         self.assertEqual(network_data, [])
 
+    def test_get_nodes_networks(self):
+        self.env.create(
+            cluster_kwargs={
+                'api': False,
+                'net_provider': 'neutron',
+                'net_segment_type': 'gre'
+            },
+            nodes_kwargs=[
+                {"pending_addition": True, "roles": ["controller"]},
+                {"pending_addition": True, "roles": ["compute"]},
+                {"pending_addition": True, "roles": ["cinder"]}
+            ]
+        )
+        node_group = self.env.create_node_group()
+        self.env.nodes[2].group_id = node_group.json_body['id']
+        free_node = self.env.create_node(api=False)
+        self.db().flush()
+        self.env.network_manager.assign_ips(self.env.nodes[:2], "management")
+        self.env.network_manager.assign_admin_ips(self.env.nodes[:2])
+
+        nodes = self.env.nodes + [free_node]
+        networks = self.env.network_manager.get_nodes_networks(nodes)
+
+        self.assertEqual(len(networks), len(nodes))
+        self.assertEqual(networks[free_node.id], [])
+        for node in self.env.nodes:
+            self.assertEqual(
+                networks[node.id],
+                self.env.network_manager.get_node_networks(node))
+
     def test_assign_admin_ips(self):
         node = self.env.create_node()
         self.env.network_manager.assign_admin_ips([node])
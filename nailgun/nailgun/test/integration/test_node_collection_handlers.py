@@ -14,10 +14,13 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import mock
+
 from oslo.serialization import jsonutils
 
 from nailgun.db.sqlalchemy.models import Node
 from nailgun.db.sqlalchemy.models import Notification
+from nailgun.objects.node import heartbeats
 from nailgun.test.base import BaseIntegrationTest
 from nailgun.test.base import reverse
 
@@ -101,6 +104,50 @@ class TestHandlers(BaseIntegrationTest):
         self.assertEqual(200, resp.status_code)
         self.assertEqual(2, len(resp.json_body))
 
+    def test_node_get_paginated(self):
+        nodes_ids = sorted(n.id for n in self.env.create_nodes(5))
+
+        pages = []
+        params = {'limit': 2}
+        while True:
+            resp = self.app.get(
+                reverse('NodeCollectionHandler'),
+                params=params,
+                headers=self.default_headers
+            )
+            self.assertEqual(200, resp.status_code)
+            pages.append([n['id'] for n in resp.json_body])
+            if 'X-Next-Marker' not in resp.headers:
+                break
+            params['marker'] = resp.headers['X-Next-Marker']
+
+        self.assertEqual(
+            pages, [nodes_ids[:2], nodes_ids[2:4], nodes_ids[4:]])
+
+    def test_node_get_fields(self):
+        self.env.create_nodes(2)
+        resp = self.app.get(
+            reverse('NodeCollectionHandler'),
+            params={'fields': 'id,status,network_data'},
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(2, len(resp.json_body))
+        for node in resp.json_body:
+            self.assertItemsEqual(
+                node.keys(), ['id', 'status', 'network_data'])
+
+    def test_node_get_invalid_collection_params(self):
+        for params in ({'limit': 0}, {'limit': 'a'}, {'marker': -1},
+                       {'fields': 'id,unknown'}):
+            resp = self.app.get(
+                reverse('NodeCollectionHandler'),
+                params=params,
+                headers=self.default_headers,
+                expect_errors=True
+            )
+            self.assertEqual(400, resp.status_code)
+
     def test_node_get_with_cluster_and_assigned_ip_addrs(self):
         self.env.create(
             cluster_kwargs={},
@@ -299,6 +346,87 @@ class TestHandlers(BaseIntegrationTest):
         self.assertEqual(resp.status_code, 200)
         self.assertTrue('cached' in response and response['cached'])
 
+    @mock.patch.dict('nailgun.settings.settings.KEEPALIVE',
+                     {'flush_interval': 60 * 60})
+    def test_agent_heartbeat_is_buffered(self):
+        node = self.env.create_node(api=False)
+        data = jsonutils.dumps({
+            'mac': node.mac,
+            'manufacturer': 'new',
+            'agent_checksum': 'test'
+        })
+        self.app.put(
+            reverse('NodeAgentHandler'), data,
+            headers=self.default_headers)
+        timestamp = self.db.query(Node).get(node.id).timestamp
+
+        resp = self.app.put(
+            reverse('NodeAgentHandler'), data,
+            headers=self.default_headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json_body, {'id': node.id, 'cached': True})
+        self.db.expire_all()
+        self.assertEqual(
+            self.db.query(Node).get(node.id).timestamp, timestamp)
+
+        heartbeats.flush()
+        self.db.expire_all()
+        self.assertGreater(
+            self.db.query(Node).get(node.id).timestamp, timestamp)
+
+    @mock.patch.dict('nailgun.settings.settings.KEEPALIVE',
+                     {'flush_interval': 60 * 60})
+    def test_buffered_agent_heartbeat_is_written_on_exit(self):
+        node = self.env.create_node(api=False)
+        data = jsonutils.dumps({
+            'mac': node.mac,
+            'agent_checksum': 'test'
+        })
+        self.app.put(
+            reverse('NodeAgentHandler'), data,
+            headers=self.default_headers)
+        timestamp = self.db.query(Node).get(node.id).timestamp
+
+        resp = self.app.put(
+            reverse('NodeAgentHandler'), data,
+            headers=self.default_headers)
+        self.assertEqual(resp.json_body, {'id': node.id, 'cached': True})
+
+        # background writer flushes the buffer when it's stopped at exit
+        heartbeats.stop()
+        self.db.expire_all()
+        self.assertGreater(
+            self.db.query(Node).get(node.id).timestamp, timestamp)
+
+    def test_agent_heartbeat_brings_node_back_online(self):
+        node = self.env.create_node(api=False)
+        data = jsonutils.dumps({
+            'mac': node.mac,
+            'agent_checksum': 'test'
+        })
+        self.app.put(
+            reverse('NodeAgentHandler'), data,
+            headers=self.default_headers)
+        node = self.db.query(Node).get(node.id)
+        node.online = False
+        self.db.commit()
+
+        resp = self.app.put(
+            reverse('NodeAgentHandler'), data,
+            headers=self.default_headers)
+        self.assertEqual(resp.status_code, 200)
+        # regular update path answers the same as buffered heartbeat
+        self.assertEqual(resp.json_body, {'id': node.id, 'cached': True})
+        self.db.expire_all()
+        self.assertTrue(self.db.query(Node).get(node.id).online)
+        self.assertEqual(
+            self.db.query(Notification).filter_by(
+                node_id=node.id,
+                message=u"Node '{0}' is back online".format(
+                    node.human_readable_name)
+            ).count(),
+            1)
+
     def test_agent_updates_node_by_interfaces(self):
         node = self.env.create_node(api=False)
         interface = node.meta['interfaces'][0]
@@ -14,6 +14,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from datetime import datetime
+from datetime import timedelta
 import uuid
 
 from oslo.serialization import jsonutils
@@ -22,6 +24,7 @@ from nailgun.db.sqlalchemy.models import Notification
 from nailgun.db.sqlalchemy.models import Task
 from nailgun.errors import errors
 from nailgun import notifier
+from nailgun import objects
 from nailgun.rpc import receiver as rcvr
 from nailgun.test.base import BaseIntegrationTest
 from nailgun.test.base import reverse
@@ -164,3 +167,42 @@ class TestNotification(BaseIntegrationTest):
             notifications[0].message,
             "Cluster deletion fake error"
         )
+
+    def test_repeated_notifications_are_compacted(self):
+        now = datetime.now()
+        for minutes in (3, 2, 1):
+            self.env.create_notification(
+                topic='error', message=u"Node 'x' has gone away",
+                datetime=now - timedelta(minutes=minutes))
+        self.env.create_notification(topic='error', message=u'Other')
+        self.env.create_notification(
+            topic='error', message=u"Node 'x' has gone away", status='read')
+
+        self.assertEqual(objects.NotificationCollection.compact(), 2)
+        self.db.commit()
+
+        notifications = self.db.query(Notification).order_by(
+            Notification.id).all()
+        self.assertEqual(
+            [n.repeat_count for n in notifications], [3, 1, 1])
+        self.assertEqual(
+            notifications[0].first_datetime, now - timedelta(minutes=3))
+        self.assertEqual(
+            notifications[0].datetime, now - timedelta(minutes=1))
+
+    def test_expired_read_notifications_are_deleted(self):
+        expired = datetime.now() - timedelta(days=31)
+        self.env.create_notification(status='read', datetime=expired)
+        kept_ids = [
+            self.env.create_notification(
+                status='unread', datetime=expired).id,
+            self.env.create_notification(status='read').id]
+
+        self.assertEqual(
+            objects.NotificationCollection.delete_expired(0), 0)
+        self.assertEqual(
+            objects.NotificationCollection.delete_expired(30), 1)
+        self.db.commit()
+
+        self.assertItemsEqual(
+            [n.id for n in self.db.query(Notification)], kept_ids)
@@ -21,6 +21,8 @@ from nailgun import consts
 from nailgun import objects
 
 from nailgun.db.sqlalchemy.models import Cluster
+from nailgun.orchestrator.deployment_serializers import \
+    expand_deployment_info
 from nailgun.test.base import BaseIntegrationTest
 from nailgun.test.base import fake_tasks
 from nailgun.test.base import reverse
@@ -364,6 +366,30 @@ class TestDeploymentHandlerSkipTasks(BaseSelectedNodesTest):
         self.assertItemsEqual(deployed_uids, self.node_uids)
         self.assertEqual(len(deployment_data['tasks']), 1)
 
+    @patch('nailgun.task.task.settings.DEPLOYMENT_INFO_FORMAT',
+           consts.DEPLOYMENT_INFO_FORMATS.compact)
+    @patch('nailgun.task.task.rpc.cast')
+    def test_compact_deployment_info(self, mcast):
+        self.emulate_nodes_provisioning(self.nodes)
+
+        action_url = self.make_action_url(
+            "DeploySelectedNodesWithTasks",
+            self.node_uids
+        )
+        out = self.send_put(action_url, self.tasks)
+        self.assertEqual(out.status_code, 202)
+
+        args, kwargs = mcast.call_args
+        deployment_info = args[1]['args']['deployment_info']
+        self.assertEqual(
+            deployment_info['format'], consts.DEPLOYMENT_INFO_FORMATS.compact)
+        self.assertEqual(
+            deployment_info['common']['deployment_id'], self.cluster.id)
+
+        deployed_uids = [n['uid'] for n in expand_deployment_info(
+            deployment_info)]
+        self.assertItemsEqual(deployed_uids, self.node_uids)
+
     def test_deployment_is_forbidden(self):
         action_url = self.make_action_url(
             "DeploySelectedNodesWithTasks",
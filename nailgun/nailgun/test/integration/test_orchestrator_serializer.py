@@ -47,8 +47,12 @@ from nailgun.orchestrator.deployment_serializers import\
     DeploymentMultinodeSerializer50
 from nailgun.orchestrator.deployment_serializers import\
     DeploymentMultinodeSerializer61
+from nailgun.orchestrator.deployment_serializers import\
+    expand_deployment_info
 from nailgun.orchestrator.deployment_serializers import\
     get_serializer_for_cluster
+from nailgun.orchestrator.deployment_serializers import\
+    NetworkDeploymentSerializer
 
 
 from nailgun.orchestrator.deployment_graph import AstuteGraph
@@ -145,6 +149,14 @@ class OrchestratorSerializerTestBase(BaseIntegrationTest):
                 self.assertTrue(
                     ep['IP'] == 'none' or isinstance(ep['IP'], list))
 
+    def assert_compact_expands_to_legacy(self, cluster):
+        compact = self.serializer.serialize_compact(cluster, cluster.nodes)
+        legacy = self.serializer.serialize(cluster, cluster.nodes)
+        self.assertEqual(
+            jsonutils.dumps(expand_deployment_info(compact), sort_keys=True),
+            jsonutils.dumps(legacy, sort_keys=True))
+        return compact
+
 
 # TODO(awoodward): multinode deprecation: probably has duplicates
 class TestNovaOrchestratorSerializer(OrchestratorSerializerTestBase):
@@ -413,6 +425,44 @@ class TestNovaOrchestratorSerializer(OrchestratorSerializerTestBase):
         ]
         self.assertEqual(expected_ciritial_roles, nodes)
 
+    def test_serialize_compact(self):
+        compact = self.serializer.serialize_compact(
+            self.cluster, self.cluster.nodes)
+        legacy = self.serializer.serialize(self.cluster, self.cluster.nodes)
+
+        self.assertEqual(
+            compact['format'], consts.DEPLOYMENT_INFO_FORMATS.compact)
+        self.assertEqual(compact['customized'], [])
+        self.assertEqual(len(compact['nodes']), len(legacy))
+        for node in compact['nodes']:
+            self.assertNotIn('nodes', node)
+            self.assertNotIn('deployment_id', node)
+        self.assertEqual(compact['common']['deployment_id'], self.cluster.id)
+
+        self.assertEqual(expand_deployment_info(compact), legacy)
+
+    def test_serialize_compact_with_customized_node(self):
+        node = self.cluster.nodes[0]
+        replaced = [{'uid': str(node.id), 'role': 'controller', 'a': 'b'}]
+        node.replaced_deployment_info = replaced
+        self.db.flush()
+
+        compact = self.serializer.serialize_compact(
+            self.cluster, self.cluster.nodes)
+        self.assertEqual(compact['customized'], replaced)
+        self.assertNotIn(
+            str(node.id), [n['uid'] for n in compact['nodes']])
+
+        expanded = expand_deployment_info(compact)
+        self.assertEqual(expanded[-1], replaced[0])
+        self.assertEqual(
+            len(expanded),
+            len(compact['nodes']) + len(compact['customized']))
+
+    def test_expand_legacy_deployment_info(self):
+        legacy = self.serializer.serialize(self.cluster, self.cluster.nodes)
+        self.assertIs(expand_deployment_info(legacy), legacy)
+
 
 class TestNovaNetworkOrchestratorSerializer61(OrchestratorSerializerTestBase):
 
@@ -1177,6 +1227,50 @@ class TestNeutronOrchestratorSerializer61(OrchestratorSerializerTestBase):
                 for route in descr['routes']:
                     self.assertEqual(set(['net', 'via']), set(route.keys()))
 
+    def test_network_data_cached_during_serialization(self):
+        cluster = self.create_env(segment_type='gre', nodes_count=4)
+        objects.NodeCollection.prepare_for_deployment(cluster.nodes, 'gre')
+        serializer = get_serializer_for_cluster(cluster)
+
+        with mock.patch.object(
+                NetworkDeploymentSerializer, '_network_ranges',
+                wraps=NetworkDeploymentSerializer._network_ranges) \
+                as network_ranges_mock:
+            with mock.patch.object(
+                    objects.NodeGroupCollection, 'get_by_cluster_id',
+                    wraps=objects.NodeGroupCollection.get_by_cluster_id) \
+                    as node_groups_mock:
+                facts = serializer(AstuteGraph(cluster)).serialize(
+                    cluster, cluster.nodes)
+
+        self.assertEqual(network_ranges_mock.call_count, 1)
+        self.assertEqual(node_groups_mock.call_count, 1)
+        for node in facts:
+            self.assertIn('management_network_range', node)
+
+        with mock.patch.object(
+                NetworkDeploymentSerializer, '_network_ranges',
+                wraps=NetworkDeploymentSerializer._network_ranges) \
+                as network_ranges_mock:
+            group_id = objects.Cluster.get_default_group(cluster).id
+            NetworkDeploymentSerializer.network_ranges(group_id)
+            NetworkDeploymentSerializer.network_ranges(group_id)
+        self.assertEqual(network_ranges_mock.call_count, 2)
+
+    def test_update_nodes_net_info(self):
+        cluster = self.create_env(segment_type='gre')
+        objects.NodeCollection.prepare_for_deployment(cluster.nodes, 'gre')
+        serializer = get_serializer_for_cluster(cluster)
+        net_serializer = serializer.get_net_provider_serializer(cluster)
+
+        nodes = serializer.node_list(cluster.nodes)
+        nodes.append({'uid': 'unknown', 'role': 'compute'})
+        nodes = net_serializer.update_nodes_net_info(cluster, nodes)
+
+        for node in nodes[:-1]:
+            self.assertIn('internal_address', node)
+        self.assertNotIn('internal_address', nodes[-1])
+
 
 class TestNovaOrchestratorHASerializer(OrchestratorSerializerTestBase):
 
@@ -1340,6 +1434,9 @@ class TestNovaOrchestratorHASerializer(OrchestratorSerializerTestBase):
             [{'point': '1', 'weight': '1'},
              {'point': '2', 'weight': '2'}])
 
+    def test_serialize_compact_is_identical_to_legacy(self):
+        self.assert_compact_expands_to_legacy(self.cluster)
+
 
 class TestNovaOrchestratorHASerializer51(TestNovaOrchestratorHASerializer):
 
@@ -1841,6 +1938,9 @@ class TestNeutronOrchestratorSerializer(OrchestratorSerializerTestBase):
             self.assertIn('gateway', ep['br-storage'])
             self.assertIn('gateway', ep['br-mgmt'])
 
+    def test_serialize_compact_is_identical_to_legacy(self):
+        self.assert_compact_expands_to_legacy(self.cluster)
+
 
 class TestVlanSplinters(OrchestratorSerializerTestBase):
 
@@ -2145,6 +2245,9 @@ class TestNeutronOrchestratorHASerializer(OrchestratorSerializerTestBase):
             [{'point': '1', 'weight': '1'},
              {'point': '2', 'weight': '2'}])
 
+    def test_serialize_compact_is_identical_to_legacy(self):
+        self.assert_compact_expands_to_legacy(self.cluster)
+
 
 class TestNeutronOrchestratorSerializerBonds(OrchestratorSerializerTestBase):
 
@@ -2210,6 +2313,50 @@ class TestNeutronOrchestratorSerializerBonds(OrchestratorSerializerTestBase):
             self.check_bond_with_mode(mode)
 
 
+class TestPluginsOrchestratorSerializer(OrchestratorSerializerTestBase):
+
+    def setUp(self):
+        super(TestPluginsOrchestratorSerializer, self).setUp()
+        self.plugin = objects.Plugin.create(
+            self.env.get_default_plugin_metadata())
+        self.cluster = self.create_env()
+        objects.Cluster.set_primary_roles(self.cluster, self.cluster.nodes)
+
+    def create_env(self):
+        plugin_config = yaml.dump(self.env.get_default_plugin_env_config())
+        with mock.patch('nailgun.plugins.attr_plugin.os') as os:
+            with mock.patch(
+                    'nailgun.plugins.attr_plugin.open',
+                    mock.mock_open(read_data=plugin_config),
+                    create=True):
+                os.access.return_value = True
+                os.path.exists.return_value = True
+                cluster = self.env.create(
+                    release_kwargs={'version': '2014.2-6.0',
+                                    'operating_system': 'Ubuntu'},
+                    cluster_kwargs={
+                        'mode': 'ha_compact',
+                        'net_provider': 'neutron',
+                        'net_segment_type': 'vlan'},
+                    nodes_kwargs=[
+                        {'roles': ['controller'], 'pending_addition': True},
+                        {'roles': ['compute'], 'pending_addition': True}])
+
+        cluster_db = self.db.query(Cluster).get(cluster['id'])
+        editable = self._make_data_copy(cluster_db.attributes.editable)
+        editable[self.plugin.name]['metadata']['enabled'] = True
+        cluster_db.attributes.editable = editable
+        cluster_db.plugins.append(self.plugin)
+        objects.NodeCollection.prepare_for_deployment(cluster_db.nodes)
+        self.db.flush()
+        return cluster_db
+
+    def test_serialize_compact_is_identical_to_legacy(self):
+        compact = self.assert_compact_expands_to_legacy(self.cluster)
+        self.assertTrue(
+            compact['common'][self.plugin.name]['metadata']['enabled'])
+
+
 class TestCephOsdImageOrchestratorSerialize(OrchestratorSerializerTestBase):
 
     def setUp(self):
@@ -33,6 +33,28 @@ class TestReleaseNetworksHandlers(BaseIntegrationTest):
         self.assertEqual(resp.status_code, 200)
         self.assertEqual(self.release['networks_metadata'], resp.json)
 
+    def test_get_is_cached_by_revision(self):
+        url = reverse('ReleaseNetworksHandler',
+                      kwargs={'obj_id': self.release.id})
+        resp = self.app.get(url, headers=self.default_headers)
+        etag = resp.headers['ETag']
+
+        headers = dict(self.default_headers, **{'If-None-Match': etag})
+        resp = self.app.get(url, headers=headers)
+        self.assertEqual(resp.status_code, 304)
+
+        networks_metadata = dict(
+            self.release['networks_metadata'], foo='bar')
+        resp = self.app.put(
+            url, jsonutils.dumps(networks_metadata),
+            headers=self.default_headers)
+        self.assertEqual(resp.status_code, 200)
+
+        resp = self.app.get(url, headers=headers)
+        self.assertEqual(resp.status_code, 200)
+        self.assertNotEqual(etag, resp.headers['ETag'])
+        self.assertEqual(networks_metadata, resp.json)
+
     def test_post(self):
         resp = self.app.post(
             reverse('ReleaseNetworksHandler',
@@ -247,6 +247,30 @@ class TestTasksLogging(BaseIntegrationTest):
                                consts.TASK_NAMES.check_networks,
                                consts.TASK_NAMES.check_before_deployment))
 
+    @fake_tasks(god_mode=True)
+    @patch('nailgun.task.task.settings.DEPLOYMENT_INFO_FORMAT',
+           consts.DEPLOYMENT_INFO_FORMATS.compact)
+    def test_compact_deployment_info_is_logged_as_nodes(self):
+        self.env.create(
+            nodes_kwargs=[
+                {"pending_addition": True, "pending_roles": ["controller"]},
+                {"pending_addition": True, "pending_roles": ["compute"]},
+            ]
+        )
+        supertask = self.env.launch_deployment()
+        self.env.wait_ready(supertask, 15)
+
+        log = objects.ActionLogCollection.filter_by(
+            None, action_name=consts.TASK_NAMES.deployment).first()
+        output = log.additional_info["output"]
+        self.check_keys_included(
+            task_output_white_list[consts.TASK_NAMES.deployment], output)
+
+        deployment_info = output["args"]["deployment_info"]
+        self.assertEqual(len(deployment_info), 2)
+        for node in deployment_info:
+            self.assertIn("uid", node)
+
     def simulate_running_deployment(self, deploy_task, progress=42):
         """To exclude race condition errors in the tests we simulate
         running process of deployment
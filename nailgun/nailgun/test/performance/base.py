@@ -34,6 +34,7 @@ from nailgun.test.base import BaseTestCase
 from nailgun.test.base import EnvironmentManager
 from nailgun.test.base import reverse
 from nailgun.test.base import test_db_driver
+from nailgun.test.performance.profiler import Profiler
 from nailgun.test.performance.profiler import ProfilerMiddleware
 
 import pytest
@@ -142,6 +143,15 @@ class BaseLoadTestCase(BaseTestCase):
             test_results_d['expect_time'] = max_exec_time
         self.call_number += 1
 
+    def call_profiled(self, name, func, *args, **kwargs):
+        """Runs callable under profiler, so calls which are not handlers
+        could be measured by check_time_exec as well
+        """
+        profiler = Profiler('CALL', name)
+        result = profiler.profiler.runcall(func, *args, **kwargs)
+        profiler.save_data()
+        return result
+
     def get_handler(self, handler_name, handler_kwargs={}):
         resp = self.app.get(
             reverse(handler_name, kwargs=handler_kwargs),
@@ -20,8 +20,11 @@ from oslo.serialization import jsonutils
 from random import randint
 
 from nailgun import consts
+from nailgun import objects
+from nailgun.settings import settings
 from nailgun.test.base import fake_tasks
 from nailgun.test.performance import base
+from nailgun.utils.restrictions import AttributesRestriction
 
 
 class ClusterOperationsLoadTest(base.BaseUnitLoadTestCase):
@@ -186,6 +189,24 @@ class ClusterOperationsLoadTest(base.BaseUnitLoadTestCase):
         )
         self.check_time_exec(func)
 
+    @base.evaluate_unit_performance
+    def test_check_attributes_restrictions(self):
+        cluster = objects.Cluster.get_by_uid(self.cluster['id'])
+        models = {
+            'cluster': cluster,
+            'settings': cluster.attributes.editable,
+            'release': cluster.release,
+            'version': settings.VERSION,
+        }
+        func = functools.partial(
+            self.call_profiled,
+            'check_attributes_restrictions',
+            AttributesRestriction.check_data,
+            models,
+            cluster.attributes.editable
+        )
+        self.check_time_exec(func, 3)
+
     @base.evaluate_unit_performance
     def test_get_default_attributes(self):
         func = functools.partial(
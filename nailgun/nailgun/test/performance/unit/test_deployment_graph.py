@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+#    Copyright 2015 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+
+import mock
+
+from nailgun import consts
+from nailgun.orchestrator import deployment_graph
+from nailgun.test.performance import base
+
+
+class DeploymentGraphLoadTest(base.BaseUnitLoadTestCase):
+
+    # Number of custom groups, e.g. provided by plugins
+    GROUPS_NUM = 200
+    # Number of serialized nodes, every node has two roles
+    SERIALIZED_NODES_NUM = 1000
+
+    @classmethod
+    def setUpClass(cls):
+        super(DeploymentGraphLoadTest, cls).setUpClass()
+        stage = consts.ORCHESTRATOR_TASK_TYPES.stage
+        tasks = [
+            {'id': 'deploy_start', 'type': stage},
+            {'id': 'deploy_end', 'type': stage, 'requires': ['deploy_start']},
+        ]
+        for i in range(cls.GROUPS_NUM):
+            strategy = {'type': consts.DEPLOY_STRATEGY.parallel}
+            if i % 3 == 0:
+                strategy = {'type': consts.DEPLOY_STRATEGY.one_by_one}
+            # every group depends on a few previous ones
+            requires = ['group-{0}'.format(j) for j in (i // 2, i // 3)
+                        if j < i] or ['deploy_start']
+            tasks.append({
+                'id': 'group-{0}'.format(i),
+                'type': consts.ORCHESTRATOR_TASK_TYPES.group,
+                'role': ['group-{0}'.format(i)],
+                'requires': requires,
+                'required_for': ['deploy_end'],
+                'parameters': {'strategy': strategy},
+            })
+        cls.graph_cluster = mock.Mock()
+        cls.graph_cluster.deployment_tasks = tasks
+
+    def add_priorities(self):
+        graph = deployment_graph.AstuteGraph(self.graph_cluster)
+        nodes = []
+        for i in range(self.SERIALIZED_NODES_NUM):
+            for role in (i % self.GROUPS_NUM, (i * 7) % self.GROUPS_NUM):
+                nodes.append({'uid': str(i),
+                              'role': 'group-{0}'.format(role)})
+        graph.add_priorities(nodes)
+        return nodes
+
+    @base.evaluate_unit_performance
+    def test_add_priorities(self):
+        func = functools.partial(
+            self.call_profiled,
+            'add_priorities',
+            self.add_priorities
+        )
+        self.check_time_exec(func, 10)
@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+#    Copyright 2015 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+
+from nailgun.orchestrator import deployment_graph
+from nailgun.orchestrator import deployment_serializers
+from nailgun.test.performance import base
+
+
+class DeploymentSerializationLoadTest(base.BaseUnitLoadTestCase):
+
+    # Numbers of compute nodes in clusters serialization is measured for
+    CLUSTER_SIZES = (10, 50, 100)
+
+    @classmethod
+    def setUpClass(cls):
+        super(DeploymentSerializationLoadTest, cls).setUpClass()
+        cls.clusters = []
+        for size in cls.CLUSTER_SIZES:
+            cluster = cls.env.create_cluster(api=False)
+            cls.env.create_nodes(
+                1, cluster_id=cluster.id, roles=['controller'])
+            cls.env.create_nodes(
+                size, cluster_id=cluster.id, roles=['compute'])
+            cls.clusters.append(cluster)
+
+    @staticmethod
+    def serialize(cluster):
+        graph = deployment_graph.AstuteGraph(cluster)
+        return deployment_serializers.serialize(graph, cluster, cluster.nodes)
+
+    @base.evaluate_unit_performance
+    def test_serialize_deployment_info(self):
+        for size, cluster in zip(self.CLUSTER_SIZES, self.clusters):
+            func = functools.partial(
+                self.call_profiled,
+                'serialize_{0}_computes'.format(size),
+                self.serialize,
+                cluster
+            )
+            self.check_time_exec(func, max(5, size * 0.2))
@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+#    Copyright 2015 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import functools
+
+from netaddr import IPNetwork
+
+from nailgun.db.sqlalchemy.models import IPAddr
+from nailgun.db.sqlalchemy.models import IPAddrRange
+from nailgun.network.manager import NetworkManager
+from nailgun.test.performance import base
+
+
+class IPAllocationLoadTest(base.BaseUnitLoadTestCase):
+
+    # Number of addresses to allocate at once
+    IPS_NUM = 1000
+    CIDR = '192.168.0.0/20'
+
+    @classmethod
+    def setUpClass(cls):
+        super(IPAllocationLoadTest, cls).setUpClass()
+        cls.network = next(
+            ng for ng in cls.cluster.network_groups
+            if ng.name == 'management')
+
+        # network is nearly exhausted: only every fourth address is free
+        # and there are just a few more free addresses than requested
+        cidr = IPNetwork(cls.CIDR)
+        cls.network.cidr = cls.CIDR
+        cls.network.gateway = None
+        cls.network.ip_ranges = [
+            IPAddrRange(first=str(cidr[1]), last=str(cidr[-2]))
+        ]
+        cls.db.flush()
+        cls.db.execute(IPAddr.__table__.insert(), [
+            {'network': cls.network.id, 'ip_addr': str(ip)}
+            for i, ip in enumerate(cidr[1:-1]) if i % 4
+        ])
+        cls.db.commit()
+
+    @base.evaluate_unit_performance
+    def test_get_free_ips_in_exhausted_network(self):
+        func = functools.partial(
+            self.call_profiled,
+            'get_free_ips',
+            NetworkManager.get_free_ips,
+            self.network,
+            self.IPS_NUM
+        )
+        self.check_time_exec(func, 5)
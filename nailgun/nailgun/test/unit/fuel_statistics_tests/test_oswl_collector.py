@@ -22,7 +22,59 @@ from nailgun import consts
 from nailgun.objects import Cluster
 from nailgun.objects import OpenStackWorkloadStats
 from nailgun.statistics.oswl.collector import collect as oswl_collect_once
+from nailgun.statistics.oswl.collector import CollectorPool
 from nailgun.statistics.oswl.collector import run as run_collecting
+from nailgun.statistics.oswl import helpers
+
+
+class FakeResource(object):
+
+    def __init__(self, attrs):
+        self.attrs = attrs
+
+    def to_dict(self):
+        return dict(self.attrs)
+
+
+class FakeResourceManager(object):
+
+    def __init__(self, resources):
+        self.resources = resources
+
+    def list(self, **kwargs):
+        if isinstance(self.resources, Exception):
+            raise self.resources
+        return [FakeResource(r) for r in self.resources]
+
+
+class FakeNovaClient(object):
+
+    class client(object):
+        version = "v1.1"
+
+    def __init__(self, flavors):
+        self.flavors = FakeResourceManager(flavors)
+
+
+class FakeClientProvider(object):
+    """Stand-in for OpenStack clients of cluster, flavors returned
+    by nova are taken from 'flavors' by auth url of cluster.
+    """
+
+    clients_version_attr_path = \
+        helpers.ClientProvider.clients_version_attr_path
+
+    flavors = {}
+    instances = []
+
+    def __init__(self, cluster, credentials=None):
+        self.credentials = credentials
+        self.nova = FakeNovaClient(self.flavors[credentials[3]])
+        self.instances.append(self)
+
+    @classmethod
+    def get_credentials(cls, cluster):
+        return ("user", "password", "tenant", cluster.name)
 
 
 class TestOSWLCollector(BaseTestCase):
@@ -32,6 +84,10 @@ class TestOSWLCollector(BaseTestCase):
         "status": "running",
     }]
 
+    def setUp(self):
+        super(TestOSWLCollector, self).setUp()
+        helpers.client_providers.clear()
+
     def collect_for_operational_cluster(self, get_info_mock):
         cluster = self.env.create_cluster(
             api=False,
@@ -96,6 +152,33 @@ class TestOSWLCollector(BaseTestCase):
             'current': self.vms_info}
         self.assertEqual(last_for_normal_clsr.resource_data, res_data)
 
+    @patch('nailgun.statistics.oswl.collector.utils.get_proxy_for_cluster')
+    @patch('nailgun.statistics.oswl.collector.utils.set_proxy')
+    @patch('nailgun.statistics.oswl.collector.helpers.ClientProvider')
+    @patch('nailgun.statistics.oswl.collector.helpers.'
+           'get_info_from_os_resource_manager')
+    def test_failed_resource_does_not_stop_collection(self, get_info_mock,
+                                                      *_):
+        cluster = self.env.create_cluster(
+            api=False,
+            status=consts.CLUSTER_STATUSES.operational
+        )
+
+        def get_info(client_provider, resource_type):
+            if resource_type == consts.OSWL_RESOURCE_TYPES.flavor:
+                raise Exception("timed out")
+            return self.vms_info
+
+        get_info_mock.side_effect = get_info
+        oswl_collect_once([consts.OSWL_RESOURCE_TYPES.flavor,
+                           consts.OSWL_RESOURCE_TYPES.vm])
+
+        self.assertIsNone(OpenStackWorkloadStats.get_last_by(
+            cluster.id, consts.OSWL_RESOURCE_TYPES.flavor))
+        last = OpenStackWorkloadStats.get_last_by(
+            cluster.id, consts.OSWL_RESOURCE_TYPES.vm)
+        self.assertEqual(last.resource_data['current'], self.vms_info)
+
     @patch('nailgun.statistics.oswl.collector.utils.get_proxy_for_cluster')
     @patch('nailgun.statistics.oswl.collector.utils.set_proxy')
     @patch('nailgun.statistics.oswl.collector.helpers.ClientProvider')
@@ -212,3 +295,62 @@ class TestOSWLCollector(BaseTestCase):
                     pass
 
                 self.assertTrue(collect_mock.called)
+
+
+@patch('nailgun.statistics.oswl.collector.utils.set_proxy')
+@patch('nailgun.statistics.oswl.collector.helpers.ClientProvider',
+       new=FakeClientProvider)
+class TestOSWLCollectorPolling(BaseTestCase):
+
+    flavor = {
+        "id": 2,
+        "ram": 64,
+        "vcpus": 4,
+        "OS-FLV-EXT-DATA:ephemeral": 1,
+        "disk": 1,
+        "swap": 16,
+    }
+
+    def setUp(self):
+        super(TestOSWLCollectorPolling, self).setUp()
+        helpers.client_providers.clear()
+        FakeClientProvider.instances = []
+        FakeClientProvider.flavors = {}
+
+    def create_cluster(self, name, flavors):
+        FakeClientProvider.flavors[name] = flavors
+        return self.env.create(
+            api=False,
+            nodes_kwargs=[{"roles": ["controller"], "online": True}],
+            cluster_kwargs={"name": name,
+                            "status": consts.CLUSTER_STATUSES.operational}
+        )["id"]
+
+    def get_current(self, cluster_id):
+        last = OpenStackWorkloadStats.get_last_by(
+            cluster_id, consts.OSWL_RESOURCE_TYPES.flavor)
+        return last and last.resource_data['current']
+
+    def test_clients_are_reused_by_collections(self, _):
+        ids = [self.create_cluster(name, [self.flavor])
+               for name in ("first", "second")]
+
+        for _ in range(3):
+            oswl_collect_once([consts.OSWL_RESOURCE_TYPES.flavor],
+                              CollectorPool(0, None))
+
+        self.assertEqual(len(FakeClientProvider.instances), 2)
+        for cluster_id in ids:
+            self.assertEqual(self.get_current(cluster_id)[0]['ram'], 64)
+
+    def test_failed_cluster_does_not_stop_collection(self, _):
+        failed_id = self.create_cluster("failed", Exception("timed out"))
+        normal_id = self.create_cluster("normal", [self.flavor])
+
+        oswl_collect_once(consts.OSWL_RESOURCE_TYPES.flavor)
+        oswl_collect_once(consts.OSWL_RESOURCE_TYPES.flavor)
+
+        self.assertIsNone(self.get_current(failed_id))
+        self.assertEqual(len(self.get_current(normal_id)), 1)
+        # clients of failed cluster are not reused
+        self.assertEqual(len(FakeClientProvider.instances), 3)
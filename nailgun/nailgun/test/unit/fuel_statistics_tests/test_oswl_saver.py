@@ -273,3 +273,42 @@ class TestOSWLServerInfoSaving(BaseTestCase):
         last_changed = OpenStackWorkloadStats.get_last_by(
             cluster_id, consts.OSWL_RESOURCE_TYPES.vm)
         self.assertEqual(False, last_changed.is_sent)
+
+    def test_changes_are_stored_as_events(self):
+        self.add_default_vm_info_and_check()
+        vms_new = [dict(self.vms_info, power_state=0)]
+        last = self.save_data_and_check_record(vms_new)
+        last = self.save_data_and_check_record([])
+
+        self.assertEqual(last.current_data, {'current': []})
+        self.assertEqual(
+            [e.event_type for e in last.events],
+            [consts.OSWL_EVENT_TYPES.added,
+             consts.OSWL_EVENT_TYPES.modified,
+             consts.OSWL_EVENT_TYPES.removed])
+        self.assertEqual(
+            last.events[1].resource_data,
+            {'id': self.vms_info['id'], 'power_state': 1})
+
+    def test_changes_stored_in_resource_data_are_kept(self):
+        dt = datetime.datetime.utcnow()
+        added = [{'id': 1, 'time': dt.time().isoformat()}]
+        OpenStackWorkloadStats.create({
+            'cluster_id': 1,
+            'resource_type': consts.OSWL_RESOURCE_TYPES.vm,
+            'created_date': dt.date(),
+            'updated_time': dt.time(),
+            'current_data': {'added': added,
+                             'removed': [],
+                             'modified': [],
+                             'current': [self.vms_info]},
+            'resource_checksum': 'checksum of previous version',
+        })
+
+        last = self.save_data_and_check_record([])
+
+        removed = dict(self.vms_info, time=last.updated_time.isoformat())
+        self.assertEqual(last.resource_data, {'added': added,
+                                              'removed': [removed],
+                                              'modified': [],
+                                              'current': []})
@@ -14,9 +14,15 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from oslo.serialization import jsonutils
 from random import randint
 
+from nailgun.db.sqlalchemy.models import Blob
 from nailgun.db.sqlalchemy.models import Cluster
+from nailgun.db.sqlalchemy.models import fields
+from nailgun.db.sqlalchemy.models import Release
+from nailgun import objects
+from nailgun.settings import settings
 from nailgun.test.base import BaseTestCase
 
 
@@ -33,3 +39,103 @@ class TestDbModels(BaseTestCase):
         cluster = Cluster(**cluster_data)
         self.db.add(cluster)
         self.db.commit()
+
+
+class TestJSONDecoding(BaseTestCase):
+
+    def setUp(self):
+        super(TestJSONDecoding, self).setUp()
+        fields.json_decoding_cache.clear()
+        fields.json_decoding_stats.reset()
+
+    def test_large_documents_are_decoded_once(self):
+        value = {'volumes': ['x' * settings.JSON_DECODING['min_length']]}
+        text = jsonutils.dumps(value)
+
+        first = fields.decode_json(text)
+        first['volumes'].append('changed by caller')
+        second = fields.decode_json(text)
+
+        self.assertEqual(second, value)
+        self.assertIsNot(first, second)
+        stats = fields.json_decoding_stats
+        self.assertEqual((stats.decoded, stats.cached), (1, 1))
+        self.assertEqual(stats.cached_bytes, len(text))
+
+    def test_small_documents_are_not_cached(self):
+        fields.decode_json('{"a": 1}')
+        fields.decode_json('{"a": 1}')
+
+        stats = fields.json_decoding_stats
+        self.assertEqual((stats.decoded, stats.cached), (2, 0))
+        self.assertEqual(len(fields.json_decoding_cache.snapshots), 0)
+
+    def test_cache_size_is_limited_by_bytes(self):
+        cache = fields.JSONDecodingCache(100)
+        cache.set('a', ['x' * 40])
+        cache.set('b', ['y' * 40])
+        cache.set('c', ['z' * 40])
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('c'), ['z' * 40])
+        self.assertLessEqual(cache.used, 100)
+
+    def test_release_metadata_is_deferred(self):
+        self.env.create_release(api=False)
+        self.db.expunge_all()
+
+        release = self.db.query(Release).first()
+        self.assertNotIn('attributes_metadata', release.__dict__)
+
+        self.db.expunge_all()
+        release = objects.ReleaseCollection.eager_releases_handlers(
+            None).first()
+        self.assertIn('attributes_metadata', release.__dict__)
+
+
+class TestBlobValue(BaseTestCase):
+
+    def setUp(self):
+        super(TestBlobValue, self).setUp()
+        self.cache = {
+            'method': 'deploy',
+            'args': {'nodes': [{'uid': str(i)} for i in range(50)]}}
+        self.task = self.env.create_task(name='deployment', cache=self.cache)
+
+    def test_task_cache_is_stored_in_blob(self):
+        blob = self.db.query(Blob).get(self.task.cache_blob_id)
+        self.assertEqual(blob.size, len(jsonutils.dumps(self.cache)))
+        self.assertLess(len(blob.data), blob.size)
+
+        self.db.expire_all()
+        self.assertEqual(self.task.cache, self.cache)
+
+    def test_unchanged_cache_is_not_rewritten(self):
+        blob_id = self.task.cache_blob_id
+        self.task.cache = dict(self.cache)
+        self.db.commit()
+        self.assertEqual(self.task.cache_blob_id, blob_id)
+
+    def test_replaced_blob_is_deleted(self):
+        blob_id = self.task.cache_blob_id
+        self.task.cache = {'method': 'provision'}
+        self.db.commit()
+        self.assertNotEqual(self.task.cache_blob_id, blob_id)
+        self.assertIsNone(self.db.query(Blob).get(blob_id))
+
+        self.task.cache = {}
+        self.db.commit()
+        self.assertIsNone(self.task.cache_blob_id)
+        self.assertEqual(self.task.cache, {})
+        self.assertEqual(self.db.query(Blob).count(), 0)
+
+    def test_blob_is_deleted_with_task(self):
+        self.db.delete(self.task)
+        self.db.commit()
+        self.assertEqual(self.db.query(Blob).count(), 0)
+
+    def test_blobs_are_deleted_with_tasks_by_names(self):
+        objects.TaskCollection.delete_by_names(
+            self.task.cluster_id, ['deployment'])
+        self.db.commit()
+        self.assertEqual(self.db.query(Blob).count(), 0)
@@ -15,8 +15,12 @@
 #    under the License.
 
 import inspect
+import threading
+
+import mock
 
 from nailgun.errors import errors
+from nailgun.expression import CompiledExpressionCache
 from nailgun.expression import Expression
 from nailgun.test.base import BaseTestCase
 
@@ -95,3 +99,47 @@ class TestExpressionParser(BaseTestCase):
             else:
                 self.assertEqual(evaluate_expression(expression, models),
                                  result)
+
+    def test_compiled_expression_cache(self):
+        cache = CompiledExpressionCache(2)
+        with mock.patch('nailgun.expression.parse',
+                        side_effect=lambda text: text) as parse_mock:
+            cache.get('a')
+            cache.get('b')
+            cache.get('a')
+            self.assertEqual(parse_mock.call_count, 2)
+
+            # 'b' is the least recently used one
+            cache.get('c')
+            self.assertEqual(list(cache.compiled), ['a', 'c'])
+            cache.get('b')
+            self.assertEqual(parse_mock.call_count, 4)
+
+    def test_evaluate_with_models(self):
+        expression = Expression('cluster:mode == "ha_compact"')
+        self.assertTrue(
+            expression.evaluate({'cluster': {'mode': 'ha_compact'}}))
+        self.assertFalse(
+            expression.evaluate({'cluster': {'mode': 'multinode'}}))
+
+        expression = Expression('cluster:nonexistentkey', strict=False)
+        self.assertIsNone(expression.evaluate({'cluster': {}}))
+
+    def test_concurrent_evaluation(self):
+        results = {}
+
+        def evaluate(value):
+            results[value] = [
+                Expression('cluster:value == {0}'.format(value),
+                           {'cluster': {'value': value}}).evaluate()
+                for _ in range(100)]
+
+        threads = [threading.Thread(target=evaluate, args=(value,))
+                   for value in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(
+            results, dict((value, [True] * 100) for value in range(10)))
@@ -20,8 +20,10 @@ from itertools import groupby
 import mock
 import yaml
 
+from nailgun.expression import Expression
 from nailgun.orchestrator import deployment_graph
 from nailgun.orchestrator import graph_configuration
+from nailgun.orchestrator import tasks_serializer
 from nailgun.test import base
 
 
@@ -139,6 +141,26 @@ class TestGraphDependencies(base.BaseTestCase):
         self.assertGreater(compute_pos, network_pos)
         self.assertGreater(cinder_pos, controller_pos)
 
+    def test_levels_are_the_same_as_next_groups(self):
+        self.graph.add_tasks(self.tasks)
+        groups = self.graph.get_groups_subgraph()
+
+        for processed in (set(), set(['controller']), set(['network'])):
+            expected = []
+            processed_groups = set(processed)
+            next_groups = groups.get_next_groups(processed_groups)
+            while next_groups:
+                expected.append(next_groups)
+                processed_groups.update(next_groups)
+                next_groups = groups.get_next_groups(processed_groups)
+
+            self.assertEqual(list(groups.get_levels(processed)), expected)
+
+        self.assertEqual(
+            list(groups.get_levels(set())),
+            [['primary-controller'], ['controller'],
+             ['cinder', 'network'], ['compute']])
+
     def test_subtasks_in_correct_order(self):
         self.graph.add_tasks(self.tasks + self.subtasks)
         subtask_graph = self.graph.get_tasks('controller')
@@ -218,6 +240,90 @@ class TestAddDependenciesToNodes(base.BaseTestCase):
         self.assertItemsEqual(uid_4_priorities, [300, 400])
 
 
+DEPLOY_TASKS = """
+- id: setup_network
+  type: puppet
+  groups: [controller, primary-controller]
+  required_for: [deploy_end]
+  requires: [deploy_start]
+  parameters:
+    puppet_manifest: setup_network.pp
+    puppet_modules: /etc/puppet/modules
+    timeout: 120
+- id: install_controller
+  type: puppet
+  groups: [controller, primary-controller]
+  required_for: [deploy_end]
+  requires: [setup_network]
+  parameters:
+    puppet_manifest: install_controller.pp
+    puppet_modules: /etc/puppet/modules
+    timeout: 360
+- id: debug_controller
+  type: puppet
+  groups: [controller]
+  required_for: [deploy_end]
+  requires: [install_controller]
+  condition: "settings:common.debug.value == true"
+  parameters:
+    puppet_manifest: debug.pp
+    puppet_modules: /etc/puppet/modules
+    timeout: 360
+"""
+
+
+class TestDeployTasksSerialization(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestDeployTasksSerialization, self).setUp()
+        self.cluster = mock.Mock()
+        self.cluster.deployment_tasks = yaml.load(TASKS + DEPLOY_TASKS)
+        self.cluster.attributes.editable = {
+            'common': {'debug': {'value': False}}}
+        self.graph = deployment_graph.AstuteGraph(self.cluster)
+
+    def test_role_plan_is_calculated_once(self):
+        nodes = [{'uid': str(uid), 'role': 'controller'}
+                 for uid in range(3)]
+        with mock.patch.object(self.graph.graph, 'get_tasks',
+                               wraps=self.graph.graph.get_tasks) \
+                as get_tasks_mock:
+            with mock.patch('nailgun.orchestrator.tasks_serializer.'
+                            'Expression', wraps=Expression) \
+                    as expression_mock:
+                serialized = [self.graph.deploy_task_serialize(node)
+                              for node in nodes]
+
+        self.assertEqual(get_tasks_mock.call_count, 1)
+        self.assertEqual(expression_mock.call_count, 1)
+        for node, tasks in zip(nodes, serialized):
+            self.assertEqual(
+                [t['parameters']['puppet_manifest'] for t in tasks],
+                ['setup_network.pp', 'install_controller.pp'])
+            for task in tasks:
+                self.assertEqual(task['uids'], [node['uid']])
+
+    def test_condition_depending_on_node_is_checked_per_node(self):
+        class NodeHook(tasks_serializer.PuppetHook):
+            def should_execute(self):
+                return self.node['uid'] == '1'
+
+        self.assertTrue(
+            self.graph.has_cluster_level_condition(
+                tasks_serializer.PuppetHook))
+        self.assertFalse(self.graph.has_cluster_level_condition(NodeHook))
+
+        self.graph.serializers.add_deploy_serializer(NodeHook)
+        self.assertEqual(
+            self.graph.deploy_task_serialize(
+                {'uid': '2', 'role': 'primary-controller'}),
+            [])
+        self.assertEqual(
+            len(self.graph.deploy_task_serialize(
+                {'uid': '1', 'role': 'primary-controller'})),
+            2)
+
+
 class TestLegacyGraphSerialized(base.BaseTestCase):
 
     def setUp(self):
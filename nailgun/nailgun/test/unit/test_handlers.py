@@ -22,6 +22,8 @@ from mock import patch
 
 from nailgun.api.v1.handlers.base import BaseHandler
 from nailgun.api.v1.handlers.base import content
+from nailgun.api.v1.validators.base import get_schema_validator
+from nailgun.api.v1.validators.json_schema import cluster as cluster_schema
 
 from nailgun.test.base import BaseIntegrationTest
 from nailgun.test.base import reverse
@@ -142,3 +144,30 @@ class TestHandlers(BaseIntegrationTest):
             ('Content-Type', 'application/json'),
             web.ctx.headers
         )
+
+    def test_request_body_is_parsed_once(self):
+        cluster = self.env.create_cluster(api=False)
+        loads_path = "nailgun.api.v1.validators.base.jsonutils.loads"
+
+        with patch(loads_path, side_effect=json.loads) as loads_mock:
+            resp = self.app.put(
+                reverse('ClusterHandler', {'obj_id': cluster.id}),
+                json.dumps({'name': 'new name'}),
+                headers=self.default_headers
+            )
+
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(resp.json_body['name'], 'new name')
+        self.assertEqual(loads_mock.call_count, 1)
+
+    def test_schema_validators_are_compiled_once(self):
+        schema = cluster_schema.single_schema
+
+        validator = get_schema_validator(schema)
+        self.assertIs(get_schema_validator(schema), validator)
+        self.assertIsNotNone(validator.format_checker)
+
+        validator = get_schema_validator(schema, check_formats=False)
+        self.assertIs(
+            get_schema_validator(schema, check_formats=False), validator)
+        self.assertIsNone(validator.format_checker)
@@ -15,6 +15,7 @@
 #    under the License.
 
 import datetime
+import mock
 import unittest
 
 import web
@@ -77,3 +78,14 @@ class TestLoadDbDriverWithSAExceptions(unittest.TestCase):
             db.flush()
 
         self.assertRaises(AssertionError, load_db_driver, handler)
+
+    def test_session_is_removed_after_streamed_response(self):
+        def handler():
+            yield '['
+            yield ']'
+
+        with mock.patch.object(db, 'remove') as remove_mock:
+            response = load_db_driver(handler)
+            self.assertFalse(remove_mock.called)
+            self.assertEqual(list(response), ['[', ']'])
+            self.assertTrue(remove_mock.called)
@@ -15,6 +15,7 @@
 #    under the License.
 
 import os
+import re
 import shutil
 import tempfile
 import time
@@ -33,6 +34,7 @@ from nailgun.task.task import DumpTask
 from nailgun.test.base import BaseIntegrationTest
 from nailgun.test.base import fake_tasks
 from nailgun.test.base import reverse
+from nailgun.utils.log_index import LogIndex
 
 
 class TestLogs(BaseIntegrationTest):
@@ -262,6 +264,70 @@ class TestLogs(BaseIntegrationTest):
         self.assertEqual(response['to'], total_len)
         self.assertEqual(response['from'], 0)
 
+    def test_log_entries_filtered_by_date(self):
+        log_entries = [
+            ['2015-01-0{0} 10:00:00'.format(day), 'LEVEL{0}'.format(day),
+             'text{0}'.format(day)]
+            for day in range(1, 8)
+        ]
+        self._create_logfile_for_node(settings.LOGS[0], log_entries)
+
+        with mock.patch.dict(settings.LOG_INDEX,
+                             {'dir': self.log_dir, 'step': 16}):
+            resp = self.app.get(
+                reverse('LogEntryCollectionHandler'),
+                params={
+                    'source': settings.LOGS[0]['id'],
+                    'date_after': '2015-01-02 10:00:00',
+                    'date_before': '2015-01-05 10:00:00',
+                },
+                headers=self.default_headers
+            )
+        self.assertEqual(200, resp.status_code)
+        response = resp.json_body
+        self.assertEqual(response['entries'], log_entries[3:1:-1])
+        self.assertFalse(response['has_more'])
+
+    def test_log_index(self):
+        regexp = re.compile(settings.LOGS[0]['regexp'])
+        date_format = settings.LOGS[0]['date_format']
+        log_entries = [
+            ['2015-01-0{0} 10:00:00'.format(day), 'INFO', 'text']
+            for day in range(1, 6)
+        ]
+        self._create_logfile_for_node(settings.LOGS[0], log_entries)
+        entry_len = len(self._format_log_entry(log_entries[0]))
+
+        log_index = LogIndex(self.local_log_file, regexp, date_format,
+                             index_dir=self.log_dir, step=entry_len).update()
+        self.assertEqual(
+            log_index.offsets, [i * entry_len for i in range(5)])
+        self.assertEqual(
+            log_index.find_offset(time.strptime('2015-01-03', '%Y-%m-%d')),
+            2 * entry_len)
+        self.assertIsNone(
+            log_index.find_offset(time.strptime('2015-02-01', '%Y-%m-%d')))
+
+        # the index is loaded from disk and extended incrementally
+        with open(self.local_log_file, 'a') as f:
+            f.write(self._format_log_entry(
+                ['2015-01-06 10:00:00', 'INFO', 'text']))
+        with mock.patch.object(LogIndex, 'find_entry',
+                               wraps=log_index.find_entry) as find_mock:
+            log_index = LogIndex(
+                self.local_log_file, regexp, date_format,
+                index_dir=self.log_dir, step=entry_len).update()
+        self.assertEqual(find_mock.call_count, 1)
+        self.assertEqual(
+            log_index.offsets, [i * entry_len for i in range(6)])
+
+        # rotated file is indexed from scratch
+        self._create_logfile_for_node(settings.LOGS[0], log_entries[3:])
+        log_index = LogIndex(self.local_log_file, regexp, date_format,
+                             index_dir=self.log_dir, step=entry_len).update()
+        self.assertEqual(log_index.offsets, [0, entry_len])
+        self.assertEqual(log_index.dates[0], [2015, 1, 4, 10, 0, 0])
+
     def test_backward_reader(self):
         f = tempfile.TemporaryFile(mode='r+')
         forward_lines = []
@@ -105,3 +105,18 @@ class TestUtils(TestCase):
 
         for kw in test_cases:
             check_group_getter(**kw)
+
+    def test_combine_patterns(self):
+        patterns = [
+            re.compile(r".*/clusters/(?P<cluster_id>\d+)/?$"),
+            re.compile(r".*/clusters/(?P<cluster_id>\d+)/changes/?$"),
+            re.compile(r".*/releases/?$"),
+        ]
+        combined, groups = utils.combine_patterns(patterns)
+
+        for url, pattern in (("/api/clusters/1", patterns[0]),
+                             ("/api/clusters/1/changes/", patterns[1]),
+                             ("/api/releases", patterns[2])):
+            self.assertIs(groups[combined.match(url).lastgroup], pattern)
+
+        self.assertIsNone(combined.match("/api/nodes/1"))
@@ -16,6 +16,7 @@
 import alembic
 from oslo.serialization import jsonutils
 import sqlalchemy as sa
+import zlib
 
 from nailgun import consts
 from nailgun.db import db
@@ -132,6 +133,25 @@ def prepare():
             'meta': jsonutils.dumps({'assign_vip': True})
         }])
 
+    db.execute(
+        meta.tables['tasks'].insert(),
+        [
+            {
+                'uuid': 'fake_task_uuid_0',
+                'name': 'deployment',
+                'status': 'running',
+                'cluster_id': clusterid,
+                'cache': jsonutils.dumps({'method': 'deploy'}),
+            },
+            {
+                'uuid': 'fake_task_uuid_1',
+                'name': 'super',
+                'status': 'running',
+                'cluster_id': clusterid,
+                'cache': '{}',
+            },
+        ])
+
     db.commit()
 
 
@@ -341,3 +361,52 @@ class TestAddingModesToReleases(base.BaseAlembicMigrationTest):
             self.assertItemsEqual(
                 jsonutils.loads(row['modes']),
                 ['ha_compact', 'multinode'])
+
+
+class TestRevisionsAreAdded(base.BaseAlembicMigrationTest):
+    def test_revisions_are_added(self):
+        for table in ('releases', 'attributes'):
+            result = db.execute(
+                sa.select([self.meta.tables[table].c.revision]))
+            for row in result:
+                self.assertEqual(row['revision'], 1)
+
+
+class TestOSWLEventsAreAdded(base.BaseAlembicMigrationTest):
+    def test_oswl_events_table_is_added(self):
+        self.assertIn('resource_fingerprints',
+                      self.meta.tables['oswl_stats'].c)
+        self.assertIn('event_type',
+                      self.meta.tables['oswl_stats_events'].c)
+
+
+class TestTasksCacheMovedToBlobs(base.BaseAlembicMigrationTest):
+    def test_tasks_cache_moved_to_blobs(self):
+        self.assertNotIn('cache', self.meta.tables['tasks'].c)
+
+        tasks = self.meta.tables['tasks']
+        blobs = self.meta.tables['blobs']
+        result = db.execute(
+            sa.select([tasks.c.uuid, blobs.c.data]).select_from(
+                tasks.outerjoin(blobs, blobs.c.id == tasks.c.cache_blob_id)
+            ).order_by(tasks.c.uuid))
+        caches = [
+            (row['uuid'],
+             jsonutils.loads(zlib.decompress(row['data']))
+             if row['data'] is not None else None)
+            for row in result]
+        self.assertEqual(
+            caches,
+            [('fake_task_uuid_0', {'method': 'deploy'}),
+             ('fake_task_uuid_1', None)])
+
+
+class TestNotificationsCompactionIsAdded(base.BaseAlembicMigrationTest):
+    def test_notifications_repeat_columns_are_added(self):
+        self.assertIn('repeat_count', self.meta.tables['notifications'].c)
+        self.assertIn('first_datetime', self.meta.tables['notifications'].c)
+        indexes = set(
+            index.name for index in self.meta.tables['notifications'].indexes)
+        self.assertTrue(
+            set(['notifications_task_id_node_id_idx',
+                 'notifications_unread_topic_idx']) <= indexes)
@@ -42,3 +42,38 @@ class TestNetworkUtils(BaseUnitTest):
     def test_compare_macs_raise_exception(self):
         with self.assertRaises(ValueError):
             utils.is_same_mac('QWERTY', 'ASDF')
+
+    def test_get_ip_range_prefix(self):
+        self.assertEqual(
+            utils.get_ip_range_prefix(
+                netaddr.IPRange('10.20.0.2', '10.20.3.254')),
+            '10.20.')
+        self.assertEqual(
+            utils.get_ip_range_prefix(
+                netaddr.IPRange('10.20.0.2', '10.20.0.2')),
+            '10.20.0.2')
+        self.assertEqual(
+            utils.get_ip_range_prefix(
+                netaddr.IPRange('9.0.0.1', '10.0.0.1')),
+            '')
+
+    def test_get_free_ip_ranges(self):
+        ip_ranges = [
+            netaddr.IPRange('10.0.0.1', '10.0.0.10'),
+            netaddr.IPRange('10.0.1.1', '10.0.1.3'),
+        ]
+        occupied = [
+            netaddr.IPAddress(ip) for ip in (
+                '10.0.0.1', '10.0.0.5', '10.0.0.6', '10.0.0.10',
+                '10.0.1.1', '10.0.1.2', '10.0.1.3', '10.0.2.1')
+        ]
+
+        self.assertEqual(
+            utils.get_free_ip_ranges(ip_ranges, occupied),
+            [netaddr.IPRange('10.0.0.2', '10.0.0.4'),
+             netaddr.IPRange('10.0.0.7', '10.0.0.9')])
+
+    def test_get_free_ip_ranges_without_occupied(self):
+        ip_ranges = [netaddr.IPRange('10.0.0.1', '10.0.0.10')]
+        self.assertEqual(
+            utils.get_free_ip_ranges(ip_ranges, []), ip_ranges)
@@ -30,6 +30,19 @@ class TestHandlers(BaseIntegrationTest):
         self.assertEqual(200, resp.status_code)
         self.assertEqual([], resp.json_body)
 
+    def test_unread_summary(self):
+        self.env.create_notification(topic='error')
+        self.env.create_notification(topic='error')
+        self.env.create_notification(topic='done', status='read')
+        resp = self.app.get(
+            reverse('NotificationsSummaryHandler'),
+            headers=self.default_headers
+        )
+        self.assertEqual(200, resp.status_code)
+        self.assertEqual(resp.json_body['unread'], 2)
+        self.assertEqual(resp.json_body['unread_by_topic']['error'], 2)
+        self.assertEqual(resp.json_body['unread_by_topic']['done'], 0)
+
     def test_not_empty(self):
         c = self.env.create_cluster(api=False)
         n0 = self.env.create_notification()
@@ -417,6 +417,47 @@ class TestNodeObject(BaseIntegrationTest):
         nodes_db = objects.NodeCollection.eager_nodes_handlers(None)
         self.assertEqual(nodes_db.count(), nodes_count)
 
+    def test_to_json_chunks(self):
+        self.env.create_nodes(5)
+        nodes_db = objects.NodeCollection.eager_nodes_handlers(None)
+        fields = ('id', 'name', 'network_data')
+
+        chunks = list(objects.NodeCollection.to_json_chunks(
+            nodes_db, fields=fields, page_size=2))
+
+        # three pages and closing bracket
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(
+            ''.join(chunks),
+            objects.NodeCollection.to_json(
+                objects.NodeCollection.order_by(nodes_db, 'id'),
+                fields=fields))
+
+    def test_to_json_chunks_empty(self):
+        chunks = list(objects.NodeCollection.to_json_chunks(
+            objects.NodeCollection.filter_by(None, id=-1)))
+        self.assertEqual(chunks, ['[]'])
+
+    def test_to_list_network_data(self):
+        self.env.create(
+            nodes_kwargs=[
+                {'role': 'controller'},
+                {'role': 'compute'},
+            ]
+        )
+        self.env.create_node()
+        nodes_db = objects.NodeCollection.eager_nodes_handlers(None)
+        nodes = objects.NodeCollection.to_list(nodes_db)
+        self.assertEqual(len(nodes), 3)
+        for node in nodes:
+            node_db = objects.Node.get_by_uid(node['id'])
+            self.assertEqual(node, objects.Node.to_dict(node_db))
+
+        fields = ('id', 'name')
+        nodes = objects.NodeCollection.to_list(nodes_db, fields=fields)
+        for node in nodes:
+            self.assertItemsEqual(node.keys(), fields)
+
     def test_reset_to_discover(self):
         self.env.create(
             nodes_kwargs=[
@@ -42,6 +42,24 @@ class TestHandlers(BaseIntegrationTest):
         self.assertEqual('5.1', resp.json_body['version'])
         self.assertEqual('modified release', resp.json_body['name'])
 
+    def test_release_put_roles_changes_etag(self):
+        release = self.env.create_release(api=False)
+        url = reverse('ReleaseHandler', kwargs={'obj_id': release.id})
+        resp = self.app.get(url, headers=self.default_headers)
+        etag = resp.headers['ETag']
+
+        roles = resp.json_body['roles'] + ['new-role']
+        resp = self.app.put(
+            url, jsonutils.dumps({'roles': roles}),
+            headers=self.default_headers)
+        self.assertEqual(200, resp.status_code)
+
+        headers = dict(self.default_headers, **{'If-None-Match': etag})
+        resp = self.app.get(url, headers=headers)
+        self.assertEqual(200, resp.status_code)
+        self.assertNotEqual(etag, resp.headers['ETag'])
+        self.assertEqual(roles, resp.json_body['roles'])
+
     def test_release_put_returns_400_if_no_body(self):
         release = self.env.create_release(api=False)
         resp = self.app.put(
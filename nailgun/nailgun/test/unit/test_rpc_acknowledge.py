@@ -56,3 +56,64 @@ class TestRpcAcknowledge(base.BaseTestCase):
             self.consumer.consume_msg, self.body, self.msg)
         self.assertFalse(self.msg.ack.called)
         self.assertEqual(self.msg.requeue.call_count, 1)
+
+    def test_stats_collected(self):
+        self.receiver.test.side_effect = [None, Exception]
+        self.consumer.consume_msg(self.body, self.msg)
+        self.consumer.consume_msg(self.body, self.msg)
+        self.assertEqual(self.consumer.stats.calls['test'], 2)
+        self.assertEqual(self.consumer.stats.errors['test'], 1)
+
+
+class TestRpcWorkers(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRpcWorkers, self).setUp()
+        self.receiver = mock.Mock()
+        self.connection = mock.Mock()
+        self.consumer = receiverd.RPCConsumer(
+            self.connection, self.receiver, workers=4)
+
+    def test_messages_of_cluster_routed_to_one_worker(self):
+        cluster_id = self.env.create_cluster(api=False).id
+        tasks_uuids = [
+            self.env.create_task(name=name, cluster_id=cluster_id).uuid
+            for name in ('deployment', 'provision')
+        ]
+        routes = [
+            self.consumer.get_route(
+                {'method': 'test', 'args': {'task_uuid': task_uuid}})
+            for task_uuid in tasks_uuids
+        ]
+        self.assertEqual(routes, [cluster_id, cluster_id])
+
+    def test_message_acked_from_consuming_loop(self):
+        msg = mock.Mock()
+        self.consumer.start_workers()
+        self.consumer.consume_msg({'method': 'test', 'args': {}}, msg)
+        self.consumer.stop_workers()
+
+        self.assertEqual(self.receiver.test.call_count, 1)
+        self.assertEqual(msg.ack.call_count, 1)
+        for worker in self.consumer.workers:
+            self.assertFalse(worker.is_alive())
+
+    def test_worker_survives_failed_commit(self):
+        msgs = [mock.Mock(), mock.Mock()]
+        self.consumer.start_workers()
+        with mock.patch.object(receiverd.db, 'commit',
+                               side_effect=[Exception, None]):
+            for msg in msgs:
+                self.consumer.consume_msg({'method': 'test', 'args': {}}, msg)
+            self.consumer.stop_workers()
+
+        self.assertEqual(self.receiver.test.call_count, 2)
+        for msg in msgs:
+            self.assertEqual(msg.ack.call_count, 1)
+        self.assertEqual(self.consumer.stats.errors['test'], 1)
+
+    def test_worker_queues_are_bounded(self):
+        consumer = receiverd.RPCConsumer(
+            self.connection, self.receiver, workers=2, queue_size=10)
+        for worker in consumer.workers:
+            self.assertEqual(worker.messages.maxsize, 10)
@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright 2015 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import mock
+
+from nailgun import rpc
+from nailgun.test import base
+
+
+class TestRpcCast(base.BaseTestCase):
+
+    def setUp(self):
+        super(TestRpcCast, self).setUp()
+        self.producer = mock.MagicMock()
+        self.producer.__enter__.return_value = self.producer
+        # ensure() returns publish function wrapped by retries
+        self.producer.connection.ensure.side_effect = \
+            lambda obj, fun, **kwargs: fun
+        self.pool = mock.Mock()
+        self.pool.acquire.return_value = self.producer
+
+        patcher = mock.patch('nailgun.rpc.pools.ProducerPool',
+                             return_value=self.pool)
+        self.producer_pool = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(setattr, rpc, '_producers', None)
+        rpc._producers = None
+
+    def test_producers_pool_reused(self):
+        rpc.cast('naily', {'method': 'verify_networks'})
+        rpc.cast('naily', {'method': 'dump_environment'})
+
+        self.assertEqual(self.producer_pool.call_count, 1)
+        self.assertEqual(self.pool.acquire.call_count, 2)
+        self.assertEqual(self.producer.publish.call_count, 2)
+
+    def test_producers_pool_recreated_after_fork(self):
+        rpc.cast('naily', {'method': 'verify_networks'})
+        with mock.patch('nailgun.rpc.os.getpid', return_value=-1):
+            rpc.cast('naily', {'method': 'verify_networks'})
+
+        self.assertEqual(self.producer_pool.call_count, 2)
+
+    def test_message_not_formatted_without_debug(self):
+        with mock.patch('nailgun.rpc.jsonutils.dumps') as dumps_mock:
+            with mock.patch.object(rpc.logger, 'isEnabledFor',
+                                   return_value=False):
+                rpc.cast('naily', {'method': 'verify_networks'})
+        self.assertFalse(dumps_mock.called)
+
+    @mock.patch.dict('nailgun.rpc.settings.RPC', {'compression': 'zlib'})
+    def test_only_deployment_messages_compressed(self):
+        rpc.cast('naily', {'method': 'verify_networks'})
+        rpc.cast('naily', [{'method': 'provision'},
+                           {'method': 'granular_deploy'}])
+
+        compressions = [
+            kwargs['compression']
+            for _, kwargs in self.producer.publish.call_args_list]
+        self.assertEqual(compressions, [None, 'zlib'])
+
+    def test_messages_not_compressed_by_default(self):
+        rpc.cast('naily', {'method': 'deploy'})
+        self.assertIsNone(
+            self.producer.publish.call_args[1]['compression'])
@@ -18,6 +18,7 @@ import mock
 import web
 
 from nailgun.db.sqlalchemy.models import Cluster
+from nailgun.db.sqlalchemy.models import Node
 from nailgun.db.sqlalchemy.models import Task
 from nailgun import objects
 from nailgun.orchestrator.deployment_serializers \
@@ -159,6 +160,32 @@ class TestTaskHelpers(BaseTestCase):
         progress = TaskHelper.recalculate_provisioning_task_progress(task)
         self.assertEqual(progress, 50)
 
+    def test_recalculate_deployment_task_progress_with_offline_nodes(self):
+        cluster = self.create_env([
+            {'roles': ['controller'],
+             'status': 'deploying',
+             'progress': 40},
+            {'roles': ['compute'],
+             'status': 'deploying',
+             'progress': 40}])
+
+        task = Task(name='deploy', cluster_id=cluster.id)
+        self.db.add(task)
+        self.db.commit()
+
+        progress = TaskHelper.recalculate_deployment_task_progress(task)
+        self.assertEqual(progress, 40)
+
+        # node is marked offline outside of the receiver, e.g. by assassind
+        self.db.query(Node).filter_by(
+            id=cluster.nodes[0].id
+        ).update({'online': False}, synchronize_session=False)
+        self.db.flush()
+
+        # offline node is counted both as finished and by its status
+        progress = TaskHelper.recalculate_deployment_task_progress(task)
+        self.assertEqual(progress, 60)
+
     def test_get_task_cache(self):
         expected = {"key": "value"}
         task = Task()
@@ -0,0 +1,205 @@
+# -*- coding: utf-8 -*-
+
+#    Copyright 2015 Mirantis, Inc.
+#
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""Sparse time index of log files"""
+
+from bisect import bisect_left
+import hashlib
+import os
+import tempfile
+import time
+
+from oslo.serialization import jsonutils
+
+from nailgun.logger import logger
+from nailgun.settings import settings
+
+
+# Number of bytes of the file beginning which are stored in the index
+# to detect files rotated in place (e.g. with copytruncate)
+HEAD_SIZE = 128
+
+
+class LogIndex(object):
+    """Sparse index of a log file.
+
+    Offsets of log entries are taken every `step` bytes and mapped to
+    dates of the entries, so a position of a given date in the file can
+    be found by binary search instead of parsing the whole file. Log
+    entries are expected to be written in chronological order.
+
+    The index is stored on disk and is extended incrementally as the log
+    file grows. It is rebuilt from scratch when the file is rotated.
+    """
+
+    def __init__(self, log_file, regexp, date_format,
+                 index_dir=None, step=None):
+        """:param log_file: path to the log file
+        :param regexp: compiled regexp of log entries with 'date' group
+        :param date_format: format of dates in log entries
+        :param index_dir: directory for index files,
+                          LOG_INDEX['dir'] by default
+        :param step: distance in bytes between indexed entries,
+                     LOG_INDEX['step'] by default
+        """
+        self.log_file = log_file
+        self.regexp = regexp
+        self.date_format = date_format
+        self.index_dir = index_dir or settings.LOG_INDEX['dir']
+        self.step = step or settings.LOG_INDEX['step']
+
+        self.offsets = []
+        self.dates = []
+        self.indexed_pos = 0
+        self.size = 0
+        self.inode = None
+        self.head = ''
+
+    @property
+    def index_file(self):
+        name = hashlib.md5(self.log_file).hexdigest()
+        return os.path.join(self.index_dir, '{0}.json'.format(name))
+
+    def update(self):
+        """Loads the index and indexes data appended to the log file."""
+        self.load()
+
+        stat = os.stat(self.log_file)
+        if stat.st_ino == self.inode and stat.st_size == self.size:
+            return self
+
+        with open(self.log_file, 'r') as f:
+            head = f.read(HEAD_SIZE)
+            if stat.st_ino != self.inode or stat.st_size < self.size or \
+                    not head.startswith(self.head):
+                logger.debug("Log file %s was rotated, rebuilding its index",
+                             self.log_file)
+                self.reset()
+
+            self.inode = stat.st_ino
+            self.head = head
+            self.size = stat.st_size
+            self.index(f, stat.st_size)
+
+        self.save()
+        return self
+
+    def reset(self):
+        self.offsets = []
+        self.dates = []
+        self.indexed_pos = 0
+        self.size = 0
+        self.head = ''
+
+    def index(self, f, size):
+        pos = self.indexed_pos
+        while pos < size:
+            if pos > 0:
+                # skip the rest of a line we got into, a line which
+                # starts exactly at pos is not skipped
+                f.seek(pos - 1, os.SEEK_SET)
+                f.readline()
+            else:
+                f.seek(0, os.SEEK_SET)
+            found = self.find_entry(f, pos + self.step)
+            if found is None:
+                if f.tell() >= size:
+                    # the last entry may be not written completely yet
+                    break
+            else:
+                offset, date = found
+                if not self.offsets or offset > self.offsets[-1]:
+                    self.offsets.append(offset)
+                    self.dates.append(date)
+            pos += self.step
+        self.indexed_pos = pos
+
+    def find_entry(self, f, limit):
+        """Finds the first complete log entry which starts before limit.
+
+        :returns: tuple (offset, date) or None
+        """
+        while f.tell() < limit:
+            offset = f.tell()
+            line = f.readline()
+            if not line.endswith('\n'):
+                return None
+            m = self.regexp.match(line.rstrip('\n'))
+            if m is None:
+                continue
+            try:
+                date = time.strptime(m.group('date'), self.date_format)
+            except ValueError:
+                continue
+            return offset, list(date[:6])
+        return None
+
+    def find_offset(self, date):
+        """Returns offset of the first indexed entry which is not older
+        than given date. All entries after the offset are not older than
+        the date too.
+
+        :param date: time.struct_time or tuple of its first six fields
+        :returns: byte offset or None if there is no such entry
+        """
+        ix = bisect_left(self.dates, list(date[:6]))
+        if ix < len(self.offsets):
+            return self.offsets[ix]
+        return None
+
+    def load(self):
+        try:
+            with open(self.index_file, 'r') as f:
+                data = jsonutils.load(f)
+        except (IOError, OSError):
+            return
+        except ValueError:
+            logger.warning("Index file %s is corrupted", self.index_file)
+            return
+
+        if data.get('step') != self.step:
+            return
+
+        self.offsets = data['offsets']
+        self.dates = data['dates']
+        self.indexed_pos = data['indexed_pos']
+        self.size = data['size']
+        self.inode = data['inode']
+        self.head = data['head']
+
+    def save(self):
+        data = {
+            'log_file': self.log_file,
+            'step': self.step,
+            'offsets': self.offsets,
+            'dates': self.dates,
+            'indexed_pos': self.indexed_pos,
+            'size': self.size,
+            'inode': self.inode,
+            'head': self.head,
+        }
+        try:
+            if not os.path.isdir(self.index_dir):
+                os.makedirs(self.index_dir)
+            # the file is replaced atomically since the same log file
+            # could be indexed by several processes
+            fd, tmp_path = tempfile.mkstemp(dir=self.index_dir)
+            with os.fdopen(fd, 'w') as f:
+                jsonutils.dump(data, f)
+            os.rename(tmp_path, self.index_file)
+        except (IOError, OSError) as exc:
+            logger.warning("Unable to save index of log file %s: %s",
+                           self.log_file, exc)